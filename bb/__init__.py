@@ -23,12 +23,15 @@
 bb: a cli for bitbucket.
 """
 
+from enum import Enum
+
 import typer
 
 from bb.__version__ import __version__ as version
 from bb.auth import _auth
 from bb.pr import _pr
 from bb.repo import _repo
+from bb.sync import _sync
 from bb.utils.constants import common_vars
 from bb.utils.richprint import console
 
@@ -48,6 +51,14 @@ def version_callback(value: bool) -> None:
         raise typer.Exit(code=0)
 
 
+# The class Output defines the formats of '--output', 'text' is rendered for people.
+class Output(str, Enum):
+    TEXT = "text"
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 def setup() -> typer.Typer:
     _bb = typer.Typer(
         add_completion=False,
@@ -59,6 +70,9 @@ def setup() -> typer.Typer:
     _bb.add_typer(_pr, name="pr", help="manage pull requests")
     _bb.add_typer(_auth, name="auth", help="authenticate bb and git with bitbucket")
     _bb.add_typer(_repo, name="repo", help="work with bitBucket repositories")
+    _bb.add_typer(
+        _sync, name="sync", help="keep bitbucket data warm in a background process"
+    )
 
     return _bb
 
@@ -69,13 +83,55 @@ _bb = setup()
 @_bb.callback()
 def callback(
     verbose: bool = False,
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="bypass the local response cache"
+    ),
+    rate_limit: float = typer.Option(
+        0.0,
+        envvar="BB_RATE_LIMIT",
+        help="maximum requests per second sent to bitbucket, 0 for unlimited",
+    ),
+    rate_limit_shared: bool = typer.Option(
+        False,
+        envvar="BB_RATE_LIMIT_SHARED",
+        help="share the rate limit with concurrent bb processes",
+    ),
+    max_requests: int = typer.Option(
+        0,
+        envvar="BB_MAX_REQUESTS",
+        help="fail once a command sends more requests than this, 0 for unlimited",
+    ),
+    output: Output = typer.Option(
+        Output.TEXT,
+        envvar="BB_OUTPUT",
+        help="write records to stdout in this format, messages go to stderr",
+    ),
+    refresh_rate: float = typer.Option(
+        10.0,
+        envvar="BB_REFRESH_RATE",
+        help="spinner refreshes per second, 0 to print progress messages without a spinner",
+    ),
+    trace: bool = typer.Option(
+        False, help="print the timings of every request sent to bitbucket at exit"
+    ),
+    trace_file: str = typer.Option(
+        "", help="also write the request timings as chrome trace-event json"
+    ),
     version: bool = typer.Option(None, "--version", callback=version_callback),
 ):
     """
-    This function is a callback function that sets the verbosity level and version information.
+    This function is a callback function that sets the verbosity level, cache usage, rate limit, request budget, output format, refresh rate, tracing and version information.
 
     Args:
         verbose (bool, optional): A boolean indicating whether to enable verbose mode. Defaults to False.
+        no_cache (bool, optional): A boolean indicating whether to bypass the response cache. Defaults to False.
+        rate_limit (float, optional): The maximum number of requests per second, 0 for unlimited. Defaults to 0.
+        rate_limit_shared (bool, optional): A boolean indicating whether the rate limit is shared across processes. Defaults to False.
+        max_requests (int, optional): The maximum number of requests a command may send, 0 for unlimited. Defaults to 0.
+        output (Output, optional): The format records are written in. Defaults to text.
+        refresh_rate (float, optional): The spinner refreshes per second, 0 to disable the spinner. Defaults to 10.
+        trace (bool, optional): A boolean indicating whether to print the request timings at exit. Defaults to False.
+        trace_file (str, optional): The path to write the chrome trace-event json to. Defaults to "".
         version (bool, optional): A boolean indicating whether to display the version information. Defaults to None.
 
     Returns:
@@ -83,3 +139,24 @@ def callback(
     """
     if verbose:
         common_vars.state["verbose"] = True
+    if no_cache:
+        common_vars.state["no_cache"] = True
+    if rate_limit < 0:
+        raise typer.BadParameter("rate limit cannot be negative")
+    common_vars.state["rate_limit"] = rate_limit
+    common_vars.state["rate_limit_shared"] = rate_limit_shared
+    if max_requests < 0:
+        raise typer.BadParameter("max requests cannot be negative")
+    common_vars.state["max_requests"] = max_requests
+    common_vars.state["output"] = output.value
+    console.stderr = output is not Output.TEXT
+    if refresh_rate < 0:
+        raise typer.BadParameter("refresh rate cannot be negative")
+    common_vars.state["refresh_rate"] = refresh_rate
+    if trace or trace_file:
+        import atexit
+
+        from bb.utils.trace import report
+
+        common_vars.state["trace"] = True
+        atexit.register(report, trace_file or None)
@@ -21,24 +21,19 @@
 
 """
 bb pr: Manage pull requests
+
+The command implementations are imported when a command runs, so that
+registering the commands does not pull in the http and rendering stack.
 """
 
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 import typer
 
-from bb.pr.copy import copy_pull_request
-from bb.pr.create import create_pull_request
-from bb.pr.delete import delete_pull_request
-from bb.pr.diff import show_diff
-from bb.pr.list import list_pull_request
-from bb.pr.merge import merge_pull_request
-from bb.pr.review import review_pull_request
-from bb.pr.view import view_pull_request
 from bb.utils.cmnd import is_git_repo, title_and_description
 from bb.utils.constants import common_vars
-from bb.utils.helper import error_handler, validate_input
+from bb.utils.helper import error_handler, parse_ids, validate_input
 
 _pr: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -95,13 +90,15 @@ def create(
         True,
     )
 
+    from bb.pr.create import create_pull_request
+
     create_pull_request(target, yes, diff, rebase, title, description)
 
 
 @_pr.command(help="Delete pull requests")
 @error_handler
 def delete(
-    id: str = typer.Option("", help="pull request number(s) to delete"),
+    id: str = typer.Option("", help=common_vars.ids_help),
     yes: bool = typer.Option(False, help=common_vars.skip_prompt),
     diff: bool = typer.Option(False, help="show diff before deleting pull request"),
 ) -> None:
@@ -109,7 +106,8 @@ def delete(
     Used to delete pull requests with options to specify the pull request number(s)
     to delete, skip confirmation prompts and show a diff before deletion.
      Args:
-    -   :param id: Used to specify the pull request number(s) that you want to delete.
+    -   :param id: Used to specify the pull request number(s) that you want to delete,
+            many pull requests are deleted concurrently after a single confirmation.
             :type id: str
     -   :param yes: A boolean flag that determines whether to skip the confirmation
          prompt before deleting the pull request(s).
@@ -128,11 +126,21 @@ def delete(
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    _id = validate_input(
-        id,
-        "Pull request id(s) to delete\n? ex: id (or) id1, id2",
-        "Id's cannot be empty",
-    ).split(",")
+    _id = parse_ids(
+        validate_input(
+            id,
+            "Pull request id(s) to delete\n? ex: id (or) id1, id2 (or) id1-id3",
+            "Id's cannot be empty",
+        )
+    )
+    if len(_id) > 1:
+        from bb.pr.delete import delete_pull_requests
+
+        delete_pull_requests(_id, yes, diff)
+        return
+
+    from bb.pr.delete import delete_pull_request
+
     delete_pull_request(_id, yes, diff)
 
 
@@ -143,6 +151,14 @@ class Role(str, Enum):
     CURRENT = "current"
 
 
+# The class State defines the states a '--projects' scan can be filtered by.
+class State(str, Enum):
+    OPEN = "open"
+    MERGED = "merged"
+    DECLINED = "declined"
+    ALL = "all"
+
+
 @_pr.command(help="List pull requests in a repository")
 @error_handler
 def list(
@@ -150,6 +166,25 @@ def list(
     all: bool = typer.Option(
         False, help="show all pull request(s) based on selected role"
     ),
+    cached: bool = typer.Option(
+        False, help="show pull request(s) from the local index without fetching"
+    ),
+    compact: bool = typer.Option(
+        False, help="show one line per pull request instead of a table"
+    ),
+    projects: str = typer.Option(
+        "",
+        help="scan every repository of these projects instead, ex: PROJ,OPS",
+    ),
+    state: State = typer.Option(
+        State.OPEN, help="state of the pull request(s) scanned by '--projects'"
+    ),
+    target: str = typer.Option(
+        "", help="only scan pull request(s) into this branch with '--projects'"
+    ),
+    author: str = typer.Option(
+        "", help="only scan pull request(s) by this user with '--projects'"
+    ),
 ) -> None:
     """
     Lists pull requests based on a selected role, with an option to show all pull requests.
@@ -159,16 +194,50 @@ def list(
         :type role: str
     -   :param all: A  boolean flag that determines whether to show all pull requests
         :type all: bool
+    -   :param cached: A boolean flag that determines whether to show the pull requests
+        recorded in the local index by previous listings instead of fetching them
+        :type cached: bool
+    -   :param compact: A boolean flag that determines whether each pull request is
+        shown on a single line instead of a table
+        :type compact: bool
+    -   :param projects: Comma separated project keys whose repositories are all scanned
+        for pull requests, a repository at a time as they are fetched
+        :type projects: str
+    -   :param state: The state of the pull requests listed by a '--projects' scan
+        :type state: State
+    -   :param target: The branch the pull requests listed by a '--projects' scan merge into
+        :type target: str
+    -   :param author: The user who authored the pull requests listed by a '--projects' scan
+        :type author: str
     Raises:
-        ValueError: If the repository is not a Git repository
+        ValueError: If the repository is not a Git repository, or if filters are given without '--projects'
     Returns:
         None
     """
 
+    if projects:
+        from bb.pr.list import list_project_pull_requests
+
+        list_project_pull_requests(
+            [project.strip() for project in projects.split(",") if project.strip()],
+            state.value,
+            target,
+            author,
+            compact,
+        )
+        return
+
+    if state is not State.OPEN or target or author:
+        raise ValueError(
+            "'--state', '--target' and '--author' filter a '--projects' scan"
+        )
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    list_pull_request(role, all)
+    from bb.pr.list import list_pull_request
+
+    list_pull_request(role, all, cached, compact)
 
 
 # The class `Action` defines an enumeration of string values representing different actions.
@@ -182,13 +251,14 @@ class Action(str, Enum):
 @_pr.command(help="Add a review to a pull request")
 @error_handler
 def review(
-    id: str = typer.Option("", help="pull request number to review"),
+    id: str = typer.Option("", help=common_vars.ids_help),
     action: Action = Action.NONE,
 ) -> None:
     """
     Takes a pull request number and an action to review a pull request in the repository.
     Args:
-    -   :param id: A string that represents the pull request number to review.
+    -   :param id: A string that represents the pull request number(s) to review,
+        many pull requests are reviewed concurrently.
         :type id: str
     -   :param action: The `action` parameter in the `review` function is an enum type `Action`, which
         represents the action to be taken on a pull request. The possible values for `action` are
@@ -205,8 +275,10 @@ def review(
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    _id: str = validate_input(
-        id, "Pull request id to review", common_vars.id_cannot_be_none
+    _id = parse_ids(
+        validate_input(
+            id, "Pull request id(s) to review", common_vars.id_cannot_be_none
+        )
     )
     action_value: str = "none" if action == Action.NONE else action.value
     action: str = validate_input(
@@ -214,13 +286,21 @@ def review(
         "Action [approve|unapprove|needs_work]",
         "'--action' is a mandatory argument, run 'bb pr review --help' for more info",
     )
-    review_pull_request(_id, action)
+    if len(_id) > 1:
+        from bb.pr.review import review_pull_requests
+
+        review_pull_requests(_id, action)
+        return
+
+    from bb.pr.review import review_pull_request
+
+    review_pull_request(_id[0], action)
 
 
 @_pr.command(help="Merge a pull request")
 @error_handler
 def merge(
-    id: str = typer.Option("", help="pull request number to merge"),
+    id: str = typer.Option("", help=common_vars.ids_help),
     delete_source_branch: bool = typer.Option(
         False, help="deletes source branch after merge"
     ),
@@ -232,7 +312,8 @@ def merge(
     """
     Merges a pull request with options to delete the source branch, rebase before merging, and skip prompts.
     Args:
-    -   :param id: A string representing the pull request number to merge
+    -   :param id: A string representing the pull request number(s) to merge, many
+        pull requests are merged concurrently after a single confirmation
         :type id: str
     -   :param delete_source_branch: A boolean option that determines whether the source branch should
         be deleted after the merge operation is completed.
@@ -252,16 +333,38 @@ def merge(
 
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
-    _id: str = validate_input(
-        id, "Pull request id to merge", common_vars.id_cannot_be_none
+    _id = parse_ids(
+        validate_input(id, "Pull request id(s) to merge", common_vars.id_cannot_be_none)
     )
-    merge_pull_request(_id, delete_source_branch, rebase, yes)
+    if len(_id) > 1:
+        from bb.pr.merge import merge_pull_requests
+
+        merge_pull_requests(_id, delete_source_branch, rebase, yes)
+        return
+
+    from bb.pr.merge import merge_pull_request
+
+    merge_pull_request(_id[0], delete_source_branch, rebase, yes)
 
 
 @_pr.command(help="View changes in a pull request")
 @error_handler
 def diff(
     id: str = typer.Option("", help="pull request number to show diff"),
+    pager: bool = typer.Option(False, help="show the changed files through a pager"),
+    stat: bool = typer.Option(False, help="only show the diffstat of the git diff"),
+    server_paths: bool = typer.Option(
+        False, help="limit the git diff to the files changed in the pull request"
+    ),
+    remote: bool = typer.Option(
+        False, help="show the diff computed by bitbucket, without a local fetch"
+    ),
+    path: Optional[List[str]] = typer.Option(
+        None, help="only show the remote diff of this file, can be repeated"
+    ),
+    context: Optional[int] = typer.Option(
+        None, help="number of context lines of the remote diff"
+    ),
 ) -> None:
     """
     Takes a pull request number as input and shows the diff for that pull request.
@@ -269,29 +372,49 @@ def diff(
     -   :param id: The `diff` function takes an optional `id` parameter, which is a string representing the
         pull request number to show the diff for
     -   :type id: str
+    -   :param pager: A boolean flag that determines whether to show the changed files through a pager
+        :type pager: bool
+    -   :param stat: A boolean flag that determines whether to only show the diffstat of the git diff
+        :type stat: bool
+    -   :param server_paths: A boolean flag that determines whether to limit the git diff to the files
+        changed in the pull request
+        :type server_paths: bool
+    -   :param remote: A boolean flag that determines whether to show the diff computed by bitbucket
+        instead of the local git diff
+        :type remote: bool
+    -   :param path: The files to show the remote diff of, all files when not given
+        :type path: Optional[List[str]]
+    -   :param context: The number of context lines of the remote diff
+        :type context: Optional[int]
     Raises:
+    -   ValueError: If '--path' or '--context' is given without '--remote'
     -   ValueError: If the repository is not a Git repository
     -   ValueError: If the PR ID is not provided
     Returns:
     -   None
     """
 
+    if not remote and (path or context is not None):
+        raise ValueError("'--path' and '--context' filter a '--remote' diff")
+
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
     _id: str = validate_input(
         id, "Pull request number to show diff", common_vars.id_cannot_be_none
     )
-    show_diff(_id)
+    from bb.pr.diff import show_diff
+
+    show_diff(_id, pager, stat, server_paths, remote, path, context)
 
 
 @_pr.command(help="Copy pull request url to clipboard")
 @error_handler
-def copy(id: str = typer.Option("", help="pull request number to copy")) -> None:
+def copy(id: str = typer.Option("", help=common_vars.ids_help)) -> None:
     """
     Copies a specified pull request in a Git repository.
     Args:
-    -   :param id: Used to specify the pull request number that needs to be copied
-        to clipboard
+    -   :param id: Used to specify the pull request number(s) whose urls need to be
+        copied to clipboard
         :type id: str
     Raises:
     -   ValueError: If the repository is not a Git repository
@@ -303,23 +426,34 @@ def copy(id: str = typer.Option("", help="pull request number to copy")) -> None
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
 
-    _id: str = validate_input(
-        id, "Pull request number to copy", common_vars.id_cannot_be_none
+    _id = parse_ids(
+        validate_input(
+            id, "Pull request number(s) to copy", common_vars.id_cannot_be_none
+        )
     )
-    copy_pull_request(_id)
+    if len(_id) > 1:
+        from bb.pr.copy import copy_pull_requests
+
+        copy_pull_requests(_id)
+        return
+
+    from bb.pr.copy import copy_pull_request
+
+    copy_pull_request(_id[0])
 
 
 @_pr.command(help="View a pull request")
 @error_handler
 def view(
-    id: str = typer.Option("", help="pull request id to view"),
+    id: str = typer.Option("", help=common_vars.ids_help),
     web: Optional[bool] = typer.Option(False, help="view pull request in browser"),
 ) -> None:
     """
     Takes a pull request ID as input and allows the user to view the pull request either
     in the terminal or in a web browser.
     Args:
-    -   :param id: The `id` parameter is a string that represents the pull request ID to view
+    -   :param id: The `id` parameter is a string that represents the pull request ID(s) to view,
+        many pull requests are summarised in one table
         :type id: str
     -   :param web: A  boolean flag that determines whether to view the pull request
         in a web browser.
@@ -334,5 +468,15 @@ def view(
 
     if not is_git_repo():
         raise ValueError(common_vars.not_a_git_repo)
-    _id = validate_input(id, "Pull request id to view", common_vars.id_cannot_be_none)
-    view_pull_request(_id, web)
+    _id = parse_ids(
+        validate_input(id, "Pull request id(s) to view", common_vars.id_cannot_be_none)
+    )
+    if len(_id) > 1:
+        from bb.pr.view import view_pull_requests
+
+        view_pull_requests(_id, web)
+        return
+
+    from bb.pr.view import view_pull_request
+
+    view_pull_request(_id[0], web)
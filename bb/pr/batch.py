@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.pr.batch - runs a pull request action for many ids with bounded
+concurrency and reports the outcome of each in a single table
+"""
+
+from typing import Any, Callable, Coroutine, List
+
+from bb.utils import output, request, richprint
+from bb.utils.constants import common_vars
+
+
+def run_batch(
+    message: str,
+    action: Callable[[str], Coroutine[Any, Any, str]],
+    ids: List[str],
+) -> List[tuple]:
+    """
+    Runs an action for each pull request id concurrently and prints a results table.
+
+    Args:
+        message (str): The progress message shown while the actions run.
+        action (Callable): A coroutine function taking a pull request id and returning
+            a short description of the outcome, it raises on failure.
+        ids (List[str]): The pull request ids.
+
+    Raises:
+        ValueError: If the action failed for any of the pull requests.
+
+    Returns:
+        List[tuple]: The pull request, result and details row of each id.
+    """
+
+    async def outcome(_id: str) -> tuple:
+        try:
+            return (_id, "OK", await action(_id))
+        except Exception as err:
+            return (_id, "FAILED", str(err).strip())
+
+    request.set_retry_budget(common_vars.retry_budget * len(ids))
+    if output.machine_readable():
+        results = request.gather(
+            *(outcome(_id) for _id in ids), limit=common_vars.max_workers
+        )
+        output.emit(
+            (
+                {"id": _id, "result": result, "details": details}
+                for _id, result, details in results
+            ),
+            ("id", "result", "details"),
+        )
+    else:
+        with richprint.live_progress(
+            f"{message} {len(ids)} pull requests ... "
+        ) as live:
+            results = request.gather(
+                *(outcome(_id) for _id in ids), limit=common_vars.max_workers
+            )
+            live.update(richprint.console.print("DONE", style="bold green"))
+
+    rows = [
+        (f"#{_id}", f"[bold {'green' if result == 'OK' else 'red'}]{result}", details)
+        for _id, result, details in results
+    ]
+    if not output.machine_readable():
+        richprint.console.print(
+            richprint.table(
+                [
+                    ("PR", "bold white"),
+                    ("RESULT", "bold white"),
+                    ("DETAILS", "#FFFFFF"),
+                ],
+                rows,
+                True,
+            )
+        )
+
+    failed = sum(1 for result in results if result[1] == "FAILED")
+    if failed:
+        raise ValueError(f"{failed} of {len(ids)} pull requests failed")
+
+    return rows
@@ -24,6 +24,9 @@ bb.pr.copy - fetches the pull request from url and copies then to user
 clipboard
 """
 
+from typing import Dict, List
+
+from bb.pr.batch import run_batch
 from bb.utils import cmnd, request, richprint
 from bb.utils.api import bitbucket_api
 
@@ -49,6 +52,7 @@ def copy_pull_request(_id: str) -> None:
         project, repository = cmnd.base_repo()
         url: str = request.get(
             bitbucket_api.pull_request_info(project, repository, _id),
+            daemon_ok=True,
         )[1]["links"]["self"][0]["href"]
         cmnd.cp_to_clipboard(url)
         live.update(richprint.console.print("COPIED", style="bold green"))
@@ -56,3 +60,36 @@ def copy_pull_request(_id: str) -> None:
         "Hint: Pull request url is copied to clipboard ('ctrl+v' to paste)",
         "dim white",
     )
+
+
+def copy_pull_requests(ids: List[str]) -> None:
+    """
+    Fetches the URLs of many pull requests concurrently and copies them to the
+    clipboard, one per line.
+
+    Args:
+    -   :param ids: The pull request ids
+        :type ids: List[str]
+    Raises:
+    -   :raises: ValueError: If any of the pull request urls cannot be fetched
+    Returns:
+    -   :rtype: None
+    """
+    project, repository = cmnd.base_repo()
+    urls: Dict[str, str] = {}
+
+    async def fetch_url(_id: str) -> str:
+        urls[_id] = (
+            await request.aget(
+                bitbucket_api.pull_request_info(project, repository, _id),
+                daemon_ok=True,
+            )
+        )[1]["links"]["self"][0]["href"]
+        return urls[_id]
+
+    run_batch("Fetching url of", fetch_url, ids)
+    cmnd.cp_to_clipboard("\n".join(urls[_id] for _id in ids))
+    richprint.str_print(
+        "Hint: Pull request urls are copied to clipboard ('ctrl+v' to paste)",
+        "dim white",
+    )
@@ -30,8 +30,30 @@ from typing import Optional
 from typer import confirm
 
 from bb.pr.diff import show_diff
-from bb.utils import cmnd, request, richprint
+from bb.utils import cache, cmnd, output, request, richprint
 from bb.utils.api import bitbucket_api
+from bb.utils.constants import common_vars
+
+
+def resolve_repo_id(project: str, repository: str) -> int:
+    """
+    Resolves the id of a repository, using the persistent repository index
+    before falling back to a single repository lookup
+
+    Args:
+    -   project: str: The project name
+    -   repository: str: The repository slug
+    Returns:
+    -   int: The repository id
+    Raises:
+    -   ValueError: If the repository cannot be fetched
+    """
+    repo_url = bitbucket_api.repo_info(project, repository)
+    repo_id = cache.load_repo_id(repo_url)
+    if repo_id is None:
+        repo_id = request.get(repo_url)[1]["id"]
+        cache.store_repo_id(repo_url, repo_id)
+    return repo_id
 
 
 def gather_facts(
@@ -60,21 +82,15 @@ def gather_facts(
     """
 
     with richprint.live_progress(f"Gathering facts on '{repository}' ..."):
-        repo_id = None
-        for repo in request.get(bitbucket_api.get_repo_info(project))[1]["values"]:
-            if repo["name"] == repository:
-                repo_id = repo["id"]
+        repo_id = resolve_repo_id(project, repository)
 
         reviewers = []
-        if repo_id is not None:
-            for dict_item in request.get(
-                bitbucket_api.default_reviewers(project, repo_id, from_branch, target),
-            )[1]:
-                reviewers.extend(
-                    {"user": {"name": dict_item[key]}}
-                    for key in dict_item
-                    if key == "name"
-                )
+        for dict_item in request.get(
+            bitbucket_api.default_reviewers(project, repo_id, from_branch, target),
+        )[1]:
+            reviewers.extend(
+                {"user": {"name": dict_item[key]}} for key in dict_item if key == "name"
+            )
     table = richprint.table(
         [("SUMMARY", "bold yellow"), ("DESCRIPTION", "#FFFFFF")],
         [
@@ -116,18 +132,19 @@ def create_pull_request(
     if target == from_branch:
         raise ValueError("Source & target cannot be the same")
 
-    if rebase:
-        with richprint.live_progress(
-            f"Rebasing '{from_branch}' with '{target}' ... "
-        ) as live:
-            cmnd.git_rebase(target)
-            live.update(richprint.console.print("REBASED", style="bold green"))
+    with richprint.live_region():
+        if rebase:
+            with richprint.live_progress(
+                f"Rebasing '{from_branch}' with '{target}' ... "
+            ) as live:
+                cmnd.git_rebase(target)
+                live.update(richprint.console.print("REBASED", style="bold green"))
 
-    project, repository = cmnd.base_repo()
+        project, repository = cmnd.base_repo()
 
-    reviewers = gather_facts(
-        target, from_branch, project, repository, title, description
-    )
+        reviewers = gather_facts(
+            target, from_branch, project, repository, title, description
+        )
 
     if yes or confirm("Proceed"):
         with richprint.live_progress("Creating Pull Request ..."):
@@ -151,6 +168,8 @@ def create_pull_request(
             )
             _id = pull_request[1]["links"]["self"][0]["href"].split("/")[-1]
             cmnd.cp_to_clipboard(pull_request[1]["links"]["self"][0]["href"])
+            if output.machine_readable():
+                output.emit([pull_request[1]], common_vars.pull_request_fields)
         elif pull_request[0] == 409:
             richprint.console.print(
                 f"Message: {pull_request[1]['errors'][0]['message']}",
@@ -170,6 +189,11 @@ def create_pull_request(
                     "href"
                 ]
             )
+            if output.machine_readable():
+                output.emit(
+                    [pull_request[1]["errors"][0]["existingPullRequest"]],
+                    common_vars.pull_request_fields,
+                )
         else:
             raise ValueError(request.http_response_definitions(pull_request[0]))
 
@@ -178,8 +202,15 @@ def create_pull_request(
             "dim white",
         )
 
-    if _id and (
-        diff
-        or confirm(f"Review diff between '{from_branch}' -> '{target}' in PR #{_id}?")
+    # with '--output' stdout holds the pull request alone, '--diff' is ignored
+    if (
+        _id
+        and not output.machine_readable()
+        and (
+            diff
+            or confirm(
+                f"Review diff between '{from_branch}' -> '{target}' in PR #{_id}?"
+            )
+        )
     ):
         show_diff(_id)
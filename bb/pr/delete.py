@@ -24,11 +24,14 @@ bb.pr.delete - deletes a pull request(s) given for the given id(s)
 """
 
 import json
+from contextlib import closing
+from typing import List
 
 from typer import confirm
 
+from bb.pr.batch import run_batch
 from bb.pr.diff import show_diff
-from bb.utils import cmnd, request, richprint
+from bb.utils import cmnd, index, request, richprint
 from bb.utils.api import bitbucket_api
 
 
@@ -86,8 +89,55 @@ def delete_pull_request(_id: list, yes: bool, diff: bool) -> None:
             if pull_request != 204:
                 raise ValueError("Cannot delete pull request, Response<204>")
 
+            with closing(index.connect()) as connection:
+                index.remove(
+                    connection, bitbucket_api.bitbucket_host, project, repository, [_no]
+                )
+
             richprint.console.print(
                 f"Pull Request Deleted: {pull_request_info[1]['links']['self'][0]['href']}",
                 highlight=True,
                 style="bold green",
             )
+
+
+def delete_pull_requests(_id: List[str], yes: bool, diff: bool) -> None:
+    """
+    Deletes many pull requests concurrently after a single confirmation
+
+    Args:
+    - _id: List[str]: The list of pull request ids
+    - yes: bool: The flag to skip confirmation
+    - diff: bool: The flag to show the diff of each pull request before confirmation
+    Raises:
+    - ValueError: If any of the pull requests cannot be deleted
+    Returns:
+    - None
+    """
+    project, repository = cmnd.base_repo()
+
+    if diff:
+        for _no in _id:
+            show_diff(_no)
+
+    if not (yes or confirm(f"Proceed to delete {', '.join(f'#{_no}' for _no in _id)}")):
+        return
+
+    deleted: List[str] = []
+
+    async def delete(_no: str) -> str:
+        url = bitbucket_api.pull_request_info(project, repository, _no)
+        pull_request_info = (await request.aget(url))[1]
+        await request.adelete(
+            url, json.dumps({"version": int(pull_request_info["version"])})
+        )
+        deleted.append(_no)
+        return f"Deleted: {pull_request_info['links']['self'][0]['href']}"
+
+    try:
+        run_batch("Deleting", delete, _id)
+    finally:
+        with closing(index.connect()) as connection:
+            index.remove(
+                connection, bitbucket_api.bitbucket_host, project, repository, deleted
+            )
@@ -21,51 +21,313 @@
 
 """
 bb.pr.diff - shows the diffrence in pull requests which is already raised
-TODO: show the diff contents for each file
+either with the local git diff or the diff computed by bitbucket
 """
 
-from bb.utils import cmnd, request, richprint
+from collections import deque
+from contextlib import nullcontext
+from itertools import chain
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from bb.utils import cmnd, output, request, richprint
 from bb.utils.api import bitbucket_api
+from bb.utils.constants import common_vars
+
+# columns of '--output csv', as dotted paths into the json
+CHANGE_FIELDS = ("path.toString", "srcPath.toString", "type", "nodeType")
+DIFF_FIELDS = (
+    "source.toString",
+    "destination.toString",
+    "binary",
+    "truncated",
+    "hunks",
+)
+
+
+def change_rows(
+    pages: Iterable[dict], hashes: str, changes: Optional[List[dict]] = None
+) -> Iterator[List[tuple]]:
+    """
+    Turns pages of changes into pages of table rows.
+
+    Args:
+    - pages: Iterable[dict]: The pages of changes as returned by the server
+    - hashes: str: The rendered source and target commits of the pull request
+    - changes: Optional[List[dict]]: Collects the changes, when given
+    Returns:
+    - Iterator[List[tuple]]: The rows of each page
+    """
+    for page in pages:
+        values = page.get("values", [])
+        if changes is not None:
+            changes.extend(values)
+        yield [(hashes, i["path"]["toString"], f"{i['type']}") for i in values]
+
+
+def changed_paths(changes: Iterable[dict]) -> List[str]:
+    """
+    Lists the paths touched by the changes, including the source of moves.
+
+    Args:
+    - changes: Iterable[dict]: The changes as returned by the server
+    Returns:
+    - List[str]: The paths
+    """
+    paths = []
+    for i in changes:
+        paths.append(i["path"]["toString"])
+        if i.get("srcPath"):
+            paths.append(i["srcPath"]["toString"])
+    return paths
+
 
+def unified_diff(diff: dict) -> str:
+    """
+    Renders a file diff returned by the diff endpoint in the unified format.
 
-def show_diff(_id: str) -> None:
+    Args:
+    - diff: dict: One of the 'diffs' of the response
+    Returns:
+    - str: The unified diff of the file
+    """
+    source = (diff.get("source") or {}).get("toString")
+    destination = (diff.get("destination") or {}).get("toString")
+    lines = [
+        f"diff --git a/{source or destination} b/{destination or source}",
+        f"--- a/{source}" if source else "--- /dev/null",
+        f"+++ b/{destination}" if destination else "+++ /dev/null",
+    ]
+    if diff.get("binary"):
+        lines.append("Binary files differ")
+
+    for hunk in diff.get("hunks", []):
+        lines.append(
+            f"@@ -{hunk['sourceLine']},{hunk['sourceSpan']} +{hunk['destinationLine']},{hunk['destinationSpan']} @@"
+        )
+        for segment in hunk.get("segments", []):
+            prefix = {"ADDED": "+", "REMOVED": "-"}.get(segment["type"], " ")
+            lines.extend(f"{prefix}{line['line']}" for line in segment["lines"])
+
+    if diff.get("truncated"):
+        lines.append("... diff truncated by bitbucket")
+    return "\n".join(lines)
+
+
+def file_diffs(
+    project: str,
+    repository: str,
+    _id: str,
+    paths: Iterable[Tuple[str, Optional[str]]],
+    context: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Fetches the diff of each file from bitbucket, a few files ahead of the one
+    being rendered.
+
+    Args:
+    - project: str: The project name
+    - repository: str: The repository name
+    - _id: str: The pull request id
+    - paths: Iterable[Tuple[str, Optional[str]]]: The path of each file and its source path if it was moved
+    - context: Optional[int]: The number of context lines (default: bitbucket's default)
+    Raises:
+    - ValueError: If a diff cannot be fetched
+    Returns:
+    - Iterator[dict]: The diff responses, in the order of the paths
+    """
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=common_vars.max_workers) as executor:
+        pending: Deque[Future] = deque()
+        for path, src_path in paths:
+            params: dict = {}
+            if context is not None:
+                params["contextLines"] = context
+            if src_path:
+                params["srcPath"] = src_path
+            pending.append(
+                executor.submit(
+                    request.get,
+                    bitbucket_api.pull_request_diff(project, repository, _id, path),
+                    params,
+                )
+            )
+            if len(pending) >= common_vars.max_workers:
+                yield pending.popleft().result()[1]
+        while pending:
+            yield pending.popleft().result()[1]
+
+
+def show_remote_diff(
+    project: str,
+    repository: str,
+    _id: str,
+    paths: Iterable[Tuple[str, Optional[str]]],
+    context: Optional[int] = None,
+) -> None:
+    """
+    Prints the diff of each file as computed by bitbucket, as soon as it arrives,
+    or writes it as an '--output' record.
+
+    Args:
+    - project: str: The project name
+    - repository: str: The repository name
+    - _id: str: The pull request id
+    - paths: Iterable[Tuple[str, Optional[str]]]: The path of each file and its source path if it was moved
+    - context: Optional[int]: The number of context lines (default: bitbucket's default)
+    Raises:
+    - ValueError: If a diff cannot be fetched
+    Returns:
+    - None
+    """
+    responses = file_diffs(project, repository, _id, paths, context)
+    if output.machine_readable():
+        output.emit(
+            (diff for response in responses for diff in response.get("diffs", [])),
+            DIFF_FIELDS,
+        )
+        return
+
+    for response in responses:
+        for diff in response.get("diffs", []):
+            richprint.print_diff(unified_diff(diff))
+
+
+def write_changes(
+    project: str,
+    repository: str,
+    _id: str,
+    pages: Iterable[dict],
+    remote: bool,
+    context: Optional[int] = None,
+) -> None:
+    """
+    Writes the changes of a pull request as '--output' records, or the diff of
+    each changed file computed by bitbucket when 'remote' is set.
+
+    Args:
+    - project: str: The project name
+    - repository: str: The repository name
+    - _id: str: The pull request id
+    - pages: Iterable[dict]: The pages of changes as returned by the server
+    - remote: bool: Write the diffs of the changed files instead of the changes
+    - context: Optional[int]: The number of context lines of the remote diff
+    Raises:
+    - ValueError: If the changes or diffs cannot be fetched
+    Returns:
+    - None
+    """
+    changes = (change for page in pages for change in page.get("values", []))
+    if not remote:
+        output.emit(changes, CHANGE_FIELDS)
+        return
+
+    show_remote_diff(
+        project,
+        repository,
+        _id,
+        (
+            (i["path"]["toString"], (i.get("srcPath") or {}).get("toString"))
+            for i in changes
+        ),
+        context,
+    )
+
+
+def show_diff(
+    _id: str,
+    pager: bool = False,
+    stat: bool = False,
+    server_paths: bool = False,
+    remote: bool = False,
+    paths: Optional[List[str]] = None,
+    context: Optional[int] = None,
+) -> None:
     """
     Shows the difference in the pull request which is already raised
 
+    The changes are printed page by page as they are fetched, followed by the
+    local git diff of the two branches, or by the diff computed by bitbucket
+    when 'remote' is set, which needs no local fetch at all.
+
     Args:
     - _id: str: The pull request id
+    - pager: bool: Show the changes through a pager
+    - stat: bool: Only show the diffstat of the local git diff
+    - server_paths: bool: Limit the local git diff to the paths changed in the pull request
+    - remote: bool: Show the diff computed by bitbucket instead of the local git diff
+    - paths: Optional[List[str]]: Only show the remote diff of these paths
+    - context: Optional[int]: The number of context lines of the remote diff
     Raises:
     - ValueError: If the pull request cannot be fetched
     Returns:
     - None
     """
     project, repository = cmnd.base_repo()
-    with richprint.live_progress("Fetching Contents from Pull Request ..."):
-        response = request.get(
-            bitbucket_api.pull_request_difference(project, repository, _id),
-        )[1]
+    if remote and paths:
+        with richprint.console.pager(styles=True) if pager else nullcontext():
+            show_remote_diff(
+                project, repository, _id, [(i, None) for i in paths], context
+            )
+        return
 
-        pr_info = request.get(
-            bitbucket_api.pull_request_info(project, repository, _id),
-        )[1]
+    machine_readable = output.machine_readable()
+    with (
+        nullcontext()
+        if machine_readable
+        else richprint.live_progress("Fetching Contents from Pull Request ...")
+    ):
+        changes_url = bitbucket_api.pull_request_difference(project, repository, _id)
+        requests = [
+            request.aget(changes_url, {"start": 0, "limit": common_vars.page_limit})
+        ]
+        if not (remote or machine_readable):
+            requests.append(
+                request.aget(bitbucket_api.pull_request_info(project, repository, _id))
+            )
+        responses = request.gather(*requests)
+        _, response = responses[0]
+
+    pages: Iterable[dict] = [response]
+    if not response.get("isLastPage", True):
+        pages = chain(pages, request.pages(changes_url, response["nextPageStart"]))
+
+    if machine_readable:
+        write_changes(project, repository, _id, pages, remote, context)
+        return
 
     header = [
-        ("HASH", "bold white"),
-        ("FILE", "bold white"),
-        ("TYPE", "bold yellow"),
+        ("HASH", "bold white", 27),
+        ("FILE", "bold white", None),
+        ("TYPE", "bold yellow", 7),
     ]
-    value_args = [
-        (
-            f"[bold red]{response['fromHash'][:11]}[/bold red] :arrow_right: [bold green]{response['toHash'][:11]}[/bold green]",
-            i["path"]["toString"],
-            f"{i['type']}",
+    changes: Optional[List[dict]] = [] if server_paths or remote else None
+    with richprint.console.pager(styles=True) if pager else nullcontext():
+        richprint.stream_table(
+            header,
+            change_rows(
+                pages,
+                f"[bold red]{response['fromHash'][:11]}[/bold red] :arrow_right: [bold green]{response['toHash'][:11]}[/bold green]",
+                changes,
+            ),
         )
-        for i in response["values"]
-    ]
-    table = richprint.table(header, value_args, True)
-    richprint.console.print(table)
+        if remote:
+            show_remote_diff(
+                project,
+                repository,
+                _id,
+                (
+                    (i["path"]["toString"], (i.get("srcPath") or {}).get("toString"))
+                    for i in changes
+                ),
+                context,
+            )
+            return
 
+    _, pr_info = responses[1]
     cmnd.show_git_diff(
         f"origin/{pr_info['fromRef']['displayId']}",
         f"origin/{pr_info['toRef']['displayId']}",
+        None if changes is None else changed_paths(changes),
+        stat,
     )
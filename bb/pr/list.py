@@ -24,28 +24,155 @@ bb.pr.show lists all pr is current repo, can also show all pr's authored/revewin
 either in current repo or all repos
 """
 
-from typing import Dict, List, Tuple
+import sqlite3
+import time
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass
+from functools import partial
+from itertools import groupby, takewhile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
-from bb.utils import cmnd, request, richprint
+from bb.utils import cmnd, index, output, request, richprint
 from bb.utils.api import bitbucket_api
+from bb.utils.constants import common_vars
+from bb.utils.ini import get_config
+
+# rich markup of each merge outcome and review status, see 'state_check'
+STYLES: Dict[str, str] = {
+    "CLEAN": "[bold green]{}[/bold green]",
+    "CONFLICTED": "[blink bold black on red]{}[/blink bold black on red]",
+    "APPROVED": "[bold green]{}[/bold green]",
+    "UNAPPROVED": "[bold red]{}[/bold red]",
+    "NEEDS_WORK": "[bold yellow]{}[/bold yellow]",
+    "NONE": "[bold cyan]NOT REVIEWED[/bold cyan]",
+}
+
+
+@dataclass(frozen=True)
+class PullRequest:
+    """
+    The fields of a pull request shown by 'bb pr list', the markup is only
+    built for the pull requests that are rendered, see 'rows'.
+    """
+
+    __slots__ = (
+        "id",
+        "url",
+        "repository",
+        "state",
+        "from_branch",
+        "to_branch",
+        "title",
+        "description",
+        "author",
+        "outcome",
+        "reviews",
+    )
+
+    id: str
+    url: str
+    repository: str
+    state: str
+    from_branch: str
+    to_branch: str
+    title: str
+    description: str
+    author: str
+    outcome: str
+    # the distinct review statuses of the active reviewers, None without reviewers
+    reviews: Optional[Tuple[str, ...]]
+
+    @classmethod
+    def from_json(cls, _pr: dict) -> "PullRequest":
+        """
+        Picks the fields out of a pull request as returned by the server.
+
+        Args:
+            _pr (dict): The pull request.
+
+        Returns:
+            PullRequest: The record.
+        """
+        url = _pr["links"]["self"][0]["href"]
+        user = _pr["author"]["user"]
+        reviewers = _pr["reviewers"]
+        return cls(
+            url.rsplit("/", 1)[-1],
+            url,
+            _pr["fromRef"]["repository"]["slug"],
+            _pr["state"],
+            _pr["fromRef"]["displayId"],
+            _pr["toRef"]["displayId"],
+            _pr["title"],
+            _pr.get("description", "-"),
+            f"{user.get('displayName', 'name not found')} [{user.get('name', 'id not found')}]({user.get('emailAddress', 'email not found')})",
+            _pr["properties"].get("mergeResult", {}).get("outcome", "CLEAN"),
+            tuple(
+                dict.fromkeys(
+                    reviewer["status"]
+                    for reviewer in reviewers
+                    if reviewer["user"]["active"]
+                )
+            )
+            if reviewers
+            else None,
+        )
+
+    def rows(self) -> List[Tuple[str, str]]:
+        """
+        Builds the rows rendered for the pull request.
+
+        Returns:
+            List[Tuple[str, str]]: The title and the markup of each row.
+        """
+        return [
+            (
+                "[bold]Status[/bold]",
+                f"{self.from_branch} -> {self.to_branch} | {state_check(self.outcome)} | {review_status(self.reviews)}",
+            ),
+            ("[bold]Tittle[/bold]", self.title),
+            ("[bold]Description[/bold]", self.description),
+            ("[bold]Author[/bold]", self.author),
+            ("[bold]Url[/bold]", f"[link={self.url}]Click Here[/link]"),
+        ]
+
+    def line(self) -> str:
+        """
+        Builds the single line rendered for the pull request in the compact layout.
+
+        Returns:
+            str: The markup of the line.
+        """
+        return f"{self.from_branch} -> {self.to_branch} | {state_check(self.outcome)} | {review_status(self.reviews)} | {self.title}"
 
 
 def to_richprint(
-    repo_name: str, pr_repo_dict: Dict[str, Dict[str, List[Tuple[str, str]]]]
+    repo_name: str,
+    pr_repo_dict: Dict[str, Dict[str, PullRequest]],
+    compact: bool = False,
 ) -> None:
     """
     Renders the pr_repo_dict to richprint tree view
 
     Args:
     -   repo_name: str: The name of the repository
-    -   pr_repo_dict: Dict[str, Dict[str, List[Tuple[str, str]]]: The dictionary containing the pull request information
+    -   pr_repo_dict: Dict[str, Dict[str, PullRequest]]: The pull requests of the repository by state and id
+    -   compact: bool: Flag indicating whether each pull request takes one line
     Raises:
     -   This function does not raise any exceptions
     Returns:
     -   None
     """
     for status, data in pr_repo_dict.items():
-        richprint.render_tree(repo_name, status, data)
+        # the markup of a pull request is built only when its node is printed
+        richprint.render_tree(
+            repo_name,
+            status,
+            ((_id, _pr.line() if compact else _pr.rows()) for _id, _pr in data.items()),
+            compact,
+        )
 
 
 def state_check(_input: str) -> str:
@@ -59,144 +186,445 @@ def state_check(_input: str) -> str:
     Returns:
     -   str: The formatted string
     """
-    state: dict = {
-        "CLEAN": f"[bold green]{_input}[/bold green]",
-        "CONFLICTED": f"[blink bold black on red]{_input}[/blink bold black on red]",
-        "APPROVED": f"[bold green]{_input}[/bold green]",
-        "UNAPPROVED": f"[bold red]{_input}[/bold red]",
-        "NEEDS_WORK": f"[bold yellow]{_input}[/bold yellow]",
-        "NONE": "[bold cyan]NOT REVIEWED[/bold cyan]",
-    }
-
-    return state[_input.upper()]
+    return STYLES[_input.upper()].format(_input)
 
 
-def outcome(_pr: dict) -> tuple:
+def review_status(reviews: Optional[Iterable[str]]) -> str:
     """
-    show the current status of the pr clean/conflicted
+    show the review status of the pr
 
     Args:
-    -   _pr: dict: The pull request dictionary
+    -   reviews: Optional[Iterable[str]]: The distinct review statuses, None without reviewers
     Raises:
     -   This function does not raise any exceptions
     Returns:
-    -   tuple: The formatted string
+    -   str: The formatted string
     """
-    return (
-        (
-            "[bold green]CLEAN"
-            if "mergeResult" not in _pr["properties"]
-            else f"{state_check(_pr['properties']['mergeResult']['outcome'])}"
+    if reviews is None:
+        return state_check("NONE")
+    return " & ".join(state_check(status) for status in reviews)
+
+
+def construct_repo_dict(
+    pull_requests: Iterable[dict],
+) -> Dict[str, Dict[str, Dict[str, PullRequest]]]:
+    """
+    Groups pull requests by repository and state in a single pass.
+
+    Args:
+        pull_requests (Iterable[dict]): The pull requests as returned by the server.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, PullRequest]]]: The pull requests by repository, state and id.
+
+    """
+    repo_dict: Dict[str, Dict[str, Dict[str, PullRequest]]] = {}
+    for _pr in pull_requests:
+        record = PullRequest.from_json(_pr)
+        repo_dict.setdefault(record.repository, {}).setdefault(record.state, {})[
+            record.id
+        ] = record
+    return repo_dict
+
+
+def synced_pull_requests(
+    connection: sqlite3.Connection, host: str, project: str, repository: str
+) -> Iterator[dict]:
+    """
+    Incrementally syncs the pull requests of a repository into the local index,
+    yielding its open pull requests.
+
+    Syncs fetch pull requests in any state, newest first, until one no newer
+    than the last sync is reached, usually a single page, then yield the open
+    pull requests from the index. The first sync, and one every
+    'common_vars.index_reconcile' seconds, fetches the whole open listing
+    instead and yields each pull request as its page arrives, which drops the
+    pull requests deleted on the server since they never show up in the
+    incremental listing. The sync is recorded once the pull requests are exhausted.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host.
+        project (str): The project name.
+        repository (str): The repository name.
+
+    Yields:
+        dict: The open pull requests of the repository.
+    """
+    request_url = bitbucket_api.current_pull_request(project, repository)
+    since = index.watermark(connection, request_url)
+    reconciled = index.watermark(connection, f"{request_url}#reconciled")
+    now = int(time.time() * 1000)
+    if (
+        since is None
+        or reconciled is None
+        or now - reconciled > common_vars.index_reconcile * 1000
+    ):
+        newest = 0
+        for _pr in index.write_through(
+            connection, host, request.paginate(request_url), project, repository
+        ):
+            newest = max(newest, _pr.get("updatedDate", 0))
+            yield _pr
+        index.set_watermark(connection, f"{request_url}#reconciled", now)
+        # an empty repository would otherwise replay its whole history on the next sync
+        index.set_watermark(connection, request_url, newest or now - 86400000)
+        return
+
+    newest = index.upsert(
+        connection,
+        host,
+        takewhile(
+            lambda _pr: _pr["updatedDate"] > since,
+            request.paginate(f"{request_url}?state=ALL&order=NEWEST", prefetch=False),
         ),
     )
+    index.set_watermark(connection, request_url, newest)
+    yield from index.query(connection, host, project, repository)
 
 
-def review_status(reviewers: list) -> str:
+def sync_pull_requests(
+    connection: sqlite3.Connection, host: str, project: str, repository: str
+) -> None:
     """
-    show the review status of the pr
+    Incrementally syncs the pull requests of a repository into the local index,
+    see 'synced_pull_requests'.
 
     Args:
-    -   reviewers: list: The list of reviewers
-    Raises:
-    -   This function does not raise any exceptions
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host.
+        project (str): The project name.
+        repository (str): The repository name.
+
     Returns:
-    -   str: The formatted string
+        None
     """
-    users = []
-    if reviewers:
-        users.extend(
-            f"{state_check(user['status'])}"
-            for user in reviewers
-            if bool(user["user"]["active"])
+    deque(synced_pull_requests(connection, host, project, repository), maxlen=0)
+
+
+def index_listing(
+    connection: sqlite3.Connection,
+    host: str,
+    role: str,
+    pull_requests: Iterable[dict],
+) -> Iterator[dict]:
+    """
+    Writes the open pull requests of an inbox listing through to the local index
+    as they are consumed, dropping the indexed ones the listing no longer has
+    once it is exhausted, see 'index.write_through'.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host.
+        role (str): The role of the user viewing the pull requests, "author" or "reviewer".
+        pull_requests (Iterable[dict]): Every open pull request listed for the role.
+
+    Yields:
+        dict: The pull requests, once indexed.
+    """
+    if role == "author":
+        yield from index.write_through(
+            connection, host, pull_requests, author=get_config().username
+        )
+    elif role == "reviewer":
+        yield from index.write_through(
+            connection, host, pull_requests, reviewer=get_config().username
         )
     else:
-        users.append(state_check("NONE"))
-    return " & ".join(list(set(users)))
+        for _pr in pull_requests:
+            index.upsert(connection, host, (_pr,))
+            yield _pr
 
 
-def construct_repo_dict(role_info: list) -> dict:
+def indexed_pull_requests(
+    connection: sqlite3.Connection,
+    host: str,
+    role: str,
+    project: str,
+    repository: str,
+) -> Iterable[dict]:
     """
-    Constructs a dictionary containing information about pull requests.
+    Queries the open pull requests for a role from the local index.
 
     Args:
-        role_info (list): A list containing role information.
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host.
+        role (str): The role of the user viewing the pull requests. Can be "current" or a specific role.
+        project (str): The project name.
+        repository (str): The repository name.
 
     Returns:
-        dict: A dictionary containing pull request information.
-
-    """
-    repo_dict: dict = {}
-    if (role_info[0]) == 200 and (len(role_info[1]["values"]) > 0):
-        for _pr in role_info[1]["values"]:
-            repo = f"{_pr['fromRef']['repository']['slug']}"
-            if repo not in repo_dict:
-                repo_dict[repo] = {}
-                if _pr["state"] not in repo_dict[repo].values():
-                    repo_dict[repo] = {_pr["state"]: {}}
-            pr_url_id: tuple = (
-                _pr["links"]["self"][0]["href"].split("/")[-1],
-                _pr["links"]["self"][0]["href"],
-            )
-            author: dict[str, str] = {
-                "display_name": _pr["author"]["user"].get(
-                    "displayName", "name not found"
-                ),
-                "name": _pr["author"]["user"].get("name", "id not found"),
-                "email_address": _pr["author"]["user"].get(
-                    "emailAddress", "email not found"
-                ),
-            }
+        Iterable[dict]: The pull requests.
+    """
+    if role == "author":
+        return index.query(connection, host, author=get_config().username)
+    if role == "reviewer":
+        return index.query(connection, host, reviewer=get_config().username)
+    return index.query(connection, host, project, repository)
+
+
+def grouped(pull_requests: Iterable[dict]) -> Iterator[PullRequest]:
+    """
+    Orders pull requests by repository and state, in the order each was first
+    seen, see 'construct_repo_dict'.
+
+    Args:
+        pull_requests (Iterable[dict]): The pull requests as returned by the server.
+
+    Returns:
+        Iterator[PullRequest]: The records.
+    """
+    return (
+        record
+        for pr_repo_dict in construct_repo_dict(pull_requests).values()
+        for data in pr_repo_dict.values()
+        for record in data.values()
+    )
 
-            _list = [
-                (
-                    "[bold]Status[/bold]",
-                    f"{_pr['fromRef']['displayId']} -> {_pr['toRef']['displayId']} | {outcome(_pr)[0]} | {review_status(_pr['reviewers'])}",
-                ),
-                ("[bold]Tittle[/bold]", _pr["title"]),
-                (
-                    "[bold]Description[/bold]",
-                    _pr["description"] if "description" in _pr.keys() else "-",
-                ),
-                (
-                    "[bold]Author[/bold]",
-                    f"{author['display_name']} [{author['name']}]({author['email_address']})",
-                ),
-                ("[bold]Url[/bold]", f"[link={pr_url_id[1]}]Click Here[/link]"),
-            ]
-            repo_dict[repo][_pr["state"]].update({pr_url_id[0]: _list})
-    return repo_dict
 
+def render_pull_requests(
+    records: Iterable[PullRequest], repository: str, _all: bool, compact: bool = False
+) -> None:
+    """
+    Renders pull requests as a tree per run of the same repository and state,
+    each printed while its pull requests are consumed.
+
+    Without '_all' rendering stops after the current repository, the records
+    left are still consumed so a listing written through to the index completes.
+
+    Args:
+        records (Iterable[PullRequest]): The pull requests.
+        repository (str): The name of the current repository.
+        _all (bool): Flag indicating whether to display all pull requests or only for the current repository.
+        compact (bool): Flag indicating whether to display one line per pull request.
+
+    Returns:
+        None
+    """
+    records = iter(records)
+    rendered = current = False
+    for (repo_name, status), group in groupby(
+        records, key=lambda record: (record.repository, record.state)
+    ):
+        if current and repo_name.lower() != repository.lower():
+            deque(records, maxlen=0)
+            break
+        current = not _all and repo_name.lower() == repository.lower()
+        rendered = True
+        # the markup of a pull request is built only when its node is printed
+        richprint.render_tree(
+            repo_name,
+            status,
+            ((_pr.id, _pr.line() if compact else _pr.rows()) for _pr in group),
+            compact,
+        )
+
+    if not rendered:
+        richprint.console.print(
+            "There are no open pr's :clap-emoji:", style="bold white"
+        )
+
+
+def write_pull_requests(
+    connection: sqlite3.Connection,
+    host: str,
+    role: str,
+    project: str,
+    repository: str,
+    cached: bool,
+) -> None:
+    """
+    Writes the open pull requests for a role as '--output' records, without rendering.
+
+    Pull requests are written while the pages arrive, those of the current
+    repository from the index once an incremental sync is done.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host.
+        role (str): The role of the user viewing the pull requests. Can be "current" or a specific role.
+        project (str): The project name.
+        repository (str): The repository name.
+        cached (bool): Flag indicating whether to write the pull requests from the local index without contacting bitbucket.
 
-def list_pull_request(role: str, _all: bool) -> None:
+    Returns:
+        None
+    """
+    if cached:
+        pull_requests = indexed_pull_requests(
+            connection, host, role, project, repository
+        )
+    elif role == "current":
+        pull_requests = synced_pull_requests(connection, host, project, repository)
+    else:
+        pull_requests = index_listing(
+            connection,
+            host,
+            role,
+            request.paginate(bitbucket_api.pull_request_viewer(role)),
+        )
+    output.emit(pull_requests, common_vars.pull_request_fields)
+
+
+def list_pull_request(
+    role: str, _all: bool, cached: bool = False, compact: bool = False
+) -> None:
     """
     Fetches and displays the pull requests based on the specified role and repository.
 
     Args:
         role (str): The role of the user viewing the pull requests. Can be "current" or a specific role.
         _all (bool): Flag indicating whether to display all pull requests or only for the current repository.
+        cached (bool): Flag indicating whether to display the pull requests from the local index without contacting bitbucket.
+        compact (bool): Flag indicating whether to display one line per pull request.
 
     Returns:
         None
     """
     project, repository = cmnd.base_repo()
-    request_url = bitbucket_api.current_pull_request(project, repository)
-    if role != "current":
-        request_url = bitbucket_api.pull_request_viewer(role)
-
-    with richprint.live_progress(f"Fetching Pull Requests ({role}) ... ") as live:
-        role_info: list = request.get(request_url)
-        repo_dict = construct_repo_dict(role_info)
+    host = bitbucket_api.bitbucket_host
 
-        live.update(richprint.console.print("DONE", style="bold green"))
+    with closing(index.connect()) as connection:
+        if output.machine_readable():
+            write_pull_requests(connection, host, role, project, repository, cached)
+            return
 
-        if len(repo_dict) > 0:
-            for repo_name, pr_repo_dict in repo_dict.items():
-                if repo_name.lower() == repository.lower() and not _all:
-                    to_richprint(repo_name, pr_repo_dict)
-                    break
+        if cached:
+            render_pull_requests(
+                grouped(
+                    indexed_pull_requests(connection, host, role, project, repository)
+                ),
+                repository,
+                _all,
+                compact,
+            )
+            return
 
-                to_richprint(repo_name, pr_repo_dict)
-        else:
-            richprint.console.print(
-                "There are no open pr's :clap-emoji:", style="bold white"
+        with richprint.live_progress(f"Fetching Pull Requests ({role}) ... ") as live:
+            if role == "current":
+                pull_requests = synced_pull_requests(
+                    connection, host, project, repository
+                )
+            else:
+                pull_requests = index_listing(
+                    connection,
+                    host,
+                    role,
+                    request.paginate(bitbucket_api.pull_request_viewer(role)),
+                )
+            # each block is printed as the pages of its pull requests arrive
+            render_pull_requests(
+                map(PullRequest.from_json, pull_requests), repository, _all, compact
             )
+
+            live.update(richprint.console.print("DONE", style="bold green"))
+
+
+def scan_query(state: str, target: str, author: str) -> str:
+    """
+    Builds the query filtering the pull requests of a repository on the server.
+
+    Args:
+        state (str): The state of the pull requests, or "all".
+        target (str): Only pull requests into this branch, all branches when empty.
+        author (str): Only pull requests authored by this user, all authors when empty.
+
+    Returns:
+        str: The url encoded query.
+    """
+    params = {"state": state.upper()}
+    if target:
+        params["at"] = target if target.startswith("refs/") else f"refs/heads/{target}"
+    if author:
+        params.update({"role.1": "AUTHOR", "username.1": author})
+    return urlencode(params)
+
+
+def scan_repository(repository: dict, query: str) -> List[dict]:
+    """
+    Fetches the pull requests of a repository found by a project scan.
+
+    Args:
+        repository (dict): The repository as returned by the server.
+        query (str): The filters, see 'scan_query'.
+
+    Returns:
+        List[dict]: The pull requests as returned by the server.
+    """
+    request_url = bitbucket_api.current_pull_request(
+        repository["project"]["key"], repository["slug"]
+    )
+    return [*request.paginate(f"{request_url}?{query}")]
+
+
+def scan_pull_requests(
+    projects: List[str], state: str, target: str, author: str
+) -> Iterator[List[dict]]:
+    """
+    Scans the repositories of projects for pull requests.
+
+    The repositories are listed page by page and up to 'common_vars.max_workers'
+    of them are fetched at once.
+
+    Args:
+        projects (List[str]): The project keys.
+        state (str): The state of the pull requests, or "all".
+        target (str): Only pull requests into this branch, all branches when empty.
+        author (str): Only pull requests authored by this user, all authors when empty.
+
+    Yields:
+        List[dict]: The pull requests of each repository, as soon as they are fetched.
+    """
+    repositories = (
+        repository
+        for project in projects
+        for repository in request.paginate(bitbucket_api.get_repo_info(project))
+    )
+    yield from request.as_completed(
+        partial(scan_repository, query=scan_query(state, target, author)),
+        repositories,
+    )
+
+
+def list_project_pull_requests(
+    projects: List[str],
+    state: str,
+    target: str,
+    author: str,
+    compact: bool = False,
+) -> None:
+    """
+    Displays the pull requests of every repository in projects, a repository at
+    a time as they are fetched.
+
+    Args:
+        projects (List[str]): The project keys.
+        state (str): The state of the pull requests, or "all".
+        target (str): Only pull requests into this branch, all branches when empty.
+        author (str): Only pull requests authored by this user, all authors when empty.
+        compact (bool): Flag indicating whether to display one line per pull request.
+
+    Returns:
+        None
+    """
+    scan = scan_pull_requests(projects, state, target, author)
+    if output.machine_readable():
+        output.emit(
+            (_pr for pull_requests in scan for _pr in pull_requests),
+            common_vars.pull_request_fields,
+        )
+        return
+
+    found = False
+    with richprint.live_progress(
+        f"Scanning Pull Requests ({', '.join(projects)}) ... "
+    ):
+        for pull_requests in scan:
+            for repo_name, pr_repo_dict in construct_repo_dict(pull_requests).items():
+                to_richprint(repo_name, pr_repo_dict, compact)
+                found = True
+
+    if not found:
+        richprint.console.print(
+            "There are no matching pr's :clap-emoji:", style="bold white"
+        )
@@ -25,87 +25,117 @@ validates automerge conditions & prompts for optional
 rebase and source branch deletion
 """
 
+import asyncio
+from contextlib import closing
+from typing import List
+
 from rich import print_json
 from typer import confirm
 
-from bb.utils import cmnd, request, richprint
+from bb.pr.batch import run_batch
+from bb.utils import cmnd, index, request, richprint
 from bb.utils.api import bitbucket_api
 from bb.utils.constants import common_vars
 
 
-def pr_source_branch_delete_check(
-    project: str,
-    repository: str,
-    _id: str,
-    delete_source_branch: bool,
-) -> None:
+def pr_source_branch_delete_check(cleanup_check: list) -> None:
     """
     Check if the source branch of a pull request can be deleted.
 
     Args:
-        project (str): The project name.
-        repository (str): The repository name.
-        _id (str): The ID of the pull request.
-        delete_source_branch (bool): Flag indicating whether to delete the source branch.
+        cleanup_check (list): The response of the pull request cleanup check.
 
     Raises:
         ValueError: If the source branch deletion validation fails.
     """
 
-    if (
-        len(
-            request.get(
-                bitbucket_api.pr_source_branch_delete_check(
-                    project, repository, _id, delete_source_branch
-                ),
-            )[1]
-        )
-        != 0
-    ):
+    if len(cleanup_check) != 0:
         raise ValueError("Source branch deletion validation failed")
 
 
-def validate_pr_source_branch_delete_check(
-    project: str, repository: str, _id: str
-) -> None:
+def is_mergeable(validation_response: dict) -> bool:
     """
-    Validates the merge for a pull request by checking if the source branch can be deleted.
+    Checks the merge validation response of a pull request.
+
+    Args:
+        validation_response (dict): The response of the merge validation check.
+
+    Returns:
+        bool: True if the pull request can be merged cleanly.
+    """
+    return (
+        validation_response["canMerge"] is True
+        and validation_response["conflicted"] is False
+        and validation_response["outcome"] == "CLEAN"
+    )
+
+
+def validate_pr_source_branch_delete_check(live, validation_response: dict) -> None:
+    """
+    Validates the merge for a pull request from the merge validation response.
+
+    Args:
+        live: The live object.
+        validation_response (dict): The response of the merge validation check.
+
+    Raises:
+        ValueError: If the merge validation fails.
+
+    Returns:
+        None
+    """
+    if is_mergeable(validation_response):
+        live.update(richprint.console.print("OK", style="green"))
+    else:
+        live.update(richprint.console.print("FAILED", style="red"))
+        print_json(data=validation_response)
+        raise ValueError("Merge validation failed")
+
+
+def fetch_merge_checks(
+    project: str, repository: str, _id: str, delete_source_branch: bool
+) -> dict:
+    """
+    Fetches the source branch cleanup check, the merge validation and the pull
+    request information concurrently, and validates the first two.
 
     Args:
         project (str): The project name.
         repository (str): The repository name.
         _id (str): The ID of the pull request.
+        delete_source_branch (bool): Flag indicating whether to delete the source branch.
 
     Raises:
-        ValueError: If the merge validation fails.
+        ValueError: If the source branch deletion or merge validation fails.
 
     Returns:
-        None
+        dict: The pull request information.
     """
     with richprint.live_progress(f"Validating Merge for '{_id}' ... ") as live:
-        validation_response = request.get(
-            bitbucket_api.validate_merge(project, repository, _id),
+        cleanup_check, validation_response, pr_info = request.gather(
+            request.aget(
+                bitbucket_api.pr_source_branch_delete_check(
+                    project, repository, _id, delete_source_branch
+                )
+            ),
+            request.aget(bitbucket_api.validate_merge(project, repository, _id)),
+            request.aget(bitbucket_api.pull_request_info(project, repository, _id)),
         )
-        if (
-            validation_response[1]["canMerge"] is True
-            and validation_response[1]["conflicted"] is False
-            and validation_response[1]["outcome"] == "CLEAN"
-        ):
-            live.update(richprint.console.print("OK", style="green"))
-        else:
-            live.update(richprint.console.print("FAILED", style="red"))
-            print_json(data=validation_response[1])
-            raise ValueError("Merge validation failed")
-
-
-def validate_automerge_conditions(project: str, repository: str, _id: str) -> tuple:
+        pr_source_branch_delete_check(cleanup_check[1])
+        validate_pr_source_branch_delete_check(live, validation_response[1])
+    return pr_info[1]
+
+
+def validate_automerge_conditions(
+    project: str, repository: str, pr_info: dict
+) -> tuple:
     """
     Validates the auto-merge conditions for a pull request.
 
     Args:
         project (str): The project name.
         repository (str): The repository name.
-        _id (str): The pull request ID.
+        pr_info (dict): The pull request information.
 
     Returns:
         tuple: A tuple containing the pull request information, merge information,
@@ -115,9 +145,6 @@ def validate_automerge_conditions(project: str, repository: str, _id: str) -> tu
     with richprint.live_progress(
         f"Checking for '{repository}' auto-merge conditions ... "
     ):
-        pr_info = request.get(
-            bitbucket_api.pull_request_info(project, repository, _id),
-        )[1]
         from_branch, target_branch, version = (
             pr_info["fromRef"]["displayId"],
             pr_info["toRef"]["displayId"],
@@ -185,10 +212,8 @@ def rebase_pr(project: str, repository: str, _id: str, version: int):
     Returns:
         None
     """
-    request.post(
-        bitbucket_api.pr_rebase(project, repository, _id, version)[1],
-        bitbucket_api.pr_rebase(project, repository, _id, version)[0],
-    )
+    body, url = bitbucket_api.pr_rebase(project, repository, _id, version)
+    request.post(url, body)
 
 
 def delete_branch(project, repository, _id, from_branch, target_branch):
@@ -210,10 +235,8 @@ def delete_branch(project, repository, _id, from_branch, target_branch):
             bitbucket_api.pr_cleanup(project, repository, _id),
             bitbucket_api.pr_cleanup_body(True),
         )
-        request.delete(
-            bitbucket_api.delete_branch(project, repository, from_branch)[1],
-            bitbucket_api.delete_branch(project, repository, from_branch)[0],
-        )
+        body, url = bitbucket_api.delete_branch(project, repository, from_branch)
+        request.delete(url, body)
         live.update(richprint.console.print("DONE", style="green"))
 
     cmnd.checkout_and_pull(target_branch)
@@ -245,6 +268,10 @@ def merge_pr(
     )
     if pr_merge_response[0] == 200 and pr_merge_response[1]["state"] == "MERGED":
         live.update(richprint.console.print("MERGED", style="green"))
+        with closing(index.connect()) as connection:
+            index.upsert(
+                connection, bitbucket_api.bitbucket_host, [pr_merge_response[1]]
+            )
     elif pr_merge_response[0] == 409:
         live.update(richprint.console.print("FAILED", style="red"))
         richprint.console.print(
@@ -271,15 +298,18 @@ def merge_pull_request(
         None
     """
     project, repository = cmnd.base_repo()
-    pr_source_branch_delete_check(project, repository, _id, delete_source_branch)
-    validate_pr_source_branch_delete_check(project, repository, _id)
-    (
-        pr_info,
-        pr_merge_response,
-        from_branch,
-        target_branch,
-        version,
-    ) = validate_automerge_conditions(project, repository, _id)
+    with richprint.live_region():
+        (
+            pr_info,
+            pr_merge_response,
+            from_branch,
+            target_branch,
+            version,
+        ) = validate_automerge_conditions(
+            project,
+            repository,
+            fetch_merge_checks(project, repository, _id, delete_source_branch),
+        )
 
     show_merge_stats(pr_merge_response, from_branch, target_branch)
 
@@ -304,3 +334,89 @@ def merge_pull_request(
 
         if delete_condition and pr_merge_response_code in (200, 201):
             delete_branch(project, repository, _id, from_branch, target_branch)
+
+
+def merge_pull_requests(
+    ids: List[str], delete_source_branch: bool, rebase: bool, yes: bool
+) -> None:
+    """
+    Merges many pull requests concurrently after a single confirmation.
+
+    Unlike 'merge_pull_request' no per pull request prompts are shown, rebase and
+    source branch deletion happen only when requested, and local branches are left untouched.
+
+    Args:
+        ids (List[str]): The IDs of the pull requests to merge.
+        delete_source_branch (bool): Whether to delete the source branches after merging.
+        rebase (bool): Whether to rebase the source branches onto their targets before merging.
+        yes (bool): Whether to proceed with the merge without confirmation.
+
+    Raises:
+        ValueError: If any of the pull requests cannot be merged.
+
+    Returns:
+        None
+    """
+    project, repository = cmnd.base_repo()
+
+    if not (
+        yes or confirm(f"? Proceed with merge of {', '.join(f'#{i}' for i in ids)}")
+    ):
+        return
+
+    merged: List[dict] = []
+
+    async def merge(_id: str) -> str:
+        cleanup_check, validation_response, pr_info = await asyncio.gather(
+            request.aget(
+                bitbucket_api.pr_source_branch_delete_check(
+                    project, repository, _id, delete_source_branch
+                )
+            ),
+            request.aget(bitbucket_api.validate_merge(project, repository, _id)),
+            request.aget(bitbucket_api.pull_request_info(project, repository, _id)),
+        )
+        pr_source_branch_delete_check(cleanup_check[1])
+        if not is_mergeable(validation_response[1]):
+            vetoes = [
+                veto["summaryMessage"]
+                for veto in validation_response[1].get("vetoes", [])
+            ]
+            raise ValueError(
+                f"Merge validation failed: {', '.join(vetoes) or validation_response[1]['outcome']}"
+            )
+
+        from_branch, target_branch, version = (
+            pr_info[1]["fromRef"]["displayId"],
+            pr_info[1]["toRef"]["displayId"],
+            pr_info[1]["version"],
+        )
+        if rebase:
+            body, url = bitbucket_api.pr_rebase(project, repository, _id, version)
+            await request.apost(url, body)
+
+        pr_merge_response = await request.apost(
+            f"{bitbucket_api.validate_merge(project, repository, _id)}?avatarSize=32&version={version}",
+            bitbucket_api.pr_merge_body(
+                project, repository, _id, from_branch, target_branch
+            ),
+        )
+        if pr_merge_response[0] == 409:
+            raise ValueError(pr_merge_response[1]["errors"][0]["message"])
+        merged.append(pr_merge_response[1])
+
+        if delete_source_branch:
+            await request.apost(
+                bitbucket_api.pr_cleanup(project, repository, _id),
+                bitbucket_api.pr_cleanup_body(True),
+            )
+            body, url = bitbucket_api.delete_branch(project, repository, from_branch)
+            await request.adelete(url, body)
+
+        return f"'{from_branch}' -> '{target_branch}' MERGED"
+
+    try:
+        run_batch("Merging", merge, ids)
+    finally:
+        with closing(index.connect()) as connection:
+            index.upsert(connection, bitbucket_api.bitbucket_host, merged)
@@ -26,12 +26,20 @@ based on the pr id
 
 import json
 from time import sleep
+from typing import List
 
+from bb.pr.batch import run_batch
 from bb.utils.api import bitbucket_api
 from bb.utils.cmnd import base_repo
-from bb.utils.request import get, put
+from bb.utils.request import aput, get, put
 from bb.utils.richprint import console, live_progress
 
+action_mapper = {
+    "approve": ["APPROVED", "Approving", "green"],
+    "unapprove": ["UNAPPROVED", "Unapproving", "red"],
+    "needs_work": ["NEEDS_WORK", "Work Required on", "yellow"],
+}
+
 
 def review_pull_request(target: int, action: str) -> None:
     """
@@ -44,12 +52,6 @@ def review_pull_request(target: int, action: str) -> None:
     Returns:
         None
     """
-    action_mapper = {
-        "approve": ["APPROVED", "Approving", "green"],
-        "unapprove": ["UNAPPROVED", "Unapproving", "red"],
-        "needs_work": ["NEEDS_WORK", "Work Required on", "yellow"],
-    }
-
     with live_progress(
         f"{action_mapper[action][1]} pull request '{target}' ... "
     ) as live:
@@ -64,3 +66,33 @@ def review_pull_request(target: int, action: str) -> None:
         live.update(
             console.print(f"{action_mapper[action][0]}", style=action_mapper[action][2])
         )
+
+
+def review_pull_requests(targets: List[str], action: str) -> None:
+    """
+    Perform an action on many pull requests concurrently.
+
+    Args:
+        targets (List[str]): The pull request numbers.
+        action (str): The action to perform on the pull requests.
+
+    Raises:
+        ValueError: If the action failed on any of the pull requests.
+
+    Returns:
+        None
+    """
+    user_id = get(bitbucket_api.whoami())[1]
+    project, repository = base_repo()
+    body = json.dumps({"status": action_mapper[action][0]})
+
+    async def review(target: str) -> str:
+        response = await aput(
+            bitbucket_api.action_pull_request(project, repository, target, user_id),
+            body,
+        )
+        if response[0] != 200:
+            raise ValueError(response[1]["errors"][0]["message"])
+        return action_mapper[action][0]
+
+    run_batch(action_mapper[action][1], review, targets)
@@ -23,11 +23,14 @@
 bb.pr.view open the pull request in browser
 """
 
-import webbrowser
+from typing import List
 
+from bb.pr.batch import run_batch
+from bb.utils import output
 from bb.utils.api import bitbucket_api
 from bb.utils.cmnd import base_repo
-from bb.utils.request import get
+from bb.utils.constants import common_vars
+from bb.utils.request import aget, gather, get
 from bb.utils.richprint import console, live_progress, table
 
 
@@ -42,12 +45,24 @@ def view_pull_request(_id: str, web: bool) -> None:
     Returns:
         None
     """
-    with live_progress(f"Fetching info on pr #{_id} ... ") as live:
+    if output.machine_readable():
         project, repository = base_repo()
-        url = get(bitbucket_api.pull_request_info(project, repository, _id))
-        live.update(console.print("DONE", style="bold green"))
+        url = get(
+            bitbucket_api.pull_request_info(project, repository, _id), daemon_ok=True
+        )
+        output.emit([url[1]], common_vars.pull_request_fields)
+    else:
+        with live_progress(f"Fetching info on pr #{_id} ... ") as live:
+            project, repository = base_repo()
+            url = get(
+                bitbucket_api.pull_request_info(project, repository, _id),
+                daemon_ok=True,
+            )
+            live.update(console.print("DONE", style="bold green"))
 
     if web:
+        import webbrowser
+
         with live_progress(f"Opening pr #{_id} in default browser ... ") as live:
             try:
                 to_broweser = webbrowser.open_new(url[1]["links"]["self"][0]["href"])
@@ -58,7 +73,7 @@ def view_pull_request(_id: str, web: bool) -> None:
                 live.update(console.print("ERROR", style="bold red"))
                 console.print(f"Message: {err}", style="dim white")
 
-    else:
+    elif not output.machine_readable():
         console.print(
             f"PR #({url[1]['id']}): {url[1]['fromRef']['displayId']}"
             + " -> "
@@ -96,3 +111,52 @@ def view_pull_request(_id: str, web: bool) -> None:
                 False,
             )
         )
+
+
+def view_pull_requests(ids: List[str], web: bool) -> None:
+    """
+    Fetches information about many pull requests concurrently and summarises them in one table.
+
+    Args:
+        ids (List[str]): The IDs of the pull requests.
+        web (bool): Flag indicating whether to open the pull requests in the default browser.
+
+    Returns:
+        None
+    """
+    import webbrowser
+
+    project, repository = base_repo()
+
+    if output.machine_readable():
+        pull_requests = [
+            response[1]
+            for response in gather(
+                *(
+                    aget(
+                        bitbucket_api.pull_request_info(project, repository, _id),
+                        daemon_ok=True,
+                    )
+                    for _id in ids
+                ),
+                limit=common_vars.max_workers,
+            )
+        ]
+        output.emit(pull_requests, common_vars.pull_request_fields)
+        if web:
+            for pr_info in pull_requests:
+                webbrowser.open_new(pr_info["links"]["self"][0]["href"])
+        return
+
+    async def view(_id: str) -> str:
+        pr_info = (
+            await aget(
+                bitbucket_api.pull_request_info(project, repository, _id),
+                daemon_ok=True,
+            )
+        )[1]
+        if web and webbrowser.open_new(pr_info["links"]["self"][0]["href"]) is False:
+            raise ValueError("Unable to open pr in browser")
+        return f"{pr_info['fromRef']['displayId']} -> {pr_info['toRef']['displayId']} | {pr_info['state']} | {pr_info['title']}"
+
+    run_batch("Fetching info on", view, ids)
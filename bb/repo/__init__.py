@@ -21,17 +21,15 @@
 
 """
 bb: repo - repository management
+
+The command implementations are imported when a command runs, so that
+registering the commands does not pull in the http and rendering stack.
 """
 
 from typer import Argument, Option, Typer
 
-from bb.repo.archive import archive_repository
-from bb.repo.create import create_repository
-from bb.repo.delete import delete_repository
-from bb.utils.cmnd import clone_repo
 from bb.utils.constants import common_vars
 from bb.utils.helper import error_handler, validate_input
-from bb.utils.ini import parse
 from bb.utils.richprint import console
 
 _repo = Typer(add_completion=True, no_args_is_help=True)
@@ -54,8 +52,11 @@ def clone(
         name, "project/repository to clone", common_vars.repo_cant_be_none
     )
 
+    from bb.utils.cmnd import clone_repo
+    from bb.utils.ini import get_config
+
     console.print(f"Cloning '{name}' into '{name.split('/')[1]}'...")
-    clone_repo(name, parse()[2])
+    clone_repo(name, get_config().bitbucket_host)
 
 
 @_repo.command(help="delete a repository the specified project")
@@ -80,6 +81,8 @@ def delete(
         repo, common_vars.repository_name, common_vars.repo_cant_be_none
     )
 
+    from bb.repo.delete import delete_repository
+
     delete_repository(project, repo)
 
 
@@ -105,6 +108,8 @@ def archive(
         repo, common_vars.repository_name, common_vars.repo_cant_be_none
     )
 
+    from bb.repo.archive import archive_repository
+
     archive_repository(project, repo, True)
 
 
@@ -130,6 +135,8 @@ def unarchive(
         repo, common_vars.repository_name, common_vars.repo_cant_be_none
     )
 
+    from bb.repo.archive import archive_repository
+
     archive_repository(project, repo, False)
 
 
@@ -159,4 +166,6 @@ def create(
         repo, common_vars.repository_name, common_vars.repo_cant_be_none
     )
 
+    from bb.repo.create import create_repository
+
     create_repository(project, repo, forkable, default_branch)
@@ -27,7 +27,9 @@ import json
 
 from typer import Exit, confirm
 
+from bb.utils import output
 from bb.utils.api import bitbucket_api
+from bb.utils.constants import common_vars
 from bb.utils.request import put
 from bb.utils.richprint import console, live_progress
 
@@ -54,7 +56,7 @@ def archive_repository(project: str, repo: str, archive: bool) -> None:
         raise Exit(code=1)
 
     with live_progress(
-        f"{'Archiving' if archive else 'Unarchiving' } Repository '{project}/{repo}' ... "
+        f"{'Archiving' if archive else 'Unarchiving'} Repository '{project}/{repo}' ... "
     ) as live:
         request = put(
             bitbucket_api.delete_repo(project, repo),
@@ -63,6 +65,8 @@ def archive_repository(project: str, repo: str, archive: bool) -> None:
 
         if request[0] == 200:
             live.update(console.print("DONE", style="bold green"))
+            if output.machine_readable():
+                output.emit([request[1]], common_vars.repository_fields)
 
         if request[0] in (403, 409):
             live.update(console.print("CONFLICT", style="bold yellow"))
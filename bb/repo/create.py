@@ -21,7 +21,9 @@
 
 import json
 
+from bb.utils import output
 from bb.utils.api import bitbucket_api
+from bb.utils.constants import common_vars
 from bb.utils.request import post
 from bb.utils.richprint import console, live_progress
 
@@ -57,8 +59,10 @@ def create_repository(
             ),  # type: ignore
         )
 
-        if request[0] == 200:
+        if request[0] in (200, 201):
             live.update(console.print("DONE", style="bold green"))
+            if output.machine_readable():
+                output.emit([request[1]], common_vars.repository_fields)
 
         if request[0] == 409:
             live.update(console.print("CONFLICT", style="bold yellow"))
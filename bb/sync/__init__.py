@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb: sync - manages the background process that keeps bitbucket data warm
+
+Defines commands to start, stop and inspect the 'bb sync' daemon, which
+serves the read requests of other bb commands from memory.
+"""
+
+import typer
+
+from bb.utils.helper import error_handler
+from bb.utils.richprint import console
+
+_sync: typer.Typer = typer.Typer(add_completion=False, no_args_is_help=True)
+
+
+@_sync.command(help="start the sync daemon in the background")
+@error_handler
+def start(
+    foreground: bool = typer.Option(
+        False, help="run in the foreground instead of detaching"
+    ),
+) -> None:
+    """
+    Starts the sync daemon, which holds the pooled HTTP session and config and
+    refreshes the responses it served in the background.
+
+    Args:
+    -   :param foreground: A boolean flag that determines whether to run the daemon
+        in the current process instead of detaching it
+        :type foreground: bool
+    Raises:
+    -   :raises ValueError: If the daemon is already running or fails to start
+    Returns:
+    -   :rtype: None
+    """
+    from bb.utils import daemon
+
+    if foreground:
+        daemon.serve()
+        return
+
+    if daemon.call({"op": "status"}, timeout=1) is not None:
+        raise ValueError("bb sync is already running")
+
+    import subprocess
+    import sys
+    import time
+
+    subprocess.Popen(  # nosec B603
+        [sys.executable, "-m", "bb.utils.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    for _ in range(50):
+        status = daemon.call({"op": "status"}, timeout=1)
+        if status is not None:
+            console.print(f"bb sync started (pid {status['pid']})")
+            return
+        time.sleep(0.1)
+    raise ValueError("bb sync failed to start")
+
+
+@_sync.command(help="stop the sync daemon")
+@error_handler
+def stop() -> None:
+    """
+    Stops the sync daemon, bb commands fall back to contacting bitbucket directly.
+
+    Args:
+    -   :param: The `stop` function does not take any parameters
+    Raises:
+    -   :raises ValueError: If the daemon is not running
+    Returns:
+    -   :rtype: None
+    """
+    from bb.utils import daemon
+
+    if daemon.call({"op": "shutdown"}, timeout=1) is None:
+        raise ValueError("bb sync is not running")
+    console.print("bb sync stopped")
+
+
+@_sync.command(help="show the sync daemon status")
+@error_handler
+def status() -> None:
+    """
+    Displays whether the sync daemon is running and how many responses it holds.
+
+    Args:
+    -   :param: The `status` function does not take any parameters
+    Raises:
+    -   :raises: This function does not raise any exceptions
+    Returns:
+    -   :rtype: None
+    """
+    from bb.utils import daemon
+
+    _status = daemon.call({"op": "status"}, timeout=1)
+    if _status is None:
+        console.print("bb sync is not running, commands contact bitbucket directly")
+        return
+
+    console.print(
+        f"bb sync is running (pid {_status['pid']}), up {int(_status['uptime'])}s, "
+        f"holding {_status['entries']} response(s) refreshed every {int(_status['interval'])}s"
+    )
@@ -24,21 +24,34 @@ bb.utils.api - contains the API model for Bitbucket server
 """
 
 import json
+from typing import Optional
 
-from typer import Exit
-
-from bb.utils.ini import is_config_present, parse
+from bb.utils.ini import get_config, is_config_present
 
 
 class BitbucketAPI:
-    def __init__(self, bitbucket_host: str):
+    def __init__(self, bitbucket_host: Optional[str] = None):
         """
         Initializes a new instance of the API class.
 
         Args:
-            bitbucket_host (str): The host URL of the Bitbucket server.
+            bitbucket_host (Optional[str]): The host URL of the Bitbucket server.
+                If None, the host is read from the configuration on first use.
+        """
+        self._bitbucket_host = bitbucket_host
+
+    @property
+    def bitbucket_host(self) -> str:
+        """
+        Returns the host URL of the Bitbucket server.
+
+        Returns:
+            str: The host URL of the Bitbucket server.
+
+        Raises:
+            ValueError: If no host was given and the configuration is not present.
         """
-        self.bitbucket_host = bitbucket_host
+        return self._bitbucket_host or get_config().bitbucket_host
 
     def api_project_url(self, path: str) -> str:
         """
@@ -77,7 +90,7 @@ class BitbucketAPI:
 
     def get_repo_info(self, project: str) -> str:
         """
-        Retrieves the API URL for getting repository information for a given project.
+        Retrieves the paged API URL for getting repository information for a given project.
 
         Args:
             project (str): The project key or ID.
@@ -85,8 +98,21 @@ class BitbucketAPI:
         Returns:
             str: The API URL for getting repository information.
         """
+        return self.api_project_url(f"/rest/api/latest/projects/{project}/repos")
+
+    def repo_info(self, project: str, repository: str) -> str:
+        """
+        Retrieves the API URL for getting a single repository in a project.
+
+        Args:
+            project (str): The project key or ID.
+            repository (str): The repository slug.
+
+        Returns:
+            str: The API URL for getting the repository.
+        """
         return self.api_project_url(
-            f"/rest/api/latest/projects/{project}/repos?start=0&limit=10000"
+            f"/rest/api/latest/projects/{project}/repos/{repository}"
         )
 
     def default_reviewers(
@@ -166,7 +192,7 @@ class BitbucketAPI:
         self, project: str, repository: str, pr_number: str
     ) -> str:
         """
-        Retrieves the difference URL for a specific pull request.
+        Retrieves the paged difference URL for a specific pull request.
 
         Args:
             project (str): The project key or ID.
@@ -177,7 +203,29 @@ class BitbucketAPI:
             str: The URL for the pull request difference.
         """
         return self.api_project_url(
-            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{pr_number}/changes?start=0&limit=1000&changeScope=unreviewed"
+            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{pr_number}/changes?changeScope=unreviewed"
+        )
+
+    def pull_request_diff(
+        self, project: str, repository: str, pr_number: str, path: str = ""
+    ) -> str:
+        """
+        Retrieves the URL for the diff of a pull request, or of one file in it.
+
+        Args:
+            project (str): The project key or ID.
+            repository (str): The repository slug or ID.
+            pr_number (str): The pull request number.
+            path (str): The path of the file (default: all files).
+
+        Returns:
+            str: The URL for the pull request diff.
+        """
+        from urllib.parse import quote
+
+        return self.api_project_url(
+            f"/rest/api/latest/projects/{project}/repos/{repository}/pull-requests/{pr_number}/diff"
+            + (f"/{quote(path)}" if path else "")
         )
 
     def pull_request_info(self, project: str, repository: str, _id: str) -> str:
@@ -454,7 +502,7 @@ def load_bitbucket_api() -> BitbucketAPI:
     Loads the Bitbucket API by reading the configuration data and returning an instance of BitbucketAPI.
 
     Raises:
-        ValueError: If the configuration is not present or if the number of configuration items is not 3.
+        ValueError: If the configuration is not present.
 
     Returns:
         BitbucketAPI: An instance of the BitbucketAPI class.
@@ -462,15 +510,8 @@ def load_bitbucket_api() -> BitbucketAPI:
     if not is_config_present():
         raise ValueError("Configuration not present")
 
-    config_data = parse()
-    if len(config_data) != 3:
-        raise ValueError(f"Expected 3 configuration items, got {len(config_data)}")
-
-    return BitbucketAPI(config_data[2])
+    return BitbucketAPI(get_config().bitbucket_host)
 
 
-try:
-    bitbucket_api = load_bitbucket_api()
-except ValueError:
-    bitbucket_api = None
-    Exit(code=1)
+# Resolves the host from the configuration on first use, see 'bb.utils.ini.set_config'.
+bitbucket_api = BitbucketAPI()
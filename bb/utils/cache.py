@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.cache - persists http responses under ~/.cache/bb
+
+Read-only endpoints are cached per user and url with a per-endpoint ttl,
+stale entries are revalidated with ETag/Last-Modified and the cache is kept
+under a size limit by evicting the least recently used entries.
+
+Repository ids rarely change for a slug, so they are kept in a separate
+index that is not subject to expiry or eviction.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from bb.utils.constants import common_vars
+
+# Time to live in seconds for each cacheable endpoint, matched against the url path.
+TTL: Dict[str, int] = {
+    r"/plugins/servlet/applinks/whoami$": 86400,
+    r"/rest/api/latest/projects/[^/]+/repos$": 300,
+    r"/settings/pull-requests$": 3600,
+    r"/rest/default-reviewers/": 900,
+    r"/automerge/path/": 600,
+}
+
+
+def cache_path() -> str:
+    """
+    Returns the path to the cache directory.
+
+    Returns:
+        str: The path to the cache directory.
+    """
+    return os.path.join(str(Path.home()), ".cache", "bb")
+
+
+BB_CACHE_DIR: str = cache_path()
+
+
+def ttl(path: str) -> Optional[int]:
+    """
+    Returns the time to live for the given url path.
+
+    Args:
+        path (str): The url path of the request.
+
+    Returns:
+        Optional[int]: The time to live in seconds, None if the endpoint is not cacheable.
+    """
+    for pattern, seconds in TTL.items():
+        if re.search(pattern, path):
+            return seconds
+    return None
+
+
+def key(user: str, url: str) -> str:
+    """
+    Returns the cache key for a user and url.
+
+    Args:
+        user (str): The user making the request.
+        url (str): The full url of the request, including the query.
+
+    Returns:
+        str: The cache key.
+    """
+    return hashlib.sha256(f"{user} {url}".encode("utf-8")).hexdigest()
+
+
+def _entry_path(_key: str) -> str:
+    return os.path.join(BB_CACHE_DIR, "http", f"{_key}.json")
+
+
+def load(_key: str) -> Optional[dict]:
+    """
+    Loads a cache entry and marks it as recently used.
+
+    Args:
+        _key (str): The cache key.
+
+    Returns:
+        Optional[dict]: The cache entry, None if it is missing or unreadable.
+    """
+    path = _entry_path(_key)
+    try:
+        with open(path, encoding="utf-8") as entry:
+            data: dict = json.load(entry)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return data
+
+
+def is_fresh(entry: dict, seconds: int) -> bool:
+    """
+    Checks whether a cache entry is still within its time to live.
+
+    Args:
+        entry (dict): The cache entry.
+        seconds (int): The time to live in seconds.
+
+    Returns:
+        bool: True if the entry can be served without revalidation.
+    """
+    return time.time() - entry.get("stored_at", 0) < seconds
+
+
+def store(_key: str, entry: dict) -> None:
+    """
+    Writes a cache entry and evicts old entries if the cache is over its size limit.
+
+    Args:
+        _key (str): The cache key.
+        entry (dict): The cache entry.
+
+    Returns:
+        None
+    """
+    path = _entry_path(_key)
+    try:
+        Path(path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            json.dump({**entry, "stored_at": time.time()}, tmp)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    evict()
+
+
+def _load_index(name: str) -> dict:
+    try:
+        with open(os.path.join(BB_CACHE_DIR, name), encoding="utf-8") as index:
+            return json.load(index)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_index(name: str, index: dict) -> None:
+    path = os.path.join(BB_CACHE_DIR, name)
+    try:
+        Path(BB_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            json.dump(index, tmp)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+
+
+def load_repo_id(repo_url: str) -> Optional[int]:
+    """
+    Looks up a repository id in the persistent slug to id index.
+
+    Args:
+        repo_url (str): The API URL of the repository, which identifies host, project and slug.
+
+    Returns:
+        Optional[int]: The repository id, None if it is not indexed yet.
+    """
+    return _load_index("repos.json").get(repo_url)
+
+
+def store_repo_id(repo_url: str, repo_id: int) -> None:
+    """
+    Adds a repository id to the persistent slug to id index.
+
+    Args:
+        repo_url (str): The API URL of the repository, which identifies host, project and slug.
+        repo_id (int): The repository id.
+
+    Returns:
+        None
+    """
+    index = _load_index("repos.json")
+    index[repo_url] = repo_id
+    _store_index("repos.json", index)
+
+
+def load_remote(git_dir: str) -> Optional[dict]:
+    """
+    Looks up the resolved remote of a work tree.
+
+    Args:
+        git_dir (str): The git directory of the work tree.
+
+    Returns:
+        Optional[dict]: The entry holding the 'stamp' it was resolved for and
+        the 'repo', None if it was never resolved.
+    """
+    return _load_index("remotes.json").get(git_dir)
+
+
+def store_remote(git_dir: str, entry: dict) -> None:
+    """
+    Records the resolved remote of a work tree.
+
+    Args:
+        git_dir (str): The git directory of the work tree.
+        entry (dict): The 'stamp' the remote was resolved for and the 'repo'.
+
+    Returns:
+        None
+    """
+    index = _load_index("remotes.json")
+    index[git_dir] = entry
+    _store_index("remotes.json", index)
+
+
+def evict(max_bytes: int = common_vars.cache_max_bytes) -> None:
+    """
+    Removes the least recently used entries until the cache fits in 'max_bytes'.
+
+    Args:
+        max_bytes (int): The maximum size of the cache in bytes.
+
+    Returns:
+        None
+    """
+    try:
+        with os.scandir(os.path.join(BB_CACHE_DIR, "http")) as entries:
+            stats = sorted(
+                ((entry.stat(), entry.path) for entry in entries if entry.is_file()),
+                key=lambda stat_path: stat_path[0].st_mtime,
+            )
+    except OSError:
+        return
+
+    total = sum(stat.st_size for stat, _ in stats)
+    for stat, path in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= stat.st_size
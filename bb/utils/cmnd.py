@@ -25,9 +25,12 @@ can capture relavent details from local repository
 
 """
 
+import os
 import platform
+import re
 import subprocess
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 from bb.utils.richprint import console
 
@@ -68,6 +71,254 @@ def subprocess_run(command: str, text: Optional[str] = None) -> str:
     return cmnd.stdout.decode().strip()
 
 
+@dataclass
+class RepoContext:
+    """Details of the local repository, probed once per process"""
+
+    inside_work_tree: bool
+    branch: str
+    remotes: Dict[str, str]
+    upstream: Optional[str] = None
+    _commit_message: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def commit_message(self) -> str:
+        """
+        The message of the HEAD commit, fetched on first access since only
+        'bb pr create' needs it.
+        """
+        if self._commit_message is None:
+            self._commit_message = subprocess_run("git log --format=%B -n 1")
+        return self._commit_message
+
+
+_contexts: Dict[str, RepoContext] = {}
+
+# environment variables that change how git discovers the repository
+GIT_DISCOVERY_ENV: Tuple[str, ...] = (
+    "GIT_DIR",
+    "GIT_WORK_TREE",
+    "GIT_COMMON_DIR",
+    "GIT_CEILING_DIRECTORIES",
+)
+
+
+def find_git_dir(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Finds the git directory of the work tree containing a path, following the
+    'gitdir:' file of linked worktrees and submodules.
+
+    Args:
+        path (str): The directory to start the search from.
+
+    Returns:
+        Optional[Tuple[str, str]]: The git directory and the common directory
+        holding the config, None if there is none or the layout is unusual.
+    """
+    if any(variable in os.environ for variable in GIT_DISCOVERY_ENV):
+        return None
+
+    path = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            git_dir = dot_git
+            break
+        if os.path.isfile(dot_git):
+            with open(dot_git, encoding="utf-8") as gitfile:
+                content = gitfile.read().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = os.path.normpath(
+                os.path.join(path, content[len("gitdir:") :].strip())
+            )
+            break
+        parent = os.path.dirname(path)
+        if parent == path or os.path.basename(path) == ".git":
+            return None
+        path = parent
+
+    common_dir = git_dir
+    if os.path.isfile(os.path.join(git_dir, "commondir")):
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as commondir:
+            common_dir = os.path.normpath(
+                os.path.join(git_dir, commondir.read().strip())
+            )
+    return git_dir, common_dir
+
+
+def _config_value(value: str) -> str:
+    """
+    Unquotes a git config value and strips its trailing comment.
+    """
+    unquoted, quoted = [], False
+    for char in value.strip():
+        if char == '"':
+            quoted = not quoted
+        elif char in "#;" and not quoted:
+            break
+        else:
+            unquoted.append(char)
+    return "".join(unquoted).strip()
+
+
+def read_git_config(path: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Parses a git config file into sections, e.g. 'remote.origin' -> {'url': ...}.
+
+    Only the first value of a multi-valued key is kept.
+
+    Args:
+        path (str): The path to the config file.
+
+    Returns:
+        Optional[Dict[str, Dict[str, str]]]: The sections, None if the file uses
+        includes, URL rewrites or continuation lines which only git resolves.
+    """
+    sections: Dict[str, Dict[str, str]] = {}
+    section: Dict[str, str] = sections.setdefault("", {})
+    with open(path, encoding="utf-8") as config:
+        for line in config:
+            line = line.strip()
+            if not line or line[0] in "#;":
+                continue
+            if line.endswith("\\"):
+                return None
+            if line.startswith("["):
+                header = line[1 : line.index("]")]
+                name, _, subsection = header.partition(" ")
+                name, subsection = name.lower(), subsection.strip().strip('"')
+                if name in ("include", "includeif"):
+                    return None
+                section = sections.setdefault(
+                    f"{name}.{subsection}" if subsection else name, {}
+                )
+                continue
+            key, separator, value = line.partition("=")
+            key = key.strip().lower()
+            if key in ("insteadof", "pushinsteadof"):
+                return None
+            section.setdefault(key, _config_value(value) if separator else "true")
+    return sections
+
+
+def _rewrites_urls() -> bool:
+    """
+    Checks whether the user or system git config rewrites URLs with 'insteadOf'.
+    """
+    xdg_config_home = os.environ.get(
+        "XDG_CONFIG_HOME", os.path.join(os.path.expanduser("~"), ".config")
+    )
+    for path in (
+        os.path.join(os.path.expanduser("~"), ".gitconfig"),
+        os.path.join(xdg_config_home, "git", "config"),
+        "/etc/gitconfig",
+    ):
+        try:
+            with open(path, encoding="utf-8") as config:
+                if "insteadof" in config.read().lower():
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def read_repo_context(path: str) -> Optional[RepoContext]:
+    """
+    Reads the repository details straight from the files under .git.
+
+    Args:
+        path (str): The directory inside the work tree.
+
+    Returns:
+        Optional[RepoContext]: The repository details, None if the layout needs git itself.
+    """
+    git_dirs = find_git_dir(path)
+    if git_dirs is None:
+        return None
+    git_dir, common_dir = git_dirs
+
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as head:
+            ref = head.read().strip()
+        config = read_git_config(os.path.join(common_dir, "config"))
+    except (OSError, ValueError):
+        return None
+
+    if (
+        config is None
+        or config.get("core", {}).get("bare", "false").lower() == "true"
+        or "worktree" in config.get("core", {})
+        or _rewrites_urls()
+    ):
+        return None
+
+    # same output as 'git rev-parse --abbrev-ref HEAD' for a detached HEAD
+    branch = (
+        ref[len("ref: refs/heads/") :] if ref.startswith("ref: refs/heads/") else "HEAD"
+    )
+    remotes = {
+        name[len("remote.") :]: values["url"]
+        for name, values in sorted(config.items())
+        if name.startswith("remote.") and "url" in values
+    }
+    return RepoContext(
+        True, branch, remotes, config.get(f"branch.{branch}", {}).get("remote")
+    )
+
+
+def _probe_repo_context() -> RepoContext:
+    """
+    Reads the repository details by running git.
+
+    Returns:
+        RepoContext: The repository details.
+
+    Raises:
+        RuntimeError: If the current directory is not inside a git repository.
+    """
+    inside_work_tree, branch = subprocess_run(
+        "git rev-parse --is-inside-work-tree --abbrev-ref HEAD"
+    ).splitlines()
+
+    remotes: Dict[str, str] = {}
+    for line in subprocess_run("git remote -v").splitlines():
+        name, url = line.replace("\t", " ").split(" ")[:2]
+        remotes.setdefault(name, url.strip())
+
+    return RepoContext(inside_work_tree == "true", branch, remotes)
+
+
+def repo_context() -> RepoContext:
+    """
+    Returns the details of the repository in the current directory.
+
+    HEAD and the config are read straight from .git, falling back to running
+    git for unusual layouts, and the result is memoized for the rest of the
+    process.
+
+    Returns:
+        RepoContext: The repository details.
+
+    Raises:
+        RuntimeError: If the current directory is not inside a git repository.
+    """
+    cwd = os.getcwd()
+    if cwd not in _contexts:
+        _contexts[cwd] = read_repo_context(cwd) or _probe_repo_context()
+    return _contexts[cwd]
+
+
+def reset_repo_context() -> None:
+    """
+    Forgets the memoized repository details, called after commands that move HEAD.
+
+    Returns:
+        None
+    """
+    _contexts.clear()
+
+
 def is_git_repo() -> bool:
     """
     Check if the current directory is a Git repository.
@@ -75,30 +326,110 @@ def is_git_repo() -> bool:
     Returns:
         bool: True if the current directory is a Git repository, False otherwise.
     """
-    return subprocess_run("git rev-parse --is-inside-work-tree") == "true"
+    return repo_context().inside_work_tree
+
+
+def parse_remote_url(url: str) -> Tuple[str, str]:
+    """
+    Extracts the project and repository from a remote URL.
+
+    Handles http(s) and ssh URLs, with or without a port or context path,
+    scp-like 'user@host:project/repo.git' forms and local paths. Only a
+    trailing '.git' is removed, so repository names may contain dots.
+
+    Args:
+        url (str): The remote URL.
+
+    Returns:
+        Tuple[str, str]: The project and the repository.
+
+    Raises:
+        ValueError: If the URL has no project and repository.
+    """
+    if "://" in url:
+        path = url.split("://", 1)[1].partition("/")[2]
+    elif ":" in url.split("/")[0]:
+        path = url.split(":", 1)[1]
+    else:
+        path = url
+
+    path = path.split("?")[0].rstrip("/")
+    if path.endswith(".git"):
+        path = path[: -len(".git")]
+
+    parts = [part for part in re.split(r"[/\\]", path) if part]
+    if len(parts) < 2:
+        raise ValueError(f"Cannot find the project and repository in remote '{url}'")
+    return parts[-2], parts[-1]
+
+
+def select_remote(context: RepoContext) -> str:
+    """
+    Chooses the remote of the repository: the upstream of the current branch,
+    'origin', or else the first one by name.
+
+    Args:
+        context (RepoContext): The repository details.
+
+    Returns:
+        str: The remote name.
+
+    Raises:
+        ValueError: If the repository has no remotes.
+    """
+    if not context.remotes:
+        raise ValueError("no remote information is found")
+    if context.upstream in context.remotes:
+        return context.upstream
+    if "origin" in context.remotes:
+        return "origin"
+    return next(iter(context.remotes))
+
+
+def _remote_stamp(git_dirs: Optional[Tuple[str, str]]) -> Optional[list]:
+    """
+    Returns what the resolved remote depends on: the config mtime and HEAD.
+    """
+    if git_dirs is None:
+        return None
+    git_dir, common_dir = git_dirs
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as head:
+            return [
+                os.stat(os.path.join(common_dir, "config")).st_mtime_ns,
+                head.read().strip(),
+            ]
+    except OSError:
+        return None
 
 
 def base_repo() -> list:
     """
     Retrieves the base repository information.
 
+    The result is cached per work tree until its config or HEAD changes.
+
     Returns:
         list: A list containing the base repository owner and name.
 
     Raises:
         ValueError: If no remote information is found.
     """
-    cmnd = subprocess_run("git remote -v")
+    from bb.utils import cache
 
-    if cmnd is None:
-        raise ValueError("no remote information is found")
+    git_dirs = find_git_dir(os.getcwd())
+    stamp = _remote_stamp(git_dirs)
+    if stamp is not None:
+        entry = cache.load_remote(git_dirs[0])
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["repo"]
 
-    formatted_cmnd = cmnd.splitlines()[0].replace("\t", " ").split(" ")[1].strip()
+    context = repo_context()
+    repo = list(parse_remote_url(context.remotes[select_remote(context)]))
 
-    return [
-        formatted_cmnd.split("/")[-2],
-        formatted_cmnd.split("/")[-1].split(".")[0],
-    ]
+    if stamp is not None:
+        cache.store_remote(git_dirs[0], {"stamp": stamp, "repo": repo})
+    return repo
 
 
 def title_and_description() -> list:
@@ -108,8 +439,7 @@ def title_and_description() -> list:
     Returns:
         list: A list containing the title and description of the commit message.
     """
-    commit_message = subprocess_run("git log --format=%B -n 1")
-    tmp = commit_message.split("\n")
+    tmp = repo_context().commit_message.split("\n")
     return [tmp[0], "\n".join(tmp[2:])]
 
 
@@ -120,7 +450,7 @@ def from_branch() -> str:
     Returns:
         str: The name of the current branch.
     """
-    return subprocess_run("git rev-parse --abbrev-ref HEAD")
+    return repo_context().branch
 
 
 def git_rebase(target_branch: str) -> None:
@@ -141,6 +471,8 @@ def git_rebase(target_branch: str) -> None:
         subprocess_run("git push --force-with-lease")
     except Exception as ex:
         raise ValueError(ex) from ex
+    finally:
+        reset_repo_context()
 
 
 def checkout_and_pull(branch_name: str) -> None:
@@ -165,6 +497,7 @@ def checkout_and_pull(branch_name: str) -> None:
         )
 
     subprocess.check_call(["git", "checkout", branch_name])
+    reset_repo_context()
 
     subprocess.check_call(["git", "pull", "--no-edit"])
 
@@ -230,13 +563,20 @@ def cp_to_clipboard(url: str) -> None:
     subprocess_run(cmd, url)
 
 
-def show_git_diff(from_branch: str, to_branch: str) -> None:
+def show_git_diff(
+    from_branch: str,
+    to_branch: str,
+    paths: Optional[List[str]] = None,
+    stat: bool = False,
+) -> None:
     """
     Show the git diff between two branches.
 
     Args:
         from_branch (str): The name of the source branch.
         to_branch (str): The name of the target branch.
+        paths (Optional[List[str]]): Only show the diff of these paths, nothing when empty (default: all).
+        stat (bool): Only show the diffstat (default: False).
 
     Raises:
         ValueError: If the git diff command fails.
@@ -244,7 +584,25 @@ def show_git_diff(from_branch: str, to_branch: str) -> None:
     Returns:
         None
     """
+    if paths is not None and not paths:
+        return
+
+    command = ["git", "diff", *(["--stat"] if stat else []), to_branch, from_branch]
     try:
-        subprocess.check_call(["git", "diff", to_branch, from_branch])
+        if paths is None:
+            subprocess.check_call(command)
+            return
+
+        # keep each command line well below the windows limit of 32767 characters
+        chunks: List[List[str]] = [[]]
+        for path in paths:
+            if sum(len(i) + 1 for i in chunks[-1]) + len(path) > 8000:
+                chunks.append([])
+            chunks[-1].append(path)
+
+        if len(chunks) > 1:
+            command.insert(1, "--no-pager")
+        for chunk in chunks:
+            subprocess.check_call([*command, "--", *chunk])
     except subprocess.CalledProcessError as err:
         raise ValueError("ABORTED") from err
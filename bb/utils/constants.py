@@ -19,7 +19,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
-from typing import Dict
+from typing import Dict, Union
 
 
 class CommonVars:
@@ -28,17 +28,66 @@ class CommonVars:
     bold_red: str = "bold red"
     bold_white: str = "bold white"
     id_cannot_be_none: str = "id cannot be none"
+    ids_help: str = "pull request number(s), ex: 1,2,5-8 or '-' to read from stdin"
     not_a_git_repo: str = "Not a git repository"
     skip_prompt: str = "skip confirmation prompt"
     content_type: str = "application/json;charset=UTF-8"
     dim_white: str = "dim white"
-    state: Dict[str, bool] = {"verbose": False}
+    state: Dict[str, Union[bool, float, str]] = {
+        "verbose": False,
+        "no_cache": False,
+        "daemon": True,
+        "rate_limit": 0.0,
+        "rate_limit_shared": False,
+        "trace": False,
+        "max_requests": 0,
+        "output": "text",
+        "refresh_rate": 10.0,
+    }
     repo_cant_be_none: str = "repository can't be none"
     project_name_of_repo: str = "project name of the repository"
     project_name: str = "Project name"
     repository_name: str = "Repository Name"
     project_cant_be_none: str = "project can't be none"
     timeout: float = 10.0
+    max_connections: int = 10
+    max_workers: int = 8
+    max_ids: int = 100
+    page_limit: int = 500
+    cache_max_bytes: int = 32 * 1024 * 1024
+    daemon_interval: float = 30.0
+    retry_attempts: int = 4
+    retry_backoff: float = 0.5
+    retry_max_delay: float = 30.0
+    retry_budget: int = 10
+    rate_limit_burst: int = 5
+    daemon_idle: float = 3600.0
+    # seconds between the full listings that drop pull requests deleted on the server from the index
+    index_reconcile: float = 3600.0
+    # columns of pull requests and repositories in '--output csv', as dotted paths into the json
+    pull_request_fields: tuple = (
+        "id",
+        "state",
+        "title",
+        "fromRef.displayId",
+        "toRef.displayId",
+        "toRef.repository.project.key",
+        "toRef.repository.slug",
+        "author.user.name",
+        "properties.mergeResult.outcome",
+        "updatedDate",
+        "links.self.0.href",
+    )
+    repository_fields: tuple = (
+        "id",
+        "slug",
+        "name",
+        "project.key",
+        "state",
+        "archived",
+        "forkable",
+        "links.self.0.href",
+    )
 
 
 common_vars: CommonVars = CommonVars()
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.daemon - optional background process serving warm GET responses
+
+'bb sync start' launches a long-lived process listening on a unix socket
+in the cache directory. It holds the pooled HTTP session and the parsed
+config, serves GET requests from memory and refreshes the responses it
+served in the background. Every client call falls back to direct mode
+when the daemon is not running.
+"""
+
+import json
+import os
+import re
+import socket
+import time
+from typing import Optional, Tuple
+
+from bb.utils import cache
+from bb.utils.constants import common_vars
+
+# The read-only listings and views the daemon serves, matched against the url path.
+# Merge checks, cleanup checks and single pull requests, whose version is sent
+# back with writes, are fetched live unless the caller opts in with 'daemon_ok',
+# as 'bb pr view' and 'bb pr copy' do.
+SERVED: Tuple[str, ...] = (
+    r"/rest/api/latest/inbox/pull-requests$",
+    r"/rest/api/latest/projects/[^/]+/repos$",
+    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests$",
+    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/\d+/changes$",
+    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/\d+/diff/",
+)
+
+
+def socket_path() -> str:
+    """
+    Returns the path to the daemon socket.
+
+    Returns:
+        str: The path to the unix socket.
+    """
+    return os.path.join(cache.BB_CACHE_DIR, "bbd.sock")
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message).encode() + b"\n"
+
+
+def call(message: dict, timeout: float = common_vars.timeout) -> Optional[dict]:
+    """
+    Sends a message to the daemon and returns its reply.
+
+    Args:
+        message (dict): The message, its 'op' key names the operation.
+        timeout (float): The maximum time to wait for the reply in seconds.
+
+    Returns:
+        Optional[dict]: The reply, None if the daemon is not running.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path())
+            client.sendall(_encode(message))
+            with client.makefile("rb") as reply:
+                return json.loads(reply.readline() or "null")
+    except (OSError, ValueError):
+        return None
+
+
+async def acall(message: dict, timeout: float = common_vars.timeout) -> Optional[dict]:
+    """
+    Sends a message to the daemon asynchronously, see 'call'.
+
+    Args:
+        message (dict): The message, its 'op' key names the operation.
+        timeout (float): The maximum time to wait for the reply in seconds.
+
+    Returns:
+        Optional[dict]: The reply, None if the daemon is not running.
+    """
+    import asyncio
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(socket_path())
+    except OSError:
+        return None
+    try:
+        writer.write(_encode(message))
+        await writer.drain()
+        return json.loads(await asyncio.wait_for(reader.readline(), timeout) or "null")
+    except (OSError, ValueError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+
+
+def _reply_to_response(reply: Optional[dict]) -> Optional[list]:
+    if reply is None or "error" in reply:
+        return None
+    return [reply["status"], reply["data"]]
+
+
+def serves(path: str) -> bool:
+    """
+    Returns whether GET requests for the given url path may be served by the daemon.
+
+    Args:
+        path (str): The url path of the request.
+
+    Returns:
+        bool: True for the read-only endpoints in 'SERVED'.
+    """
+    return any(re.search(pattern, path) for pattern in SERVED)
+
+
+def get(url: str, username: str) -> Optional[list]:
+    """
+    Fetches a GET response through the daemon.
+
+    Args:
+        url (str): The full URL, including the query.
+        username (str): The user the response is fetched for.
+
+    Returns:
+        Optional[list]: The response status code and data, None if the daemon
+        is not running or could not serve the request.
+    """
+    return _reply_to_response(call({"op": "get", "url": url, "user": username}))
+
+
+async def aget(url: str, username: str) -> Optional[list]:
+    """
+    Fetches a GET response through the daemon asynchronously, see 'get'.
+
+    Args:
+        url (str): The full URL, including the query.
+        username (str): The user the response is fetched for.
+
+    Returns:
+        Optional[list]: The response status code and data, None if the daemon
+        is not running or could not serve the request.
+    """
+    return _reply_to_response(await acall({"op": "get", "url": url, "user": username}))
+
+
+def invalidate() -> None:
+    """
+    Drops the responses held by the daemon, called after any write request.
+
+    Returns:
+        None
+    """
+    call({"op": "invalidate"})
+
+
+async def ainvalidate() -> None:
+    """
+    Drops the responses held by the daemon asynchronously, see 'invalidate'.
+
+    Returns:
+        None
+    """
+    await acall({"op": "invalidate"})
+
+
+class Store:
+    """In-memory GET responses held by the daemon, keyed by URL"""
+
+    def __init__(self, interval: float) -> None:
+        import threading
+
+        self.interval = interval
+        self.entries: dict = {}
+        self.lock = threading.Lock()
+
+    def get(self, url: str) -> list:
+        """
+        Serves a response from memory, fetching it when missing or stale.
+
+        Args:
+            url (str): The full URL, including the query.
+
+        Returns:
+            list[int, dict]: The response status code and data.
+
+        Raises:
+            ValueError: If the request returns a non-200 status code.
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None and now - entry["fetched"] < self.interval:
+                entry["accessed"] = now
+                return entry["response"]
+        return self.fetch(url, now)
+
+    def fetch(self, url: str, accessed: float) -> list:
+        """
+        Fetches a response from bitbucket and keeps it.
+
+        Args:
+            url (str): The full URL, including the query.
+            accessed (float): When the response was last requested by a client.
+
+        Returns:
+            list[int, dict]: The response status code and data.
+
+        Raises:
+            ValueError: If the request returns a non-200 status code.
+        """
+        from bb.utils import request
+
+        response = request.get(url)
+        with self.lock:
+            self.entries[url] = {
+                "response": response,
+                "fetched": time.monotonic(),
+                "accessed": accessed,
+            }
+        return response
+
+    def refresh(self) -> None:
+        """
+        Refetches the responses requested recently and drops idle ones.
+
+        Returns:
+            None
+        """
+        now = time.monotonic()
+        with self.lock:
+            for url in [
+                url
+                for url, entry in self.entries.items()
+                if now - entry["accessed"] > common_vars.daemon_idle
+            ]:
+                del self.entries[url]
+            entries = list(self.entries.items())
+
+        for url, entry in entries:
+            try:
+                self.fetch(url, entry["accessed"])
+            except (ValueError, OSError):
+                with self.lock:
+                    self.entries.pop(url, None)
+
+    def clear(self) -> None:
+        """
+        Drops all the responses.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.entries.clear()
+
+
+def serve(interval: float = common_vars.daemon_interval) -> None:
+    """
+    Runs the daemon until it is sent a 'shutdown' message.
+
+    Args:
+        interval (float): How often the responses are refreshed in seconds.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a daemon is already running or unix sockets are unavailable.
+    """
+    import socketserver
+    import threading
+    from pathlib import Path
+
+    from bb.utils.ini import get_config
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("bb sync requires unix domain sockets")
+    if call({"op": "status"}, timeout=1) is not None:
+        raise ValueError("bb sync is already running")
+
+    # requests made by the daemon itself must not loop back to it
+    common_vars.state["daemon"] = False
+    username = get_config().username
+    store = Store(interval)
+    started = time.time()
+    stopped = threading.Event()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                message = json.loads(self.rfile.readline())
+                op = message.get("op")
+                if op == "get":
+                    if message.get("user") != username:
+                        reply = {"error": "daemon serves a different user"}
+                    else:
+                        status, data = store.get(message["url"])
+                        reply = {"status": status, "data": data}
+                elif op == "invalidate":
+                    store.clear()
+                    reply = {}
+                elif op == "status":
+                    reply = {
+                        "pid": os.getpid(),
+                        "uptime": time.time() - started,
+                        "entries": len(store.entries),
+                        "interval": interval,
+                    }
+                elif op == "shutdown":
+                    stopped.set()
+                    reply = {}
+                else:
+                    reply = {"error": f"unknown operation '{op}'"}
+            except (ValueError, KeyError, OSError) as err:
+                reply = {"error": str(err)}
+            self.wfile.write(_encode(reply))
+
+    Path(cache.BB_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+    if os.path.exists(socket_path()):
+        os.unlink(socket_path())
+
+    with socketserver.ThreadingUnixStreamServer(socket_path(), Handler) as server:
+        os.chmod(socket_path(), 0o600)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            while not stopped.wait(interval):
+                store.refresh()
+        finally:
+            server.shutdown()
+            os.unlink(socket_path())
+
+
+if __name__ == "__main__":
+    serve()
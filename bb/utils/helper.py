@@ -23,13 +23,13 @@
 utils.validate - consists of validation functions
 """
 
+import re
 from functools import wraps
-from typing import Any, Callable, ParamSpec, TypeVar
+from typing import Any, Callable, List, ParamSpec, TypeVar
 
-from typer import Exit, prompt
+from typer import Exit, get_text_stream, prompt
 
-from bb.utils import constants, request, richprint
-from bb.utils.api import bitbucket_api
+from bb.utils import constants, richprint
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -46,6 +46,9 @@ def validate_config() -> None:
         ValueError: If an error occurs during the validation process.
 
     """
+    from bb.utils import request
+    from bb.utils.api import bitbucket_api
+
     try:
         message = f"Validating connection with '{bitbucket_api.bitbucket_host}' ... "
         with richprint.live_progress(message) as live:
@@ -105,6 +108,48 @@ def validate_input(
     return _input
 
 
+def parse_ids(ids: str) -> List[str]:
+    """
+    Expands a pull request id list into the individual ids.
+
+    Ids are separated by commas or whitespace, 'start-end' expands to an inclusive
+    range and '-' reads the ids from stdin, ex: '1,2, 5-8'.
+
+    Args:
+        ids (str): The pull request id list.
+
+    Returns:
+        List[str]: The ids in the order given, without duplicates.
+
+    Raises:
+        ValueError: If an id is neither a number nor a range of numbers, if a range
+            ends before it starts, or if there are more than 'max_ids' ids.
+    """
+    if ids.strip() == "-":
+        ids = get_text_stream("stdin").read()
+
+    expanded: List[str] = []
+    for token in filter(None, re.split(r"[,\s]+", ids)):
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", token)
+        if match is None:
+            raise ValueError(f"Invalid pull request id '{token}'")
+        start, end = int(match.group(1)), int(match.group(2) or match.group(1))
+        if end < start:
+            raise ValueError(
+                f"Invalid pull request range '{token}', it ends before it starts"
+            )
+        if len(expanded) + end - start + 1 > constants.common_vars.max_ids:
+            raise ValueError(
+                f"Too many pull request ids, at most {constants.common_vars.max_ids} are allowed"
+            )
+        expanded.extend(str(i) for i in range(start, end + 1))
+
+    if not expanded:
+        raise ValueError("Id's cannot be empty")
+
+    return list(dict.fromkeys(expanded))
+
+
 def error_tip() -> None:
     """
     Prints an error tip message.
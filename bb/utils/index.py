@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.index - local sqlite index of pull requests under ~/.cache/bb
+
+Keeps the pull requests seen by 'bb pr list' along with the newest
+'updatedDate' synced per listing, so listings can be refreshed
+incrementally and queried offline. Pull requests missing from a complete
+listing are dropped, and those merged or deleted with bb are updated or
+dropped.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from bb.utils import cache
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS pull_requests (
+    host TEXT NOT NULL,
+    project TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    from_ref TEXT NOT NULL,
+    to_ref TEXT NOT NULL,
+    author TEXT NOT NULL,
+    reviewers TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_date INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (host, project, repository, id)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_repository
+    ON pull_requests (host, project, repository, state);
+CREATE INDEX IF NOT EXISTS pull_requests_author ON pull_requests (host, author, state);
+CREATE TABLE IF NOT EXISTS sync (
+    scope TEXT PRIMARY KEY,
+    updated_date INTEGER NOT NULL
+);
+"""
+
+
+def index_path() -> str:
+    """
+    Returns the path to the pull request index.
+
+    Returns:
+        str: The path to the sqlite database.
+    """
+    return os.path.join(cache.BB_CACHE_DIR, "pull_requests.sqlite3")
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Opens the pull request index, creating it if required.
+
+    Returns:
+        sqlite3.Connection: The connection to the index.
+    """
+    Path(cache.BB_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+    connection = sqlite3.connect(index_path())
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _key(_pr: dict) -> Tuple[str, str, int]:
+    """
+    Returns the project, repository and id a pull request is indexed under.
+
+    Args:
+        _pr (dict): The pull request as returned by the server.
+
+    Returns:
+        Tuple[str, str, int]: The key of the pull request.
+    """
+    repository = _pr["toRef"]["repository"]
+    return repository["project"]["key"].lower(), repository["slug"].lower(), _pr["id"]
+
+
+def _insert(connection: sqlite3.Connection, host: str, _pr: dict) -> None:
+    """
+    Inserts or updates a pull request, within the caller's transaction.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull request belongs to.
+        _pr (dict): The pull request as returned by the server.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        "INSERT OR REPLACE INTO pull_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            host,
+            *_key(_pr),
+            _pr["state"],
+            _pr["fromRef"]["displayId"],
+            _pr["toRef"]["displayId"],
+            _pr["author"]["user"].get("name", ""),
+            " ".join(
+                reviewer["user"].get("name", "")
+                for reviewer in _pr.get("reviewers", [])
+            ),
+            _pr.get("properties", {}).get("mergeResult", {}).get("outcome", "CLEAN"),
+            _pr.get("version", 0),
+            _pr.get("updatedDate", 0),
+            json.dumps(_pr),
+        ),
+    )
+
+
+def upsert(
+    connection: sqlite3.Connection, host: str, pull_requests: Iterable[dict]
+) -> int:
+    """
+    Inserts or updates pull requests as returned by the server.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull requests belong to.
+        pull_requests (Iterable[dict]): The pull requests.
+
+    Returns:
+        int: The newest 'updatedDate' among the pull requests, 0 if there were none.
+    """
+    newest = 0
+    with connection:
+        for _pr in pull_requests:
+            newest = max(newest, _pr.get("updatedDate", 0))
+            _insert(connection, host, _pr)
+    return newest
+
+
+def watermark(connection: sqlite3.Connection, scope: str) -> Optional[int]:
+    """
+    Returns the newest 'updatedDate' synced for a listing.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        scope (str): The listing, identified by its url.
+
+    Returns:
+        Optional[int]: The newest 'updatedDate' synced, None if the listing was never synced.
+    """
+    row = connection.execute(
+        "SELECT updated_date FROM sync WHERE scope = ?", (scope,)
+    ).fetchone()
+    return None if row is None else row[0]
+
+
+def set_watermark(
+    connection: sqlite3.Connection, scope: str, updated_date: int
+) -> None:
+    """
+    Records the newest 'updatedDate' synced for a listing.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        scope (str): The listing, identified by its url.
+        updated_date (int): The newest 'updatedDate' synced.
+
+    Returns:
+        None
+    """
+    with connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO sync VALUES (?, MAX(?, COALESCE((SELECT updated_date FROM sync WHERE scope = ?), 0)))",
+            (scope, updated_date, scope),
+        )
+
+
+def _where(
+    host: str,
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    author: Optional[str] = None,
+    reviewer: Optional[str] = None,
+    state: str = "OPEN",
+) -> Tuple[List[str], list]:
+    """
+    Builds the conditions selecting indexed pull requests.
+
+    Args:
+        host (str): The bitbucket host the pull requests belong to.
+        project (Optional[str]): Only pull requests in this project.
+        repository (Optional[str]): Only pull requests in this repository.
+        author (Optional[str]): Only pull requests authored by this user.
+        reviewer (Optional[str]): Only pull requests reviewed by this user.
+        state (str): Only pull requests in this state (default: OPEN).
+
+    Returns:
+        Tuple[List[str], list]: The sql conditions and their parameters.
+    """
+    clauses, params = ["host = ?", "state = ?"], [host, state]
+    if project is not None:
+        clauses.append("project = ?")
+        params.append(project.lower())
+    if repository is not None:
+        clauses.append("repository = ?")
+        params.append(repository.lower())
+    if author is not None:
+        clauses.append("author = ?")
+        params.append(author)
+    if reviewer is not None:
+        clauses.append("(' ' || reviewers || ' ') LIKE ?")
+        params.append(f"% {reviewer} %")
+
+    return clauses, params
+
+
+def query(
+    connection: sqlite3.Connection,
+    host: str,
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    author: Optional[str] = None,
+    reviewer: Optional[str] = None,
+    state: str = "OPEN",
+) -> Iterator[dict]:
+    """
+    Queries the indexed pull requests, most recently updated first.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull requests belong to.
+        project (Optional[str]): Only pull requests in this project.
+        repository (Optional[str]): Only pull requests in this repository.
+        author (Optional[str]): Only pull requests authored by this user.
+        reviewer (Optional[str]): Only pull requests reviewed by this user.
+        state (str): Only pull requests in this state (default: OPEN).
+
+    Yields:
+        dict: The pull requests as returned by the server.
+    """
+    clauses, params = _where(host, project, repository, author, reviewer, state)
+    for (data,) in connection.execute(
+        f"SELECT data FROM pull_requests WHERE {' AND '.join(clauses)} ORDER BY updated_date DESC",  # nosec B608
+        params,
+    ):
+        yield json.loads(data)
+
+
+def write_through(
+    connection: sqlite3.Connection,
+    host: str,
+    pull_requests: Iterable[dict],
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    author: Optional[str] = None,
+    reviewer: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Writes a complete listing of open pull requests through to the index
+    while passing them on, so they can be rendered as the pages arrive.
+
+    Each pull request is upserted before it is yielded. Once the listing is
+    exhausted the open pull requests indexed for the same repository or user
+    that were not listed, since merged, declined or deleted, are dropped.
+    Nothing is written when the listing fails part way.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull requests belong to.
+        pull_requests (Iterable[dict]): Every open pull request of the listing.
+        project (Optional[str]): The project of a repository listing.
+        repository (Optional[str]): The repository of a repository listing.
+        author (Optional[str]): The user of an author listing.
+        reviewer (Optional[str]): The user of a reviewer listing.
+
+    Yields:
+        dict: The pull requests, once indexed.
+    """
+    listed: Set[Tuple[str, str, int]] = set()
+    clauses, params = _where(host, project, repository, author, reviewer)
+    with connection:
+        for _pr in pull_requests:
+            _insert(connection, host, _pr)
+            listed.add(_key(_pr))
+            yield _pr
+
+        stale = [
+            row
+            for row in connection.execute(
+                f"SELECT project, repository, id FROM pull_requests WHERE {' AND '.join(clauses)}",  # nosec B608
+                params,
+            )
+            if tuple(row) not in listed
+        ]
+        connection.executemany(
+            "DELETE FROM pull_requests WHERE host = ? AND project = ? AND repository = ? AND id = ?",
+            [(host, *row) for row in stale],
+        )
+
+
+def replace(
+    connection: sqlite3.Connection,
+    host: str,
+    pull_requests: Iterable[dict],
+    project: Optional[str] = None,
+    repository: Optional[str] = None,
+    author: Optional[str] = None,
+    reviewer: Optional[str] = None,
+) -> int:
+    """
+    Writes a complete listing of open pull requests through to the index, see 'write_through'.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull requests belong to.
+        pull_requests (Iterable[dict]): Every open pull request of the listing.
+        project (Optional[str]): The project of a repository listing.
+        repository (Optional[str]): The repository of a repository listing.
+        author (Optional[str]): The user of an author listing.
+        reviewer (Optional[str]): The user of a reviewer listing.
+
+    Returns:
+        int: The newest 'updatedDate' among the pull requests, 0 if there were none.
+    """
+    newest = 0
+    for _pr in write_through(
+        connection, host, pull_requests, project, repository, author, reviewer
+    ):
+        newest = max(newest, _pr.get("updatedDate", 0))
+    return newest
+
+
+def remove(
+    connection: sqlite3.Connection,
+    host: str,
+    project: str,
+    repository: str,
+    ids: Iterable[str],
+) -> None:
+    """
+    Drops pull requests from the index, such as those deleted with bb.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the index.
+        host (str): The bitbucket host the pull requests belong to.
+        project (str): The project of the pull requests.
+        repository (str): The repository of the pull requests.
+        ids (Iterable[str]): The pull request ids.
+
+    Returns:
+        None
+    """
+    with connection:
+        connection.executemany(
+            "DELETE FROM pull_requests WHERE host = ? AND project = ? AND repository = ? AND id = ?",
+            [(host, project.lower(), repository.lower(), int(_id)) for _id in ids],
+        )
@@ -24,10 +24,10 @@ bb.utils.ini - parses .alt ini file
 prompts for setup if not present
 """
 
-import configparser
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 def config_path() -> Tuple[str, str]:
@@ -68,6 +68,8 @@ def auth_setup(bitbucket_host: str, username: str, token: str) -> None:
     Returns:
         None
     """
+    import configparser
+
     Path(XDG_CONFIG_HOME).mkdir(parents=True, exist_ok=True)
     Path(BB_CONFIG_FILE).touch(exist_ok=True)
 
@@ -102,9 +104,54 @@ def parse() -> List[str]:
     if not os.path.isfile(BB_CONFIG_FILE):
         raise ValueError("Configuration required, Try running 'bb auth setup'")
 
+    import configparser
+
     ini = configparser.ConfigParser()
     ini.read(BB_CONFIG_FILE)
     token = ini.get("auth", "token")
     username = ini.get("auth", "username")
     bitbucket_host = ini.get("auth", "bitbucket_host")
     return [username, token, bitbucket_host]
+
+
+@dataclass(frozen=True)
+class Config:
+    """Authentication details used to connect to bitbucket"""
+
+    username: str
+    token: str
+    bitbucket_host: str
+
+
+_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    """
+    Returns the configuration, parsing the configuration file on first use only.
+
+    Returns:
+        Config: The configuration.
+
+    Raises:
+        ValueError: If the configuration file does not exist.
+    """
+    global _config
+    if _config is None:
+        _config = Config(*parse())
+    return _config
+
+
+def set_config(config: Optional[Config]) -> None:
+    """
+    Supplies the configuration without reading the configuration file, or
+    clears it so that it is parsed again on next use when 'config' is None.
+
+    Args:
+        config (Optional[Config]): The configuration to use.
+
+    Returns:
+        None
+    """
+    global _config
+    _config = config
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.output - writes records as json, ndjson or csv for '--output'
+
+Records are written to stdout one at a time as they arrive from bitbucket,
+without building any rich renderables, while messages meant for people
+are sent to stderr.
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Iterable, Iterator, Sequence
+
+from bb.utils.constants import common_vars
+
+
+def machine_readable() -> bool:
+    """
+    Tells whether records are written instead of rendered.
+
+    Returns:
+        bool: True when '--output' is json, ndjson or csv.
+    """
+    return common_vars.state["output"] != "text"
+
+
+def field(record: Any, path: str) -> Any:
+    """
+    Looks up a dotted path such as 'fromRef.displayId' or 'links.self.0.href'.
+
+    Args:
+        record (Any): The record.
+        path (str): The dotted path, list items are addressed by index.
+
+    Returns:
+        Any: The value, None if any part of the path is missing.
+    """
+    for key in path.split("."):
+        if isinstance(record, dict):
+            record = record.get(key)
+        elif isinstance(record, list) and key.isdigit() and int(key) < len(record):
+            record = record[int(key)]
+        else:
+            return None
+    return record
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+
+def tap(records: Iterable[dict], fields: Sequence[str]) -> Iterator[dict]:
+    """
+    Writes each record in the '--output' format as it passes through.
+
+    Args:
+        records (Iterable[dict]): The records as returned by the server.
+        fields (Sequence[str]): The dotted paths of the csv columns, json and
+            ndjson records are written whole.
+
+    Yields:
+        dict: Each record, once written.
+    """
+    out = sys.stdout
+    mode = common_vars.state["output"]
+    if mode == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow([_cell(field(record, path)) for path in fields])
+            yield record
+        return
+
+    separator = "[\n" if mode == "json" else ""
+    for record in records:
+        out.write(separator)
+        out.write(json.dumps(record, separators=(",", ":")))
+        separator = ",\n" if mode == "json" else ""
+        if mode == "ndjson":
+            out.write("\n")
+        yield record
+    if mode == "json":
+        out.write("[]\n" if separator == "[\n" else "\n]\n")
+
+
+def emit(records: Iterable[dict], fields: Sequence[str]) -> int:
+    """
+    Writes all the records in the '--output' format, see 'tap'.
+
+    Args:
+        records (Iterable[dict]): The records as returned by the server.
+        fields (Sequence[str]): The dotted paths of the csv columns.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    for _ in tap(records, fields):
+        count += 1
+    return count
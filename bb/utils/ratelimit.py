@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.ratelimit - client side request rate limiting
+
+A token bucket implemented as a generic cell rate algorithm: the only
+state is the theoretical arrival time of the next request, so it can be
+shared by threads, async tasks and, through a lock file in the cache
+directory, by concurrent bb processes.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from bb.utils import cache
+
+
+class TokenBucket:
+    """Allows 'rate' requests per second on average, in bursts of up to 'burst'"""
+
+    def __init__(self, rate: float, burst: int = 1, shared: bool = False) -> None:
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * (max(burst, 1) - 1)
+        self.shared = shared
+        self.lock = threading.Lock()
+        self.arrival = 0.0
+
+    def lock_path(self) -> str:
+        """
+        Returns the path to the lock file shared by bb processes.
+
+        Returns:
+            str: The path to the lock file.
+        """
+        return os.path.join(cache.BB_CACHE_DIR, "ratelimit.lock")
+
+    def _advance(self, arrival: float, now: float) -> tuple:
+        arrival = max(arrival, now)
+        return max(arrival - self.tolerance - now, 0.0), arrival + self.interval
+
+    def reserve(self) -> float:
+        """
+        Reserves a slot for one request.
+
+        The slot is taken immediately, the caller then waits the returned
+        delay, with time.sleep or asyncio.sleep, before sending the request.
+
+        Returns:
+            float: The delay in seconds before the request may be sent.
+        """
+        with self.lock:
+            if self.shared:
+                delay = self._reserve_shared()
+                if delay is not None:
+                    return delay
+            delay, self.arrival = self._advance(self.arrival, time.monotonic())
+            return delay
+
+    def _reserve_shared(self) -> Optional[float]:
+        """
+        Reserves a slot in the bucket shared through the lock file.
+
+        Returns:
+            Optional[float]: The delay in seconds, None if file locks are unavailable.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return None
+
+        try:
+            Path(cache.BB_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(self.lock_path(), "a+", encoding="utf-8") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    lock_file.seek(0)
+                    try:
+                        arrival = float(lock_file.read() or 0)
+                    except ValueError:
+                        arrival = 0.0
+                    delay, arrival = self._advance(arrival, time.time())
+                    lock_file.seek(0)
+                    lock_file.truncate()
+                    lock_file.write(repr(arrival))
+                    lock_file.flush()
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except OSError:
+            return None
+        return delay
@@ -25,18 +25,506 @@ Defines functions for making HTTP requests (GET, POST, PUT, DELETE) with
 error handling and status code interpretation.
 """
 
+import atexit
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
+from importlib.util import find_spec
 from json import JSONDecodeError
-from typing import Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import httpx
 
+from bb.utils import cache, daemon, ratelimit
 from bb.utils.constants import common_vars
-from bb.utils.ini import is_config_present, parse
+from bb.utils.ini import get_config
 from bb.utils.richprint import str_print
 
-if is_config_present():
-    username, token, _ = parse()
+if TYPE_CHECKING:
+    from bb.utils import trace
+
+T = TypeVar("T")
+
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_bucket: Optional[ratelimit.TokenBucket] = None
+
+
+def session() -> httpx.Client:
+    """
+    Returns the process-wide pooled HTTP client, creating it on first use.
+
+    The client keeps connections alive between calls so that a single command
+    invocation reuses one TCP/TLS connection, and negotiates HTTP/2 when the
+    optional 'h2' package is installed.
+
+    Returns:
+        httpx.Client: The shared HTTP client.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.Client(
+            timeout=common_vars.timeout,
+            http2=find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=common_vars.max_connections,
+                max_keepalive_connections=common_vars.max_connections,
+            ),
+        )
+    return _client
+
+
+@atexit.register
+def close_session() -> None:
+    """
+    Closes the shared HTTP client, if one was created.
+
+    Registered with atexit so pooled connections are released when the CLI exits.
+
+    Returns:
+        None
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def async_session() -> httpx.AsyncClient:
+    """
+    Returns the pooled async HTTP client for the running event loop.
+
+    The client is created on first use inside 'gather' and closed once all
+    the gathered requests have completed.
+
+    Returns:
+        httpx.AsyncClient: The shared async HTTP client.
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=common_vars.timeout,
+            http2=find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=common_vars.max_connections,
+                max_keepalive_connections=common_vars.max_connections,
+            ),
+        )
+    return _async_client
+
+
+async def _gather(
+    *requests: Coroutine[Any, Any, Any], limit: Optional[int] = None
+) -> list:
+    """
+    Awaits the given coroutines concurrently and closes the async client afterwards.
+
+    Args:
+        *requests (Coroutine): The request coroutines to await.
+        limit (Optional[int]): The maximum number of coroutines awaited at once (default: unbounded).
+
+    Returns:
+        list: The results of the coroutines, in the order they were given.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit or len(requests) or 1)
+
+    async def bounded(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        async with semaphore:
+            return await coroutine
+
+    global _async_client
+    try:
+        return list(await asyncio.gather(*(bounded(i) for i in requests)))
+    finally:
+        if _async_client is not None:
+            await _async_client.aclose()
+            _async_client = None
+
+
+def gather(*requests: Coroutine[Any, Any, Any], limit: Optional[int] = None) -> list:
+    """
+    Runs the given request coroutines concurrently and waits for all of them.
+
+    Args:
+        *requests (Coroutine): Coroutines such as 'aget(url)' or 'apost(url, body)'.
+        limit (Optional[int]): The maximum number of coroutines awaited at once (default: unbounded).
+
+    Returns:
+        list: The results of the coroutines, in the order they were given.
+
+    Raises:
+        ValueError: If any of the requests fails.
+    """
+    import asyncio
+
+    return asyncio.run(_gather(*requests, limit=limit))
+
+
+def _auth() -> Tuple[str, str]:
+    """
+    Returns the credentials to authenticate requests with.
+
+    Returns:
+        Tuple[str, str]: The username and token.
+    """
+    config = get_config()
+    return (config.username, config.token)
+
+
+# statuses which mean the request was throttled or not processed
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE")
+
+_retries_left: int = common_vars.retry_budget
+_retries_lock = threading.Lock()
+
+
+def set_retry_budget(retries: int) -> None:
+    """
+    Sets how many retries the remaining requests of the command may use in total.
+
+    Bulk commands raise the budget in proportion to the number of pull requests.
+
+    Args:
+        retries (int): The number of retries.
+
+    Returns:
+        None
+    """
+    global _retries_left
+    with _retries_lock:
+        _retries_left = retries
+
+
+def _take_retry() -> bool:
+    """
+    Takes one retry from the command budget.
+
+    Returns:
+        bool: False if the budget is exhausted.
+    """
+    global _retries_left
+    with _retries_lock:
+        if _retries_left <= 0:
+            return False
+        _retries_left -= 1
+        return True
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    """
+    Returns how long to wait before retrying: the server's 'Retry-After' when
+    given, otherwise exponential backoff with full jitter.
+
+    Args:
+        response (Optional[httpx.Response]): The response to retry, None after a transport error.
+        attempt (int): The number of attempts made so far.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    retry_after = None if response is None else response.headers.get("retry-after")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = 0.0
+        return min(max(delay, 0.0), common_vars.retry_max_delay)
+
+    return random.uniform(  # nosec B311
+        0, min(common_vars.retry_backoff * 2**attempt, common_vars.retry_max_delay)
+    )
+
+
+def _should_retry(
+    method: str,
+    response: Optional[httpx.Response],
+    error: Optional[httpx.TransportError],
+    attempt: int,
+) -> bool:
+    """
+    Decides whether a request is retried.
+
+    Requests which were never sent (connection failures) and throttled ones
+    (429) are always safe to retry, other failures only for idempotent methods.
+
+    Args:
+        method (str): The HTTP method.
+        response (Optional[httpx.Response]): The response, None after a transport error.
+        error (Optional[httpx.TransportError]): The transport error, if any.
+        attempt (int): The number of attempts made so far.
+
+    Returns:
+        bool: True if the request should be sent again.
+    """
+    if attempt >= common_vars.retry_attempts:
+        return False
+    if error is not None:
+        retry = isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)) or (
+            method in IDEMPOTENT_METHODS
+        )
+    elif response is not None and response.status_code in RETRY_STATUSES:
+        retry = response.status_code == 429 or method in IDEMPOTENT_METHODS
+    else:
+        retry = False
+    return retry and _take_retry()
+
+
+_requests_sent: int = 0
+_requests_lock = threading.Lock()
+
+
+def reset_request_count() -> None:
+    """
+    Starts counting the requests of a command from zero again.
+
+    Returns:
+        None
+    """
+    global _requests_sent
+    with _requests_lock:
+        _requests_sent = 0
+
+
+def _count_request(method: str, url: Any) -> None:
+    """
+    Counts a request, retries included, against the '--max-requests' budget.
+
+    Args:
+        method (str): The HTTP method.
+        url (Any): The URL of the request.
+
+    Raises:
+        ValueError: If the command already sent as many requests as allowed.
+    """
+    global _requests_sent
+    max_requests = int(common_vars.state["max_requests"])
+    with _requests_lock:
+        _requests_sent += 1
+        sent = _requests_sent
+    if max_requests and sent > max_requests:
+        raise ValueError(
+            f"Request budget of {max_requests} exceeded by {method} {url}, see '--max-requests'"
+        )
+
+
+def _rate_limit_delay() -> float:
+    """
+    Reserves a slot for the next request with the '--rate-limit' token bucket.
+
+    Returns:
+        float: The delay in seconds before the request may be sent, 0 when unlimited.
+    """
+    global _bucket
+    if not common_vars.state["rate_limit"]:
+        return 0.0
+    if _bucket is None:
+        _bucket = ratelimit.TokenBucket(
+            common_vars.state["rate_limit"],
+            common_vars.rate_limit_burst,
+            common_vars.state["rate_limit_shared"],
+        )
+    return _bucket.reserve()
+
+
+def _recorder(method: str, url: Any) -> Optional["trace.Recorder"]:
+    """
+    Starts recording the timings of a request when '--trace' is given.
+
+    Args:
+        method (str): The HTTP method.
+        url (Any): The URL of the request.
+
+    Returns:
+        Optional[trace.Recorder]: The recorder, None when not tracing.
+    """
+    if not common_vars.state["trace"]:
+        return None
+    from bb.utils import trace
+
+    return trace.Recorder(method, url)
+
+
+def _trace_extensions(recorder: Optional["trace.Recorder"], is_async: bool) -> dict:
+    """
+    Returns the request arguments hooking the recorder into httpcore's trace events.
+
+    Args:
+        recorder (Optional[trace.Recorder]): The recorder, None when not tracing.
+        is_async (bool): Whether the request is sent by the async client.
+
+    Returns:
+        dict: The 'extensions' argument, empty when not tracing.
+    """
+    if recorder is None:
+        return {}
+    return {"extensions": {"trace": recorder.aevent if is_async else recorder.event}}
+
+
+def _log_retry(method: str, url: Any, reason: str, delay: float) -> None:
+    if common_vars.state["verbose"]:
+        str_print(
+            f"Retrying {method} {url} in {delay:.1f}s ({reason})", common_vars.dim_white
+        )
+
+
+def _send(method: str, url: Any, **kwargs: Any) -> httpx.Response:
+    """
+    Sends a request on the shared session, paced by the rate limiter and
+    retrying per the retry policy.
+
+    Args:
+        method (str): The HTTP method.
+        url (Any): The URL to send the request to.
+        **kwargs: Passed to 'httpx.Client.request'.
+
+    Returns:
+        httpx.Response: The last response.
+
+    Raises:
+        httpx.TransportError: If the request could not be sent and is not retried.
+        ValueError: If the '--max-requests' budget is exceeded.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        _count_request(method, url)
+        time.sleep(_rate_limit_delay())
+        recorder = _recorder(method, url)
+        try:
+            response, error = (
+                session().request(
+                    method, url, **kwargs, **_trace_extensions(recorder, False)
+                ),
+                None,
+            )
+        except httpx.TransportError as err:
+            response, error = None, err
+        if recorder is not None:
+            recorder.finish(response, error, attempt)
+        if not _should_retry(method, response, error, attempt):
+            if error is not None:
+                raise error
+            return response
+        delay = _retry_delay(response, attempt)
+        _log_retry(
+            method, url, str(error) if error else str(response.status_code), delay
+        )
+        time.sleep(delay)
+
+
+async def _asend(method: str, url: Any, **kwargs: Any) -> httpx.Response:
+    """
+    Sends a request on the async session, see '_send'.
+
+    Args:
+        method (str): The HTTP method.
+        url (Any): The URL to send the request to.
+        **kwargs: Passed to 'httpx.AsyncClient.request'.
+
+    Returns:
+        httpx.Response: The last response.
+
+    Raises:
+        httpx.TransportError: If the request could not be sent and is not retried.
+        ValueError: If the '--max-requests' budget is exceeded.
+    """
+    import asyncio
+
+    attempt = 0
+    while True:
+        attempt += 1
+        _count_request(method, url)
+        await asyncio.sleep(_rate_limit_delay())
+        recorder = _recorder(method, url)
+        try:
+            response, error = (
+                await async_session().request(
+                    method, url, **kwargs, **_trace_extensions(recorder, True)
+                ),
+                None,
+            )
+        except httpx.TransportError as err:
+            response, error = None, err
+        if recorder is not None:
+            recorder.finish(response, error, attempt)
+        if not _should_retry(method, response, error, attempt):
+            if error is not None:
+                raise error
+            return response
+        delay = _retry_delay(response, attempt)
+        _log_retry(
+            method, url, str(error) if error else str(response.status_code), delay
+        )
+        await asyncio.sleep(delay)
+
+
+def _use_daemon(request_url: httpx.URL, daemon_ok: bool = False) -> bool:
+    """
+    Returns whether a GET request should be tried against the 'bb sync' daemon first.
+
+    Args:
+        request_url (httpx.URL): The URL of the request.
+        daemon_ok (bool): Flag indicating whether the caller accepts a response from the daemon for an endpoint it does not serve by default.
+
+    Returns:
+        bool: True for the endpoints the daemon serves, unless the daemon or the caches are bypassed.
+    """
+    return (
+        common_vars.state["daemon"]
+        and not common_vars.state["no_cache"]
+        and (daemon_ok or daemon.serves(request_url.path))
+    )
+
+
+def _written(response: Any) -> Any:
+    """
+    Drops the responses held by the 'bb sync' daemon after a successful write.
+
+    Args:
+        response (Any): The interpreted response of the write request.
+
+    Returns:
+        Any: The response, unchanged.
+    """
+    if common_vars.state["daemon"]:
+        daemon.invalidate()
+    return response
+
+
+async def _awritten(response: Any) -> Any:
+    """
+    Drops the responses held by the 'bb sync' daemon after a successful
+    asynchronous write, without blocking the event loop, see '_written'.
+
+    Args:
+        response (Any): The interpreted response of the write request.
+
+    Returns:
+        Any: The response, unchanged.
+    """
+    if common_vars.state["daemon"]:
+        await daemon.ainvalidate()
+    return response
 
 
 def http_response_definitions(status_code: int) -> str:
@@ -56,23 +544,19 @@ def http_response_definitions(status_code: int) -> str:
         return "Unknown Status Code"
 
 
-def get(url: str) -> list:
+def _handle_get_response(request: httpx.Response) -> list:
     """
-    Sends a GET request to the specified URL and returns the response status code and data.
+    Interprets a GET response, printing the server error message on failure.
 
     Args:
-        url (str): The URL to send the GET request to.
+        request (httpx.Response): The response to interpret.
 
     Returns:
-        list[int, dict]: A list containing the response status code and data. The status code is an integer and the data is a dictionary.
+        list[int, dict]: A list containing the response status code and data.
 
     Raises:
-        ValueError: If the request returns a non-200 status code.
+        ValueError: If the request returned a non-200 status code.
     """
-
-    with httpx.Client(timeout=common_vars.timeout) as client:
-        request = client.get(url, auth=(username, token))
-
     if request.status_code != 200:
         if request.status_code == 400:
             error_message = request.json().get("errors", [{}])[0].get("message", "")
@@ -104,6 +588,246 @@ def get(url: str) -> list:
     return [request.status_code, response_data]
 
 
+def get(url: str, params: Optional[dict] = None, daemon_ok: bool = False) -> list:
+    """
+    Sends a GET request to the specified URL and returns the response status code and data.
+
+    Args:
+        url (str): The URL to send the GET request to.
+        params (Optional[dict]): Query parameters merged into the URL (default: None).
+        daemon_ok (bool): Flag indicating whether a response held by the 'bb sync' daemon will do,
+            for read-only views of endpoints outside 'daemon.SERVED' (default: False).
+
+    Returns:
+        list[int, dict]: A list containing the response status code and data. The status code is an integer and the data is a dictionary.
+
+    Raises:
+        ValueError: If the request returns a non-200 status code.
+    """
+
+    request_url = httpx.URL(url)
+    if params:
+        request_url = request_url.copy_merge_params(params)
+
+    if _use_daemon(request_url, daemon_ok):
+        response = daemon.get(str(request_url), get_config().username)
+        if response is not None:
+            return response
+
+    ttl = cache.ttl(request_url.path)
+    if ttl is None or common_vars.state["no_cache"]:
+        request = _send("GET", request_url, auth=_auth())
+        return _handle_get_response(request)
+
+    return _cached_get(request_url, ttl)
+
+
+def _cached_get(request_url: httpx.URL, ttl: int) -> list:
+    """
+    Serves a GET request from the response cache, revalidating stale entries
+    with 'If-None-Match'/'If-Modified-Since' before falling back to a full fetch.
+
+    Args:
+        request_url (httpx.URL): The URL to send the GET request to.
+        ttl (int): The time to live of the cached response in seconds.
+
+    Returns:
+        list[int, dict]: A list containing the response status code and data.
+
+    Raises:
+        ValueError: If the request returns a non-200 status code.
+    """
+    cache_key = cache.key(get_config().username, str(request_url))
+    entry = cache.load(cache_key)
+    if entry is not None and cache.is_fresh(entry, ttl):
+        return [200, entry["data"]]
+
+    headers: dict = {}
+    if entry is not None and entry.get("etag"):
+        headers["if-none-match"] = entry["etag"]
+    if entry is not None and entry.get("last_modified"):
+        headers["if-modified-since"] = entry["last_modified"]
+
+    request = _send("GET", request_url, headers=headers, auth=_auth())
+    if request.status_code == 304 and entry is not None:
+        cache.store(cache_key, entry)
+        return [200, entry["data"]]
+
+    response = _handle_get_response(request)
+    cache.store(
+        cache_key,
+        {
+            "etag": request.headers.get("etag"),
+            "last_modified": request.headers.get("last-modified"),
+            "data": response[1],
+        },
+    )
+    return response
+
+
+async def aget(
+    url: str, params: Optional[dict] = None, daemon_ok: bool = False
+) -> list:
+    """
+    Sends a GET request asynchronously, see 'get' for the response format.
+
+    Args:
+        url (str): The URL to send the GET request to.
+        params (Optional[dict]): Query parameters merged into the URL (default: None).
+        daemon_ok (bool): Flag indicating whether a response held by the 'bb sync' daemon will do (default: False).
+
+    Returns:
+        list[int, dict]: A list containing the response status code and data.
+
+    Raises:
+        ValueError: If the request returns a non-200 status code.
+    """
+    request_url = httpx.URL(url)
+    if params:
+        request_url = request_url.copy_merge_params(params)
+
+    if _use_daemon(request_url, daemon_ok):
+        response = await daemon.aget(str(request_url), get_config().username)
+        if response is not None:
+            return response
+
+    request = await _asend("GET", url, params=params, auth=_auth())
+    return _handle_get_response(request)
+
+
+def pages(
+    url: str,
+    start: int = 0,
+    limit: int = common_vars.page_limit,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """
+    Lazily iterates over the pages of a paged Bitbucket endpoint.
+
+    Follows 'isLastPage'/'nextPageStart' and requests the next page in the
+    background while the current one is being consumed, unless 'prefetch' is
+    False for listings that are usually abandoned after the first page.
+
+    Args:
+        url (str): The URL of the paged endpoint.
+        start (int): The index of the first item to fetch (default: 0).
+        limit (int): The number of items to request per page.
+        prefetch (bool): Whether to request the next page before the current one is consumed (default: True).
+
+    Yields:
+        dict: Each page as returned by the server.
+
+    Raises:
+        ValueError: If any of the page requests fails.
+    """
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page: Optional[Future] = executor.submit(
+            get, url, {"start": start, "limit": limit}
+        )
+        while page is not None:
+            response: dict = page.result()[1]
+            following = (
+                None if response.get("isLastPage", True) else response["nextPageStart"]
+            )
+            page = (
+                None
+                if following is None or not prefetch
+                else executor.submit(get, url, {"start": following, "limit": limit})
+            )
+            yield response
+            if following is not None and not prefetch:
+                page = executor.submit(get, url, {"start": following, "limit": limit})
+
+
+def paginate(
+    url: str,
+    start: int = 0,
+    limit: int = common_vars.page_limit,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """
+    Lazily iterates over the values of a paged Bitbucket endpoint, see 'pages'.
+
+    Args:
+        url (str): The URL of the paged endpoint.
+        start (int): The index of the first item to fetch (default: 0).
+        limit (int): The number of items to request per page.
+        prefetch (bool): Whether to request the next page before the current one is consumed (default: True).
+
+    Yields:
+        dict: Each value across all pages.
+
+    Raises:
+        ValueError: If any of the page requests fails.
+    """
+    for page in pages(url, start, limit, prefetch):
+        yield from page.get("values", [])
+
+
+def as_completed(
+    function: Callable[[Any], T],
+    items: Iterable[Any],
+    limit: int = common_vars.max_workers,
+) -> Iterator[T]:
+    """
+    Calls a blocking request function for each item in worker threads and
+    yields the results in the order they complete.
+
+    Items are taken from 'items' only as workers free up, so at most 'limit'
+    calls are in flight and a lazy iterable is never read ahead of them.
+
+    Args:
+        function (Callable[[Any], T]): The function sending the requests for an item, such as 'get'.
+        items (Iterable[Any]): The items to call the function with.
+        limit (int): The maximum number of calls in flight (default: common_vars.max_workers).
+
+    Yields:
+        T: The result of each call.
+
+    Raises:
+        ValueError: If any of the calls fails, once the calls in flight have completed.
+    """
+    from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+    from itertools import islice
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        running: Set[Future] = {
+            executor.submit(function, item) for item in islice(items, limit)
+        }
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            running |= {
+                executor.submit(function, item) for item in islice(items, len(done))
+            }
+            for future in done:
+                yield future.result()
+
+
+def _handle_post_response(request: httpx.Response) -> list:
+    """
+    Interprets a POST response.
+
+    Args:
+        request (httpx.Response): The response to interpret.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response data as a dictionary.
+
+    Raises:
+        ValueError: If the request returned a status code other than 200, 201, 204, or 409.
+    """
+    if request.status_code not in (200, 201, 204, 409):
+        raise ValueError(
+            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
+        )
+
+    json_data: dict = {} if request.status_code == 204 else request.json()
+    return [request.status_code, json_data]
+
+
 def post(url: str, body: dict) -> list:
     """
     Send a POST request to the specified URL with the given body.
@@ -118,21 +842,60 @@ def post(url: str, body: dict) -> list:
     Raises:
         ValueError: If the request returns a status code other than 200, 201, 204, or 409.
     """
-    with httpx.Client(timeout=common_vars.timeout) as client:
-        request = client.post(
-            url,
-            auth=(username, token),
-            data=body,
-            headers={"content-type": common_vars.content_type},
-        )
+    request = _send(
+        "POST",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
 
-    if request.status_code not in (200, 201, 204, 409):
+    return _written(_handle_post_response(request))
+
+
+async def apost(url: str, body: dict) -> list:
+    """
+    Sends a POST request asynchronously, see 'post' for the response format.
+
+    Args:
+        url (str): The URL to send the request to.
+        body (dict): The request body as a dictionary.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response data as a dictionary.
+
+    Raises:
+        ValueError: If the request returns a status code other than 200, 201, 204, or 409.
+    """
+    request = await _asend(
+        "POST",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
+    return await _awritten(_handle_post_response(request))
+
+
+def _handle_put_response(request: httpx.Response) -> list:
+    """
+    Interprets a PUT response.
+
+    Args:
+        request (httpx.Response): The response to interpret.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response body as a dictionary.
+
+    Raises:
+        ValueError: If the request returned a status code other than 200, 403, or 409.
+    """
+    if request.status_code not in (200, 403, 409):
         raise ValueError(
             f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
         )
 
-    json_data: dict = {} if request.status_code == 204 else request.json()
-    return [request.status_code, json_data]
+    return [request.status_code, request.json()]
 
 
 def put(url: str, body: dict) -> list:
@@ -150,20 +913,59 @@ def put(url: str, body: dict) -> list:
         ValueError: If the request returns a status code other than 200, 403, or 409.
 
     """
-    with httpx.Client(timeout=common_vars.timeout) as client:
-        request = client.put(
-            url,
-            auth=(username, token),
-            data=body,
-            headers={"content-type": common_vars.content_type},
-        )
+    request = _send(
+        "PUT",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
 
-    if request.status_code not in (200, 403, 409):
+    return _written(_handle_put_response(request))
+
+
+async def aput(url: str, body: dict) -> list:
+    """
+    Sends a PUT request asynchronously, see 'put' for the response format.
+
+    Args:
+        url (str): The URL to send the request to.
+        body (dict): The request body as a dictionary.
+
+    Returns:
+        list[int, dict]: A list containing the status code and the response body as a dictionary.
+
+    Raises:
+        ValueError: If the request returns a status code other than 200, 403, or 409.
+    """
+    request = await _asend(
+        "PUT",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
+    return await _awritten(_handle_put_response(request))
+
+
+def _handle_delete_response(request: httpx.Response) -> int:
+    """
+    Interprets a DELETE response.
+
+    Args:
+        request (httpx.Response): The response to interpret.
+
+    Returns:
+        int: The status code of the DELETE request.
+
+    Raises:
+        ValueError: If the DELETE request returned a status code other than 202 or 204.
+    """
+    if request.status_code not in (202, 204):
         raise ValueError(
             f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
         )
-
-    return [request.status_code, request.json()]
+    return request.status_code
 
 
 def delete(url: str, body: dict) -> int:
@@ -181,16 +983,35 @@ def delete(url: str, body: dict) -> int:
         ValueError: If the DELETE request returns a status code other than 202 or 204.
 
     """
-    with httpx.Client(timeout=common_vars.timeout) as client:
-        request = client.request(
-            "DELETE",
-            url,
-            auth=(username, token),
-            data=body,
-            headers={"content-type": common_vars.content_type},
-        )
-    if request.status_code not in (202, 204):
-        raise ValueError(
-            f"\n[{request.status_code}] {http_response_definitions(request.status_code)}"
-        )
-    return request.status_code
+    request = _send(
+        "DELETE",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
+    return _written(_handle_delete_response(request))
+
+
+async def adelete(url: str, body: dict) -> int:
+    """
+    Sends a DELETE request asynchronously, see 'delete' for the response format.
+
+    Args:
+        url (str): The URL to send the DELETE request to.
+        body (dict): The request body to send along with the DELETE request.
+
+    Returns:
+        int: The status code of the DELETE request.
+
+    Raises:
+        ValueError: If the DELETE request returns a status code other than 202 or 204.
+    """
+    request = await _asend(
+        "DELETE",
+        url,
+        auth=_auth(),
+        data=body,
+        headers={"content-type": common_vars.content_type},
+    )
+    return await _awritten(_handle_delete_response(request))
@@ -24,17 +24,29 @@ bb.utils.richprint - uses py rich api to pretty print information to console
 """
 
 import sys
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from rich.columns import Columns
 from rich.console import Console, Group
-from rich.live import Live
-from rich.spinner import Spinner
-from rich.table import Table
 from rich.text import Text
-from rich.tree import Tree
 
 from bb.utils.constants import common_vars
 
+if TYPE_CHECKING:
+    from rich.columns import Columns
+    from rich.live import Live
+    from rich.segment import Segments
+    from rich.table import Table
+
 # Setting up the console.
 console = Console()
 
@@ -55,7 +67,7 @@ def str_print(text: str, style: str) -> None:
     console.print(text)
 
 
-def table(header_args: list, value_args: list, show_header: bool) -> Table:
+def table(header_args: list, value_args: list, show_header: bool) -> "Table":
     """
     Generate a rich table using the provided header arguments and value arguments.
 
@@ -67,6 +79,8 @@ def table(header_args: list, value_args: list, show_header: bool) -> Table:
     Returns:
         Table: A rich Table object representing the generated table.
     """
+    from rich.table import Table
+
     _table = Table(show_header=show_header, header_style="bold #2684FF", highlight=True)
 
     if show_header:
@@ -79,6 +93,70 @@ def table(header_args: list, value_args: list, show_header: bool) -> Table:
     return _table
 
 
+def stream_table(
+    header_args: list, pages: Iterable[list], _console: Optional[Console] = None
+) -> None:
+    """
+    Prints a table page by page as the rows arrive, instead of building it whole.
+
+    Every page is printed as its own table with the same column widths, so the
+    pages line up as one table.
+
+    Args:
+        header_args (list): A list of tuples containing the column name, style and
+            width for the table header, the columns with a width of None share the remaining space.
+        pages (Iterable[list]): The pages of row values for the table.
+        _console (Optional[Console]): The console to print to (default: the shared console).
+
+    Returns:
+        None
+    """
+    from rich import box
+    from rich.table import Table
+
+    _console = _console or console
+    show_header = True
+    for page in pages:
+        _table = Table(
+            show_header=show_header,
+            header_style="bold #2684FF",
+            highlight=True,
+            expand=True,
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+        )
+        for name, style, width in header_args:
+            _table.add_column(
+                str(name),
+                style=str(style),
+                width=width,
+                ratio=None if width else 1,
+                no_wrap=bool(width),
+            )
+        for row in page:
+            _table.add_row(*row)
+        _console.print(_table)
+        show_header = False
+
+
+def print_diff(text: str, _console: Optional[Console] = None) -> None:
+    """
+    Prints a unified diff with syntax highlighting.
+
+    Args:
+        text (str): The unified diff.
+        _console (Optional[Console]): The console to print to (default: the shared console).
+
+    Returns:
+        None
+    """
+    from rich.syntax import Syntax
+
+    (_console or console).print(
+        Syntax(text, "diff", theme="ansi_dark", background_color="default")
+    )
+
+
 def traceback_to_console():
     """
     Prints the traceback to the console.
@@ -90,45 +168,189 @@ def traceback_to_console():
     console.print_exception(show_locals=False, extra_lines=1)
 
 
-def live_progress(message: str):
+class NoProgress:
+    """
+    Stands in for a live progress indicator when the console is not a
+    terminal, without starting a refresh thread.
+    """
+
+    def update(self, *args, **kwargs) -> None:
+        """Ignores the update, see 'rich.live.Live.update'"""
+
+
+_NO_PROGRESS = NoProgress()
+
+# the live region shared by the steps of a multi-step command, see 'live_region'
+_region: Optional["Live"] = None
+
+
+def interactive() -> bool:
+    """
+    Tells whether progress is animated, which needs a terminal that is not
+    dumb and a refresh rate above zero.
+
+    Returns:
+        bool: True if the console is an interactive terminal.
+    """
+    return (
+        console.is_terminal
+        and not console.is_dumb_terminal
+        and common_vars.state["refresh_rate"] > 0
+    )
+
+
+def _spinner(message: str) -> "Columns":
+    from rich.columns import Columns
+    from rich.spinner import Spinner
+
+    is_utf8 = (sys.stdout.encoding or "").lower() == "utf-8"
+    spin_type = "dots" if is_utf8 else "simpleDots"
+    return Columns([Spinner(spin_type, style=common_vars.bold_white), message])
+
+
+def _live(renderable: Any) -> "Live":
+    from rich.live import Live
+
+    return Live(
+        renderable,
+        console=console,
+        refresh_per_second=float(common_vars.state["refresh_rate"]),
+    )
+
+
+@contextmanager
+def live_region() -> Iterator[None]:
+    """
+    Shares a single live region between the 'live_progress' steps run inside
+    it, instead of creating one per step. Nothing may prompt for input inside
+    the region, since it keeps refreshing.
+
+    Returns:
+        Iterator[None]: The context of the region.
+    """
+    global _region
+    if _region is not None or not interactive():
+        yield
+        return
+
+    with _live("") as live:
+        _region = live
+        try:
+            yield
+        finally:
+            _region = None
+
+
+@contextmanager
+def live_progress(message: str) -> Iterator[Union["Live", NoProgress]]:
     """
     Creates a live progress indicator with a given message.
 
+    The spinner is drawn in the shared region of 'live_region' if one is active.
+    When the console is not an interactive terminal, the message is printed
+    once and the indicator is a 'NoProgress'.
+
     Args:
         message (str): The message to be displayed alongside the progress indicator.
 
     Returns:
-        Live: A Live object representing the live progress indicator.
+        Iterator[Union[Live, NoProgress]]: The live progress indicator, its 'update' replaces the spinner.
 
     """
-    is_utf8 = sys.stdout.encoding.lower() == "utf-8"
-    spin_type = "dots" if is_utf8 else "simpleDots"
-    return Live(
-        Columns([Spinner(spin_type, style=common_vars.bold_white), message]),
-        refresh_per_second=24,
-    )
+    if not interactive():
+        console.print(message, highlight=False)
+        yield _NO_PROGRESS
+    elif _region is not None:
+        _region.update(_spinner(message), refresh=True)
+        try:
+            yield _region
+        finally:
+            _region.update("", refresh=True)
+    else:
+        with _live(_spinner(message)) as live:
+            yield live
+
+
+def _branch(renderable: Any, first: str, rest: str, style: Any) -> "Segments":
+    """
+    Renders a node of a tree on its own, prefixed with the guides leading to it.
+
+    Args:
+        renderable (Any): The node to be rendered.
+        first (str): The guides in front of the first line of the node.
+        rest (str): The guides in front of the following lines of the node.
+        style (Any): The style of the guides.
+
+    Returns:
+        Segments: The lines of the node.
+    """
+    from rich.segment import Segment, Segments
+
+    options = console.options.update_width(max(console.width - len(first), 1))
+    segments = []
+    for number, line in enumerate(console.render_lines(renderable, options, pad=False)):
+        segments.append(Segment(rest if number else first, style))
+        segments.extend(line)
+        segments.append(Segment.line())
+    return Segments(segments)
 
 
-def render_tree(repo_name: str, status: str, data: dict[str, list[tuple]]) -> None:
+def render_tree(
+    repo_name: str,
+    status: str,
+    data: Union[Dict[str, Any], Iterable[Tuple[str, Any]]],
+    compact: bool = False,
+) -> None:
     """
     Renders a tree structure representing the repository and its status.
 
+    The tree is printed a node at a time while 'data' is consumed, so a lazy
+    iterable of pull requests is shown as it is produced and only one of them
+    is held at a time.
+
     Args:
         repo_name (str): The name of the repository.
         status (str): The status of the repository.
-        data (dict[str, list[tuple]]): A dictionary containing the data to be rendered.
+        data (Union[Dict[str, Any], Iterable[Tuple[str, Any]]]): The id and the rows of each pull request,
+            or the id and a single line of markup for the compact layout.
+        compact (bool): Flag indicating whether each pull request takes one line instead of a table.
 
     Returns:
         None
     """
-    tree = Tree("Root", highlight=True, hide_root=True)
-    tree_root = tree.add(
-        f"[bold #2684FF]{repo_name}", guide_style=common_vars.bold_white
+    from rich.tree import Tree
+
+    style = console.get_style(common_vars.bold_white)
+    guides = (
+        Tree.ASCII_GUIDES
+        if console.options.ascii_only
+        else Tree.TREE_GUIDES[1 if style.bold else 0]
     )
-    containers_node = tree_root.add(
-        f"[bold #2684FF]{status}", guide_style=common_vars.bold_white
+    space, continued, fork, end = guides
+
+    console.print(f"[bold #2684FF]{repo_name}", highlight=True)
+    console.print(
+        _branch(Text(status, style="bold #2684FF"), end, space, style), highlight=True
     )
-    containers_node.expanded = True
-    for _ in zip(data.keys(), data.values()):
-        containers_node.add(Group(f"PR: #{_[0]}", table(_[1], _[1], False)))
-    console.print(tree)
+
+    items = iter(data.items() if isinstance(data, dict) else data)
+    item = next(items, None)
+    while item is not None:
+        following = next(items, None)
+        _id, value = item
+        if compact:
+            node = Text.from_markup(f"#{_id} {value}", overflow="ellipsis")
+            node.no_wrap = True
+        else:
+            node = Group(f"PR: #{_id}", table(value, value, False))
+        last = following is None
+        console.print(
+            _branch(
+                node,
+                space + (end if last else fork),
+                space + (space if last else continued),
+                style,
+            ),
+            highlight=True,
+        )
+        item = following
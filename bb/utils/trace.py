@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+bb.utils.trace - per request timing metrics for '--trace'
+
+Records connect, TLS, time to first byte and total timings, response
+sizes, statuses and attempts of every request sent to bitbucket, prints
+a waterfall summary at exit and optionally writes a Chrome trace-event
+file, viewable in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+from bb.utils import richprint
+
+_spans: List[dict] = []
+_lock = threading.Lock()
+_origin: float = time.perf_counter()
+
+
+class Recorder:
+    """Collects the timings of one attempt of a request"""
+
+    def __init__(self, method: str, url: Any) -> None:
+        self.method = method
+        self.url = str(url)
+        self.start = time.perf_counter()
+        self.thread = threading.get_ident()
+        self.events: dict = {}
+
+    def event(self, name: str, info: dict) -> None:
+        """
+        Records an httpcore trace event, passed as the 'trace' request extension.
+
+        Args:
+            name (str): The event name, e.g. 'connection.connect_tcp.started'.
+            info (dict): The event details.
+
+        Returns:
+            None
+        """
+        self.events[name] = time.perf_counter()
+
+    async def aevent(self, name: str, info: dict) -> None:
+        """
+        Records an httpcore trace event for the async client, see 'event'.
+        """
+        self.event(name, info)
+
+    def _phase(self, name: str) -> Optional[float]:
+        started = self.events.get(f"{name}.started")
+        completed = self.events.get(f"{name}.complete")
+        if started is None or completed is None:
+            return None
+        return completed - started
+
+    def finish(self, response: Any, error: Optional[Exception], attempt: int) -> None:
+        """
+        Stores the span of the attempt.
+
+        Args:
+            response (Any): The httpx response, None after a transport error.
+            error (Optional[Exception]): The transport error, if any.
+            attempt (int): The attempt number, starting at 1.
+
+        Returns:
+            None
+        """
+        end = time.perf_counter()
+        first_byte = next(
+            (
+                at
+                for name, at in self.events.items()
+                if name.endswith("receive_response_headers.complete")
+            ),
+            None,
+        )
+        span = {
+            "method": self.method,
+            "url": self.url,
+            "status": type(error).__name__
+            if response is None
+            else response.status_code,
+            "bytes": 0 if response is None else len(response.content),
+            "start": self.start - _origin,
+            "connect": self._phase("connection.connect_tcp"),
+            "tls": self._phase("connection.start_tls"),
+            "ttfb": None if first_byte is None else first_byte - self.start,
+            "total": end - self.start,
+            "attempt": attempt,
+            "thread": self.thread,
+        }
+        with _lock:
+            _spans.append(span)
+
+
+def spans() -> List[dict]:
+    """
+    Returns the spans recorded so far, in the order the requests completed.
+
+    Returns:
+        List[dict]: The spans.
+    """
+    with _lock:
+        return list(_spans)
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+def chrome_trace(_spans: List[dict]) -> dict:
+    """
+    Converts spans to the Chrome trace-event format.
+
+    Args:
+        _spans (List[dict]): The spans.
+
+    Returns:
+        dict: The trace, with one complete ('X') event per attempt.
+    """
+    from urllib.parse import urlsplit
+
+    return {
+        "traceEvents": [
+            {
+                "name": f"{span['method']} {urlsplit(span['url']).path}",
+                "cat": "http",
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["total"] * 1e6,
+                "pid": os.getpid(),
+                "tid": span["thread"],
+                "args": {
+                    "url": span["url"],
+                    "status": span["status"],
+                    "bytes": span["bytes"],
+                    "attempt": span["attempt"],
+                    "connect": _ms(span["connect"]),
+                    "tls": _ms(span["tls"]),
+                    "ttfb": _ms(span["ttfb"]),
+                },
+            }
+            for span in _spans
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def report(trace_file: Optional[str] = None, width: int = 20) -> None:
+    """
+    Prints the waterfall of the recorded requests and writes the Chrome trace.
+
+    Registered with atexit by the '--trace' flag.
+
+    Args:
+        trace_file (Optional[str]): Where to write the Chrome trace-event JSON (default: not written).
+        width (int): The width of the waterfall bars in characters.
+
+    Returns:
+        None
+    """
+    from urllib.parse import urlsplit
+
+    _spans = sorted(spans(), key=lambda span: span["start"])
+    if trace_file:
+        with open(trace_file, "w", encoding="utf-8") as trace:
+            json.dump(chrome_trace(_spans), trace)
+
+    if not _spans:
+        richprint.console.print("No requests were sent", style="dim white")
+        return
+
+    begin = _spans[0]["start"]
+    wall = max(span["start"] + span["total"] for span in _spans) - begin
+    rows = []
+    for span in _spans:
+        offset = int((span["start"] - begin) / wall * width) if wall else 0
+        length = max(1, int(span["total"] / wall * width)) if wall else 1
+        rows.append(
+            (
+                f"{span['method']} {urlsplit(span['url']).path.replace('/rest/api/latest', '', 1)}",
+                f"{span['status']}"
+                + (f" (try {span['attempt']})" if span["attempt"] > 1 else ""),
+                str(span["bytes"]),
+                _ms(span["connect"]),
+                _ms(span["tls"]),
+                _ms(span["ttfb"]),
+                _ms(span["total"]),
+                " " * offset + "█" * min(length, width - offset),
+            )
+        )
+
+    richprint.console.print(
+        richprint.table(
+            [
+                ("REQUEST", "bold white"),
+                ("STATUS", "bold yellow"),
+                ("BYTES", "white"),
+                ("CONNECT", "white"),
+                ("TLS", "white"),
+                ("TTFB", "white"),
+                ("TOTAL", "bold white"),
+                ("WATERFALL", "#2684FF"),
+            ],
+            rows,
+            True,
+        )
+    )
+    busy = sum(span["total"] for span in _spans)
+    richprint.console.print(
+        f"{len(_spans)} requests, {sum(span['bytes'] for span in _spans)} bytes, "
+        f"{_ms(wall)} wall time, {_ms(busy)} in requests",
+        style="bold white",
+    )
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+benchmark - end-to-end benchmarks of bb commands against a local stand-in
+for the bitbucket server REST api
+
+The commands run in-process through the typer app, against the server of
+'conftest' answering with generated payloads after a configurable latency,
+and each run records the wall time, the number of requests and the bytes
+transferred.
+
+Run 'PYTHONPATH=. python tests/benchmark.py' to print the results next to the stored
+baselines, or with '--update' to store the results as the new baselines.
+The test suite compares the request and byte counts to the baselines, and
+the wall times too with 'BB_BENCHMARK=1 pytest tests/test_benchmark.py'.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from conftest import (
+    CHANGES,
+    LATENCY,
+    LINES,
+    PROJECT,
+    PULL_REQUESTS,
+    REPOSITORIES,
+    REPOSITORY,
+    TARGET,
+    MockBitbucket,
+    environment,
+    git_repository,
+)
+
+BASELINES: str = os.path.join(os.path.dirname(__file__), "benchmarks.json")
+
+# wall time may exceed the baseline by this factor plus the slack before failing,
+# machines differ far more in speed than in the requests a command sends
+TIME_FACTOR: float = 3.0
+TIME_SLACK: float = 0.5
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A bb command to benchmark.
+
+    Args:
+        args (List[str]): The command line arguments.
+        budget (int): The most requests the command may send, enforced with '--max-requests'.
+        input (str): The answers to the prompts of the command.
+        warm (bool): Run the command once before measuring, to measure it with warm caches.
+    """
+
+    args: List[str]
+    budget: int
+    input: str = ""
+    warm: bool = False
+
+
+CREATE: List[str] = [
+    "pr",
+    "create",
+    "--target",
+    TARGET,
+    "--title",
+    "t",
+    "--description",
+    "d",
+    "--yes",
+]
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    # both pages of the open pull requests, then the first page of the changes since
+    "pr list": Benchmark(["pr", "list"], 2),
+    "pr list (warm)": Benchmark(["pr", "list"], 1, warm=True),
+    "pr list --output ndjson": Benchmark(["--output", "ndjson", "pr", "list"], 2),
+    "pr list --role author": Benchmark(["pr", "list", "--role", "author", "--all"], 2),
+    "pr list --compact": Benchmark(["pr", "list", "--compact"], 2),
+    # the repositories, then both pages of the pull requests of each
+    "pr list --projects": Benchmark(
+        ["pr", "list", "--projects", PROJECT, "--compact"], 1 + 2 * REPOSITORIES
+    ),
+    # repository id, default reviewers and the pull request itself
+    "pr create": Benchmark(CREATE, 3, input="n\n"),
+    "pr create (warm)": Benchmark(CREATE, 1, input="n\n", warm=True),
+    # cleanup check, merge check, pull request, automerge path and the merge
+    "pr merge": Benchmark(["pr", "merge", "--id", "1", "--yes"], 5, input="n\nn\n"),
+    "pr merge --rebase": Benchmark(
+        ["pr", "merge", "--id", "1", "--rebase", "--yes"], 6, input="n\n"
+    ),
+    # per pull request: checks, rebase, merge, cleanup and branch deletion
+    "pr merge (batch)": Benchmark(
+        ["pr", "merge", "--id", "1-8", "--rebase", "--delete-source-branch", "--yes"],
+        8 * 7,
+    ),
+    # the changes and the diff of each changed file
+    "pr diff --remote": Benchmark(["pr", "diff", "--id", "1", "--remote"], 1 + CHANGES),
+    "repo create": Benchmark(
+        ["repo", "create", "--project", PROJECT, "--repo", "new"], 1
+    ),
+    "repo archive": Benchmark(
+        ["repo", "archive", "--project", PROJECT, "--repo", REPOSITORY],
+        1,
+        input="y\n",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Result:
+    """The wall time in seconds, the number of requests and the bytes transferred by a command"""
+
+    seconds: float
+    requests: int
+    bytes: int
+
+
+def run(server: MockBitbucket, benchmark: Benchmark, rounds: int = 3) -> Result:
+    """
+    Runs a command through the typer app, as a fresh process would, failing
+    when it sends more requests than its budget.
+
+    Every round starts from empty caches, the fastest round is reported so
+    that one-off costs such as imports do not count.
+
+    Raises:
+        AssertionError: If the command fails.
+    """
+    from typer.testing import CliRunner
+
+    from bb import _bb
+    from bb.utils import request
+    from bb.utils.constants import common_vars
+
+    runner = CliRunner()
+    results = []
+    for _ in range(rounds):
+        with tempfile.TemporaryDirectory() as path:
+            repository, cache_dir = (
+                os.path.join(path, "repo"),
+                os.path.join(path, "cache"),
+            )
+            os.mkdir(repository)
+            git_repository(repository, server.url)
+            with environment(server, repository, cache_dir):
+                if benchmark.warm:
+                    runner.invoke(_bb, benchmark.args, input=benchmark.input)
+                    request.close_session()
+
+                request.set_retry_budget(common_vars.retry_budget)
+                request.reset_request_count()
+                server.reset()
+                started = time.perf_counter()
+                outcome = runner.invoke(
+                    _bb,
+                    ["--max-requests", str(benchmark.budget), *benchmark.args],
+                    input=benchmark.input,
+                )
+                seconds = time.perf_counter() - started
+
+        assert outcome.exit_code == 0 and "--verbose" not in outcome.output, (
+            outcome.output
+        )
+        results.append(Result(seconds, server.requests, server.bytes))
+    return min(results, key=lambda result: result.seconds)
+
+
+def load_baselines(path: str = BASELINES) -> Dict[str, Result]:
+    """Loads the stored results, keyed by benchmark name"""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as baselines:
+        return {name: Result(**result) for name, result in json.load(baselines).items()}
+
+
+def store_baselines(results: Dict[str, Result], path: str = BASELINES) -> None:
+    """Stores the results as the baselines"""
+    with open(path, "w", encoding="utf-8") as baselines:
+        json.dump(
+            {
+                name: dict(asdict(result), seconds=round(result.seconds, 3))
+                for name, result in results.items()
+            },
+            baselines,
+            indent=2,
+        )
+        baselines.write("\n")
+
+
+def regressions(result: Result, baseline: Result, timing: bool = True) -> List[str]:
+    """
+    Compares a result to its baseline.
+
+    The request count and bytes must not grow at all, the wall time may
+    grow within 'TIME_FACTOR' and 'TIME_SLACK'.
+
+    Args:
+        result (Result): The result of the benchmark.
+        baseline (Result): The stored result.
+        timing (bool): Whether to compare the wall time, which depends on the machine.
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    found = []
+    if result.requests > baseline.requests:
+        found.append(f"{result.requests} requests, baseline {baseline.requests}")
+    if result.bytes > baseline.bytes:
+        found.append(f"{result.bytes} bytes, baseline {baseline.bytes}")
+    if timing and result.seconds > baseline.seconds * TIME_FACTOR + TIME_SLACK:
+        found.append(f"{result.seconds:.3f}s, baseline {baseline.seconds:.3f}s")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    from bb.utils import richprint
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=LATENCY, help="seconds per request"
+    )
+    parser.add_argument("--pull-requests", type=int, default=PULL_REQUESTS)
+    parser.add_argument("--changes", type=int, default=CHANGES)
+    parser.add_argument("--lines", type=int, default=LINES)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--update", action="store_true", help="store the results as the baselines"
+    )
+    parser.add_argument("names", nargs="*", help="the benchmarks to run (default: all)")
+    args = parser.parse_args(argv)
+    if args.update and (args.latency, args.pull_requests, args.changes, args.lines) != (
+        LATENCY,
+        PULL_REQUESTS,
+        CHANGES,
+        LINES,
+    ):
+        parser.error("baselines are only stored for the default server")
+
+    baselines = load_baselines()
+    results: Dict[str, Result] = {}
+    rows = []
+    failed = False
+    with MockBitbucket(
+        args.latency, args.pull_requests, args.changes, args.lines
+    ) as server:
+        for name in args.names or BENCHMARKS:
+            result = results[name] = run(server, BENCHMARKS[name], args.rounds)
+            baseline = baselines.get(name)
+            found = [] if baseline is None else regressions(result, baseline)
+            failed = failed or bool(found)
+            rows.append(
+                (
+                    name,
+                    f"{result.seconds * 1000:.0f} ms",
+                    str(result.requests),
+                    str(result.bytes),
+                    "-" if baseline is None else (", ".join(found) or "ok"),
+                )
+            )
+
+    richprint.console.print(
+        richprint.table(
+            [
+                ("BENCHMARK", "bold white"),
+                ("WALL", "bold white"),
+                ("REQUESTS", "bold white"),
+                ("BYTES", "bold white"),
+                ("BASELINE", "bold yellow"),
+            ],
+            rows,
+            True,
+        )
+    )
+    if args.update:
+        store_baselines({**baselines, **results})
+        return 0
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+"""
+conftest - fixtures running bb against a local stand-in for the bitbucket
+server REST api, shared by the unit tests and the benchmarks
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+PROJECT: str = "bench"
+REPOSITORY: str = "bench-repo"
+FROM_BRANCH: str = "feature/bench"
+TARGET: str = "master"
+USER: str = "bench"
+
+# the server the baselines are recorded against
+LATENCY: float = 0.01
+PULL_REQUESTS: int = 100
+CHANGES: int = 30
+LINES: int = 20
+REPOSITORIES: int = 10
+
+
+def _user(name: str) -> dict:
+    return {
+        "name": name,
+        "slug": name,
+        "displayName": name.title(),
+        "emailAddress": f"{name}@bench.test",
+        "active": True,
+    }
+
+
+def _ref(branch: str) -> dict:
+    return {
+        "id": f"refs/heads/{branch}",
+        "displayId": branch,
+        "latestCommit": "0123456789abcdef0123456789abcdef01234567",
+        "repository": {"slug": REPOSITORY, "project": {"key": PROJECT.upper()}},
+    }
+
+
+class MockBitbucket:
+    """
+    A threaded http server answering the bitbucket endpoints used by bb,
+    counting the requests and the bytes of the request and response bodies.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+        pull_requests (int): The number of open pull requests in the repository.
+        changes (int): The number of files changed by each pull request.
+        lines (int): The number of changed lines in the diff of each file.
+        page_size (int): The maximum number of values in a page, whatever the requested limit.
+        repositories (int): The number of repositories in every project.
+    """
+
+    def __init__(
+        self,
+        latency: float = LATENCY,
+        pull_requests: int = PULL_REQUESTS,
+        changes: int = CHANGES,
+        lines: int = LINES,
+        page_size: int = 50,
+        repositories: int = REPOSITORIES,
+    ):
+        self.latency = latency
+        self.pull_requests = pull_requests
+        self.changes = changes
+        self.lines = lines
+        self.page_size = page_size
+        self.repositories = repositories
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._routes: List[Tuple[str, re.Pattern, Callable]] = [
+            (method, re.compile(f"{pattern}$"), handler)
+            for method, pattern, handler in (
+                ("GET", r"/plugins/servlet/applinks/whoami", self.whoami),
+                (
+                    "GET",
+                    r"/rest/api/latest/inbox/pull-requests",
+                    self.pull_request_page,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/([^/]+)/repos",
+                    self.repository_page,
+                ),
+                ("POST", r"/rest/api/latest/projects/[^/]+/repos", self.repository),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+",
+                    self.repository,
+                ),
+                (
+                    "PUT",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+",
+                    self.repository,
+                ),
+                (
+                    "DELETE",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+",
+                    self.accepted,
+                ),
+                ("GET", r"/rest/default-reviewers/latest/.*/reviewers", self.reviewers),
+                (
+                    "POST",
+                    r"/rest/api/1.0/projects/[^/]+/repos/[^/]+/pull-requests",
+                    self.created,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests",
+                    self.pull_request_page,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)",
+                    self.pull_request,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)/changes",
+                    self.change_page,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)/diff/(.+)",
+                    self.diff,
+                ),
+                (
+                    "GET",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)/merge",
+                    self.merge_check,
+                ),
+                (
+                    "POST",
+                    r"/rest/api/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)/merge",
+                    self.merged,
+                ),
+                (
+                    "POST",
+                    r"/rest/git/latest/projects/[^/]+/repos/[^/]+/pull-requests/(\d+)/rebase",
+                    self.pull_request,
+                ),
+                (
+                    "GET",
+                    r"/rest/pull-request-cleanup/latest/.*/pull-requests/\d+",
+                    self.empty_list,
+                ),
+                (
+                    "POST",
+                    r"/rest/pull-request-cleanup/latest/.*/pull-requests/\d+",
+                    self.empty,
+                ),
+                (
+                    "GET",
+                    r"/rest/branch-utils/latest/.*/automerge/path/.*",
+                    self.automerge,
+                ),
+                ("DELETE", r"/rest/branch-utils/latest/.*/branches", self.no_content),
+            )
+        ]
+
+    @property
+    def url(self) -> str:
+        """The base url of the running server"""
+        assert self._server is not None, "server is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockBitbucket":
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self) -> None:
+                mock.handle(self)
+
+            do_GET = do_POST = do_PUT = do_DELETE = respond
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset(self) -> None:
+        """Resets the request and byte counters"""
+        with self._lock:
+            self.requests = 0
+            self.bytes = 0
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """Answers a request with the first route matching its method and path"""
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        url = urlsplit(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        status, payload = 404, {"errors": [{"message": f"no route for {url.path}"}]}
+        for method, pattern, route in self._routes:
+            match = pattern.match(url.path)
+            if method == handler.command and match:
+                status, payload = route(query, *match.groups())
+                break
+
+        content = b"" if payload is None else json.dumps(payload).encode()
+        time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            self.bytes += len(body) + len(content)
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def page(self, values: List[dict], query: Dict[str, str]) -> dict:
+        """Slices the values the way the paged bitbucket endpoints do"""
+        start = int(query.get("start", 0))
+        limit = min(int(query.get("limit", 25)), self.page_size)
+        end = min(start + limit, len(values))
+        page = {
+            "size": end - start,
+            "limit": limit,
+            "start": start,
+            "isLastPage": end >= len(values),
+            "values": values[start:end],
+        }
+        if end < len(values):
+            page["nextPageStart"] = end
+        return page
+
+    def make_pull_request(self, _id: int) -> dict:
+        return {
+            "id": _id,
+            "version": 0,
+            "title": f"Pull request {_id}",
+            "description": f"Changes {_id} of the benchmark " * 4,
+            "state": "OPEN",
+            "open": True,
+            "closed": False,
+            "createdDate": 1700000000000 + _id,
+            "updatedDate": 1700000000000 + _id,
+            "fromRef": _ref(f"{FROM_BRANCH}-{_id}"),
+            "toRef": _ref(TARGET),
+            "author": {"user": _user(USER), "role": "AUTHOR", "approved": False},
+            "reviewers": [
+                {"user": _user("reviewer"), "role": "REVIEWER", "status": "UNAPPROVED"}
+            ],
+            "properties": {"mergeResult": {"outcome": "CLEAN"}},
+            "links": {
+                "self": [
+                    {
+                        "href": f"https://bitbucket.bench/projects/{PROJECT}/repos/{REPOSITORY}/pull-requests/{_id}"
+                    }
+                ]
+            },
+        }
+
+    def whoami(self, query: dict) -> tuple:
+        return 200, USER
+
+    def repository(self, query: dict) -> tuple:
+        return 200, {"id": 1, "slug": REPOSITORY, "project": {"key": PROJECT.upper()}}
+
+    def repository_page(self, query: dict, project: str) -> tuple:
+        return 200, self.page(
+            [
+                {"id": _id, "slug": f"{REPOSITORY}-{_id}", "project": {"key": project}}
+                for _id in range(1, self.repositories + 1)
+            ],
+            query,
+        )
+
+    def reviewers(self, query: dict) -> tuple:
+        return 200, [_user("reviewer"), _user("lead")]
+
+    def created(self, query: dict) -> tuple:
+        return 201, self.make_pull_request(self.pull_requests + 1)
+
+    def pull_request_page(self, query: dict) -> tuple:
+        return 200, self.page(
+            [self.make_pull_request(_id) for _id in range(self.pull_requests, 0, -1)],
+            query,
+        )
+
+    def pull_request(self, query: dict, _id: str) -> tuple:
+        return 200, self.make_pull_request(int(_id))
+
+    def change_page(self, query: dict, _id: str) -> tuple:
+        changes = [
+            {
+                "path": {"toString": f"src/module_{i}.py"},
+                "type": "MODIFY",
+                "nodeType": "FILE",
+            }
+            for i in range(self.changes)
+        ]
+        page = self.page(changes, query)
+        page["fromHash"] = "0123456789abcdef0123456789abcdef01234567"
+        page["toHash"] = "fedcba9876543210fedcba9876543210fedcba98"
+        return 200, page
+
+    def diff(self, query: dict, _id: str, path: str) -> tuple:
+        path = unquote(path)
+        lines = [
+            {"line": f"value = {i}", "source": i, "destination": i}
+            for i in range(self.lines)
+        ]
+        return 200, {
+            "diffs": [
+                {
+                    "source": {"toString": path},
+                    "destination": {"toString": path},
+                    "hunks": [
+                        {
+                            "sourceLine": 1,
+                            "sourceSpan": self.lines,
+                            "destinationLine": 1,
+                            "destinationSpan": self.lines,
+                            "segments": [
+                                {"type": "REMOVED", "lines": lines},
+                                {"type": "ADDED", "lines": lines},
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def merge_check(self, query: dict, _id: str) -> tuple:
+        return 200, {
+            "canMerge": True,
+            "conflicted": False,
+            "outcome": "CLEAN",
+            "vetoes": [],
+        }
+
+    def merged(self, query: dict, _id: str) -> tuple:
+        return 200, dict(self.make_pull_request(int(_id)), state="MERGED")
+
+    def automerge(self, query: dict) -> tuple:
+        return 200, {"status": {"id": "AUTO_MERGE_DISABLED", "available": False}}
+
+    def empty_list(self, query: dict) -> tuple:
+        return 200, []
+
+    def empty(self, query: dict) -> tuple:
+        return 200, {}
+
+    def accepted(self, query: dict) -> tuple:
+        return 202, {}
+
+    def no_content(self, query: dict) -> tuple:
+        return 204, None
+
+
+def git_repository(path: str, url: str) -> None:
+    """Creates a git repository on the source branch, with the server as its origin"""
+    for command in (
+        ["git", "init", "-q"],
+        ["git", "checkout", "-q", "-b", FROM_BRANCH],
+        ["git", "remote", "add", "origin", f"{url}/scm/{PROJECT}/{REPOSITORY}.git"],
+    ):
+        subprocess.run(command, cwd=path, check=True, capture_output=True)
+
+
+@contextmanager
+def environment(server: MockBitbucket, path: str, cache_dir: str) -> Iterator[None]:
+    """
+    Points bb at the server from a git repository, with its caches under 'cache_dir'.
+
+    The clipboard is left untouched, and everything is restored on exit.
+    """
+    from bb.utils import cache, cmnd, request, richprint
+    from bb.utils.constants import common_vars
+    from bb.utils.ini import Config, set_config
+
+    state = dict(common_vars.state)
+    saved = cache.BB_CACHE_DIR, cmnd.cp_to_clipboard, os.getcwd()
+    stderr = richprint.console.stderr
+
+    set_config(Config(USER, "token", server.url))
+    common_vars.state.update(
+        daemon=False, no_cache=False, rate_limit=0.0, trace=False, max_requests=0
+    )
+    cache.BB_CACHE_DIR = cache_dir
+    cmnd.cp_to_clipboard = lambda url: None
+    os.chdir(path)
+    cmnd.reset_repo_context()
+    try:
+        yield
+    finally:
+        request.close_session()
+        os.chdir(saved[2])
+        cache.BB_CACHE_DIR, cmnd.cp_to_clipboard = saved[:2]
+        cmnd.reset_repo_context()
+        common_vars.state.update(state)
+        richprint.console.stderr = stderr
+        set_config(None)
+
+
+@pytest.fixture(scope="module")
+def bitbucket() -> Iterator[MockBitbucket]:
+    """A running server with the default payloads, shared by the tests of a module"""
+    with MockBitbucket() as server:
+        yield server
+
+
+@pytest.fixture
+def bb_repository(bitbucket: MockBitbucket, tmp_path) -> Iterator[str]:
+    """A git repository bb is pointed at, against the 'bitbucket' server, with empty caches"""
+    path = tmp_path / "repo"
+    path.mkdir()
+    git_repository(str(path), bitbucket.url)
+    bitbucket.reset()
+    with environment(bitbucket, str(path), str(tmp_path / "cache")):
+        yield str(path)
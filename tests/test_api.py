@@ -51,11 +51,20 @@ def test_get_repo_info():
     get_repo_info = bitbucket_api.get_repo_info(property.project)
     assert (
         get_repo_info
-        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos?start=0&limit=10000"
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos"
     )
     assert isinstance(get_repo_info, str)
 
 
+def test_repo_info():
+    repo_info = bitbucket_api.repo_info(property.project, property.repository)
+    assert (
+        repo_info
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}"
+    )
+    assert isinstance(repo_info, str)
+
+
 def test_default_reviewers():
     default_reviewers = bitbucket_api.default_reviewers(
         property.project,
@@ -63,7 +72,7 @@ def test_default_reviewers():
         property.from_branch,
         property.target,
     )
-    reviewer_query = f"avatarSize=32&sourceRepoId={property.repo_id}&sourceRefId=refs%2Fheads%2F{property.from_branch.replace('/','%2F')}&targetRepoId={property.repo_id}&targetRefId=refs%2Fheads%2F{property.target.replace('/','%2F')}"
+    reviewer_query = f"avatarSize=32&sourceRepoId={property.repo_id}&sourceRefId=refs%2Fheads%2F{property.from_branch.replace('/', '%2F')}&targetRepoId={property.repo_id}&targetRefId=refs%2Fheads%2F{property.target.replace('/', '%2F')}"
     assert (
         reviewer_query
         == "avatarSize=32&sourceRepoId=1234&sourceRefId=refs%2Fheads%2Ffeature%2Ftest_branch&targetRepoId=1234&targetRefId=refs%2Fheads%2Fmaster"
@@ -128,12 +137,27 @@ def test_pull_request_difference():
 
     assert (
         pull_request_difference
-        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests/{property.pr_no}/changes?start=0&limit=1000&changeScope=unreviewed"
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests/{property.pr_no}/changes?changeScope=unreviewed"
     )
 
     assert isinstance(pull_request_difference, str)
 
 
+def test_pull_request_diff():
+    pull_request_diff = bitbucket_api.pull_request_diff(
+        property.project, property.repository, property.pr_no
+    )
+    assert (
+        pull_request_diff
+        == f"{property.bitbucket_host}/rest/api/latest/projects/{property.project}/repos/{property.repository}/pull-requests/{property.pr_no}/diff"
+    )
+
+    pull_request_diff = bitbucket_api.pull_request_diff(
+        property.project, property.repository, property.pr_no, "src/my file.py"
+    )
+    assert pull_request_diff.endswith("/diff/src/my%20file.py")
+
+
 def test_pull_request_info():
     pull_request_info = bitbucket_api.pull_request_info(
         property.project, property.repository, property.pr_no
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import pytest
+
+from bb.pr.batch import run_batch
+
+
+def test_run_batch():
+    async def action(_id):
+        return f"done {_id}"
+
+    results = run_batch("Testing", action, ["1", "2"])
+    assert [result[0] for result in results] == ["#1", "#2"]
+    assert [result[2] for result in results] == ["done 1", "done 2"]
+
+
+def test_run_batch_failure():
+    async def action(_id):
+        if _id == "2":
+            raise ValueError("conflicted")
+        return "done"
+
+    with pytest.raises(ValueError, match="1 of 2 pull requests failed"):
+        run_batch("Testing", action, ["1", "2"])
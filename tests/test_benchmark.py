@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import os
+
+import benchmark
+import pytest
+
+# wall times are compared to the baselines only with BB_BENCHMARK=1, they
+# depend on the machine, the request and byte counts are always compared
+TIMING: bool = os.environ.get("BB_BENCHMARK") == "1"
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    return benchmark.load_baselines()
+
+
+@pytest.mark.parametrize("name", benchmark.BENCHMARKS)
+def test_benchmark(bitbucket, baselines, name):
+    assert name in baselines, "run 'PYTHONPATH=. python tests/benchmark.py --update'"
+    result = benchmark.run(
+        bitbucket, benchmark.BENCHMARKS[name], rounds=2 if TIMING else 1
+    )
+    assert benchmark.regressions(result, baselines[name], TIMING) == []
+
+
+def test_regressions():
+    baseline = benchmark.Result(seconds=0.1, requests=3, bytes=100)
+    assert benchmark.regressions(baseline, baseline) == []
+    assert benchmark.regressions(benchmark.Result(0.2, 2, 90), baseline) == []
+    assert len(benchmark.regressions(benchmark.Result(5.0, 4, 101), baseline)) == 3
+    assert benchmark.regressions(benchmark.Result(5.0, 3, 100), baseline, False) == []
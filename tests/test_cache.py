@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import os
+
+import pytest
+
+from bb.utils import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_ttl():
+    assert cache.ttl("/plugins/servlet/applinks/whoami") == 86400
+    assert cache.ttl("/rest/api/latest/projects/test-project/repos") == 300
+    assert cache.ttl("/rest/api/latest/projects/test-project/repos/test-repo") is None
+    assert cache.ttl("/rest/api/latest/inbox/pull-requests") is None
+
+
+def test_key():
+    assert cache.key("user", "https://test-url.com") == cache.key(
+        "user", "https://test-url.com"
+    )
+    assert cache.key("user", "https://test-url.com") != cache.key(
+        "other", "https://test-url.com"
+    )
+
+
+def test_store_and_load():
+    _key = cache.key("user", "https://test-url.com")
+    assert cache.load(_key) is None
+
+    cache.store(_key, {"etag": '"1"', "data": {"name": "test"}})
+    entry = cache.load(_key)
+
+    assert entry["data"] == {"name": "test"}
+    assert entry["etag"] == '"1"'
+    assert cache.is_fresh(entry, 60)
+    assert not cache.is_fresh(entry, 0)
+
+
+def test_evict(cache_dir):
+    keys = [cache.key("user", f"https://test-url.com/{i}") for i in range(3)]
+    for i, _key in enumerate(keys):
+        cache.store(_key, {"data": "x" * 100})
+        os.utime(cache_dir / "http" / f"{_key}.json", (i, i))
+
+    cache.evict(
+        max_bytes=sum(
+            (cache_dir / "http" / f"{_key}.json").stat().st_size for _key in keys[1:]
+        )
+    )
+
+    assert cache.load(keys[0]) is None
+    assert cache.load(keys[1]) is not None
+    assert cache.load(keys[2]) is not None
+
+
+def test_repo_index():
+    repo_url = (
+        "https://test-url.com/rest/api/latest/projects/test-project/repos/test-repo"
+    )
+    assert cache.load_repo_id(repo_url) is None
+
+    cache.store_repo_id(repo_url, 1234)
+
+    assert cache.load_repo_id(repo_url) == 1234
@@ -19,9 +19,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+import pytest
 from props import Cmnd
 
-from bb.utils import cmnd
+from bb.utils import cache, cmnd
 
 property = Cmnd()
 
@@ -58,3 +59,133 @@ def test_title_and_description():
     assert isinstance(title_and_description[1], str)
     assert isinstance(tmp, list)
     assert title_and_description == [tmp[0], "\n".join(tmp[2:])]
+
+
+def test_repo_context(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path))
+    cmnd.reset_repo_context()
+    commands = []
+
+    def subprocess_run(command, text=None):
+        commands.append(command)
+        return {
+            "git rev-parse --is-inside-work-tree --abbrev-ref HEAD": "true\nfeature",
+            "git remote -v": "origin\thttps://test-url.com/scm/project/repo.git (fetch)",
+            "git log --format=%B -n 1": "title\n\ndescription",
+        }[command]
+
+    monkeypatch.setattr(cmnd, "subprocess_run", subprocess_run)
+    monkeypatch.setattr(cmnd, "read_repo_context", lambda path: None)
+
+    assert cmnd.is_git_repo() is True
+    assert cmnd.from_branch() == "feature"
+    assert cmnd.base_repo() == ["project", "repo"]
+    assert len(commands) == 2
+
+    assert cmnd.title_and_description() == ["title", "description"]
+    assert cmnd.title_and_description() == ["title", "description"]
+    assert len(commands) == 3
+
+    cmnd.reset_repo_context()
+    assert cmnd.from_branch() == "feature"
+    assert len(commands) == 5
+    cmnd.reset_repo_context()
+
+
+def test_read_repo_context(tmp_path, monkeypatch):
+    for variable in cmnd.GIT_DISCOVERY_ENV:
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setattr(cmnd, "_rewrites_urls", lambda: False)
+
+    git_dir = tmp_path / "repo" / ".git"
+    (git_dir / "worktrees" / "linked").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/feature/test\n")
+    (git_dir / "config").write_text(
+        "[core]\n\tbare = false\n"
+        '[remote "upstream"]\n\turl = https://test-url.com/scm/other/repo.git\n'
+        '[remote "origin"]\n\turl = "ssh://git@test-url.com:7999/project/repo.git" ; comment\n'
+    )
+    (tmp_path / "repo" / "src").mkdir()
+
+    context = cmnd.read_repo_context(str(tmp_path / "repo" / "src"))
+    assert context.branch == "feature/test"
+    assert context.remotes == {
+        "origin": "ssh://git@test-url.com:7999/project/repo.git",
+        "upstream": "https://test-url.com/scm/other/repo.git",
+    }
+
+    (git_dir / "worktrees" / "linked" / "HEAD").write_text("0" * 40 + "\n")
+    (git_dir / "worktrees" / "linked" / "commondir").write_text("../..\n")
+    (tmp_path / "linked").mkdir()
+    (tmp_path / "linked" / ".git").write_text(f"gitdir: {git_dir}/worktrees/linked\n")
+
+    context = cmnd.read_repo_context(str(tmp_path / "linked"))
+    assert context.branch == "HEAD"
+    assert "origin" in context.remotes
+
+    (git_dir / "config").write_text("[include]\n\tpath = other.config\n")
+    assert cmnd.read_repo_context(str(tmp_path / "repo")) is None
+    assert cmnd.read_repo_context(str(git_dir)) is None
+
+
+def test_parse_remote_url():
+    for url in (
+        "https://test-url.com/scm/project/repo.git",
+        "https://user@test-url.com:8443/bitbucket/scm/project/repo.git",
+        "ssh://git@test-url.com:7999/project/repo.git",
+        "git@test-url.com:project/repo.git",
+        "git@test-url.com:7999/project/repo.git/",
+        "/srv/git/project/repo.git",
+    ):
+        assert cmnd.parse_remote_url(url) == ("project", "repo")
+
+    assert cmnd.parse_remote_url("https://test-url.com/scm/project/my.repo.git") == (
+        "project",
+        "my.repo",
+    )
+    with pytest.raises(ValueError):
+        cmnd.parse_remote_url("https://test-url.com/repo.git")
+
+
+def test_select_remote():
+    remotes = {"fork": "https://test-url.com/scm/user/repo.git", "origin": "o"}
+    assert cmnd.select_remote(cmnd.RepoContext(True, "main", remotes)) == "origin"
+    assert cmnd.select_remote(cmnd.RepoContext(True, "main", remotes, "fork")) == "fork"
+    assert cmnd.select_remote(cmnd.RepoContext(True, "main", {"fork": "f"})) == "fork"
+    with pytest.raises(ValueError):
+        cmnd.select_remote(cmnd.RepoContext(True, "main", {}))
+
+
+def test_base_repo_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cmnd, "_rewrites_urls", lambda: False)
+    for variable in cmnd.GIT_DISCOVERY_ENV:
+        monkeypatch.delenv(variable, raising=False)
+
+    git_dir = tmp_path / "repo" / ".git"
+    git_dir.mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "config").write_text(
+        '[remote "origin"]\n\turl = https://test-url.com/scm/project/repo.git\n'
+    )
+    monkeypatch.chdir(tmp_path / "repo")
+    cmnd.reset_repo_context()
+
+    assert cmnd.base_repo() == ["project", "repo"]
+    monkeypatch.setattr(cmnd, "repo_context", None)
+    assert cmnd.base_repo() == ["project", "repo"]
+    cmnd.reset_repo_context()
+
+
+def test_show_git_diff_paths(monkeypatch):
+    commands = []
+    monkeypatch.setattr(cmnd.subprocess, "check_call", commands.append)
+
+    # a pull request without changes shows nothing, rather than the whole diff
+    cmnd.show_git_diff("origin/feature", "origin/master", [])
+    assert commands == []
+
+    cmnd.show_git_diff("origin/feature", "origin/master", ["a.py"])
+    assert commands == [
+        ["git", "diff", "origin/master", "origin/feature", "--", "a.py"]
+    ]
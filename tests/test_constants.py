@@ -33,7 +33,17 @@ def test_common_vars():
     assert common_vars.skip_prompt == "skip confirmation prompt"
     assert common_vars.content_type == "application/json;charset=UTF-8"
     assert common_vars.dim_white == "dim white"
-    assert common_vars.state == {"verbose": False}
+    assert common_vars.state == {
+        "verbose": False,
+        "no_cache": False,
+        "daemon": True,
+        "rate_limit": 0.0,
+        "rate_limit_shared": False,
+        "trace": False,
+        "max_requests": 0,
+        "output": "text",
+        "refresh_rate": 10.0,
+    }
 
     # Test attribute types
     assert isinstance(common_vars.bold_red, str)
@@ -39,6 +39,7 @@ def test_copy_pull_request(mock_cp_to_clipboard, mock_get, mock_base_repo):
     # Assert
     mock_base_repo.assert_called_once()
     mock_get.assert_called_once_with(
-        bitbucket_api.pull_request_info("project", "repository", "123")
+        bitbucket_api.pull_request_info("project", "repository", "123"),
+        daemon_ok=True,
     )
     mock_cp_to_clipboard.assert_called_once_with("test_url")
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bb.utils import cache, daemon, request
+from bb.utils.constants import common_vars
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path))
+    monkeypatch.setitem(common_vars.state, "daemon", True)
+    return tmp_path
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    urls = []
+
+    def get(url):
+        urls.append(url)
+        return [200, {"url": url, "count": len(urls)}]
+
+    monkeypatch.setattr(request, "get", get)
+    return urls
+
+
+def test_daemon_absent():
+    assert daemon.call({"op": "status"}) is None
+    assert daemon.get("https://test-url.com", "user") is None
+    daemon.invalidate()
+
+
+def test_store(fetched):
+    store = daemon.Store(interval=60)
+    assert store.get("https://test-url.com")[1]["count"] == 1
+    assert store.get("https://test-url.com")[1]["count"] == 1
+
+    store.refresh()
+    assert store.get("https://test-url.com")[1]["count"] == 2
+
+    store.clear()
+    assert store.get("https://test-url.com")[1]["count"] == 3
+
+
+def test_serve(fetched):
+    server = threading.Thread(target=daemon.serve, kwargs={"interval": 60})
+    server.start()
+    try:
+        for _ in range(50):
+            if daemon.call({"op": "status"}) is not None:
+                break
+            time.sleep(0.1)
+
+        username = request.get_config().username
+        assert daemon.get("https://test-url.com", username) == [
+            200,
+            {"url": "https://test-url.com", "count": 1},
+        ]
+        assert daemon.get("https://test-url.com", username)[1]["count"] == 1
+        assert daemon.get("https://test-url.com", "other") is None
+        assert daemon.call({"op": "status"})["entries"] == 1
+
+        daemon.invalidate()
+        assert daemon.call({"op": "status"})["entries"] == 0
+    finally:
+        daemon.call({"op": "shutdown"})
+        server.join()
+
+
+def test_serves():
+    base = "/rest/api/latest/projects/TEST/repos/test-repo/pull-requests"
+    assert daemon.serves("/rest/api/latest/inbox/pull-requests")
+    assert daemon.serves(base)
+    assert daemon.serves(f"{base}/1/changes")
+    # the version sent back with writes and the merge checks are always live
+    assert not daemon.serves(f"{base}/1")
+    assert not daemon.serves(f"{base}/1/merge")
+    assert not daemon.serves(
+        "/rest/pull-request-cleanup/latest/projects/TEST/repos/test-repo/pull-requests/1"
+    )
+
+
+def test_daemon_ok(monkeypatch):
+    url = "https://test-url.com/rest/api/latest/projects/TEST/repos/test-repo/pull-requests/1"
+    sent = []
+
+    async def aget(url, username):
+        return [200, {"url": url}]
+
+    monkeypatch.setattr(daemon, "get", lambda url, username: [200, {"url": url}])
+    monkeypatch.setattr(daemon, "aget", aget)
+    monkeypatch.setattr(request, "_send", lambda *args, **kwargs: sent.append(args))
+    monkeypatch.setattr(request, "_handle_get_response", lambda response: None)
+
+    # single pull requests come from the daemon only for the callers opting in
+    assert request.get(url, daemon_ok=True) == [200, {"url": url}]
+    assert asyncio.run(request.aget(url, daemon_ok=True)) == [200, {"url": url}]
+    assert sent == []
+    request.get(url)
+    assert len(sent) == 1
+
+
+def test_async_write_invalidates_off_the_loop(monkeypatch):
+    calls = []
+
+    async def acall(message, timeout=common_vars.timeout):
+        calls.append(message)
+
+    monkeypatch.setattr(daemon, "acall", acall)
+    monkeypatch.setattr(
+        daemon, "call", lambda *args, **kwargs: pytest.fail("blocking call")
+    )
+    assert asyncio.run(request._awritten([200, {}])) == [200, {}]
+    assert calls == [{"op": "invalidate"}]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+from bb.pr.diff import changed_paths, unified_diff
+
+
+def test_changed_paths():
+    changes = [
+        {"path": {"toString": "a.py"}, "type": "MODIFY"},
+        {"path": {"toString": "c.py"}, "srcPath": {"toString": "b.py"}, "type": "MOVE"},
+    ]
+    assert changed_paths(changes) == ["a.py", "c.py", "b.py"]
+
+
+def test_unified_diff():
+    diff = {
+        "source": None,
+        "destination": {"toString": "a.py"},
+        "hunks": [
+            {
+                "sourceLine": 0,
+                "sourceSpan": 0,
+                "destinationLine": 1,
+                "destinationSpan": 2,
+                "segments": [
+                    {"type": "ADDED", "lines": [{"line": "import os"}, {"line": ""}]}
+                ],
+            }
+        ],
+    }
+    assert unified_diff(diff).splitlines() == [
+        "diff --git a/a.py b/a.py",
+        "--- /dev/null",
+        "+++ b/a.py",
+        "@@ -0,0 +1,2 @@",
+        "+import os",
+        "+",
+    ]
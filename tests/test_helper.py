@@ -21,7 +21,7 @@
 
 import pytest
 
-from bb.utils.helper import validate_input
+from bb.utils.helper import parse_ids, validate_input
 
 
 def test_validate_input():
@@ -62,3 +62,25 @@ def test_validate_input():
     # Test case 10: Input is a list
     with pytest.raises(ValueError, match="Invalid input"):
         validate_input(["hello"], "Enter a string", "Invalid input")
+
+
+def test_parse_ids():
+    assert parse_ids("1") == ["1"]
+    assert parse_ids("1,2, 3") == ["1", "2", "3"]
+    assert parse_ids("5-8") == ["5", "6", "7", "8"]
+    assert parse_ids("1,2-3,2") == ["1", "2", "3"]
+
+    with pytest.raises(ValueError, match="Invalid pull request id"):
+        parse_ids("1,abc")
+
+    with pytest.raises(ValueError, match="Id's cannot be empty"):
+        parse_ids(" , ")
+
+    with pytest.raises(ValueError, match="ends before it starts"):
+        parse_ids("8-5")
+
+    assert len(parse_ids("1-100")) == 100
+    with pytest.raises(ValueError, match="Too many pull request ids"):
+        parse_ids("1-1000000")
+    with pytest.raises(ValueError, match="Too many pull request ids"):
+        parse_ids("1-60,61-120")
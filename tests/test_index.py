@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+from contextlib import closing
+
+import pytest
+
+from bb.utils import cache, index
+
+HOST = "https://test-url.com"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def pull_request(_id, updated_date, state="OPEN", author="user", reviewers=()):
+    return {
+        "id": _id,
+        "state": state,
+        "version": 0,
+        "updatedDate": updated_date,
+        "fromRef": {"displayId": "feature"},
+        "toRef": {
+            "displayId": "master",
+            "repository": {"slug": "Test-Repo", "project": {"key": "TEST"}},
+        },
+        "author": {"user": {"name": author}},
+        "reviewers": [{"user": {"name": reviewer}} for reviewer in reviewers],
+    }
+
+
+def test_upsert_and_query():
+    with closing(index.connect()) as connection:
+        newest = index.upsert(
+            connection,
+            HOST,
+            [
+                pull_request(1, 10, reviewers=("reviewer",)),
+                pull_request(2, 30, author="other"),
+                pull_request(3, 20, state="MERGED"),
+            ],
+        )
+        assert newest == 30
+
+        assert [
+            _pr["id"] for _pr in index.query(connection, HOST, "test", "test-repo")
+        ] == [2, 1]
+        assert [_pr["id"] for _pr in index.query(connection, HOST, author="user")] == [
+            1
+        ]
+        assert [
+            _pr["id"] for _pr in index.query(connection, HOST, reviewer="reviewer")
+        ] == [1]
+        assert [_pr["id"] for _pr in index.query(connection, HOST, state="MERGED")] == [
+            3
+        ]
+        assert list(index.query(connection, "https://other-url.com")) == []
+
+        index.upsert(connection, HOST, [pull_request(1, 40, state="DECLINED")])
+        assert [
+            _pr["id"] for _pr in index.query(connection, HOST, "test", "test-repo")
+        ] == [2]
+
+
+def test_replace():
+    with closing(index.connect()) as connection:
+        index.upsert(
+            connection,
+            HOST,
+            [
+                pull_request(1, 10),
+                pull_request(2, 20, author="other", reviewers=("user",)),
+                pull_request(3, 30, author="other"),
+            ],
+        )
+
+        # 1 was merged since, the author listing leaves the others alone
+        index.replace(connection, HOST, [], author="user")
+        assert [_pr["id"] for _pr in index.query(connection, HOST)] == [3, 2]
+
+        index.replace(
+            connection, HOST, [pull_request(3, 40, author="other")], "test", "test-repo"
+        )
+        assert [_pr["id"] for _pr in index.query(connection, HOST)] == [3]
+
+        # a listing failing part way keeps the index as it was
+        def failing():
+            yield pull_request(4, 50)
+            raise ValueError("page failed")
+
+        with pytest.raises(ValueError):
+            index.replace(connection, HOST, failing(), "test", "test-repo")
+        assert [_pr["id"] for _pr in index.query(connection, HOST)] == [3]
+
+
+def test_write_through():
+    with closing(index.connect()) as connection:
+        index.upsert(connection, HOST, [pull_request(1, 10)])
+        listing = index.write_through(
+            connection, HOST, [pull_request(2, 20), pull_request(3, 30)], author="user"
+        )
+
+        # each pull request is indexed before it is passed on
+        assert next(listing)["id"] == 2
+        assert 2 in [_pr["id"] for _pr in index.query(connection, HOST)]
+        # the stale ones are dropped once the listing is exhausted
+        assert [_pr["id"] for _pr in listing] == [3]
+        assert [_pr["id"] for _pr in index.query(connection, HOST)] == [3, 2]
+
+
+def test_remove():
+    with closing(index.connect()) as connection:
+        index.upsert(connection, HOST, [pull_request(1, 10), pull_request(2, 20)])
+        index.remove(connection, HOST, "TEST", "Test-Repo", ["2"])
+        assert [_pr["id"] for _pr in index.query(connection, HOST)] == [1]
+
+
+def test_watermark():
+    with closing(index.connect()) as connection:
+        assert index.watermark(connection, "scope") is None
+
+        index.set_watermark(connection, "scope", 20)
+        assert index.watermark(connection, "scope") == 20
+
+        index.set_watermark(connection, "scope", 10)
+        assert index.watermark(connection, "scope") == 20
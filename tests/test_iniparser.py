@@ -24,7 +24,9 @@ from pathlib import Path
 
 from props import Ini
 
-from bb.utils.ini import config_path, parse
+from bb.utils import ini
+from bb.utils.api import BitbucketAPI
+from bb.utils.ini import Config, config_path, parse
 
 property = Ini()
 
@@ -43,3 +45,23 @@ def test_config_path():
     config_dir, config_file = config_path()
     assert config_dir == os.path.join(str(Path.home()), ".config", "bb")
     assert config_file == os.path.join(config_dir, "config.ini")
+
+
+def test_get_config():
+    if property.BB_CONFIG_FILE:
+        config = ini.get_config()
+        assert isinstance(config, Config)
+        assert config is ini.get_config()
+        assert [config.username, config.token, config.bitbucket_host] == parse()
+
+
+def test_set_config():
+    ini.set_config(Config("user", "token", "https://injected-host.com"))
+    try:
+        assert ini.get_config().username == "user"
+        assert BitbucketAPI().whoami().startswith("https://injected-host.com/")
+        assert BitbucketAPI("https://other-host.com").bitbucket_host == (
+            "https://other-host.com"
+        )
+    finally:
+        ini.set_config(None)
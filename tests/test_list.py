@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import importlib
+
+pr_list = importlib.import_module("bb.pr.list")
+
+
+def test_construct_repo_dict(bitbucket):
+    pull_requests = [bitbucket.make_pull_request(_id) for _id in (1, 2, 3)]
+    pull_requests[1]["state"] = "DECLINED"
+    pull_requests[2]["reviewers"] = []
+    del pull_requests[2]["properties"]["mergeResult"]
+
+    repo_dict = pr_list.construct_repo_dict(pull_requests)
+
+    assert list(repo_dict) == ["bench-repo"]
+    assert {state: list(ids) for state, ids in repo_dict["bench-repo"].items()} == {
+        "OPEN": ["1", "3"],
+        "DECLINED": ["2"],
+    }
+    status = dict(repo_dict["bench-repo"]["OPEN"]["1"].rows())["[bold]Status[/bold]"]
+    assert status.endswith(
+        "| [bold green]CLEAN[/bold green] | [bold red]UNAPPROVED[/bold red]"
+    )
+    status = dict(repo_dict["bench-repo"]["OPEN"]["3"].rows())["[bold]Status[/bold]"]
+    assert status.endswith("| [bold cyan]NOT REVIEWED[/bold cyan]")
+
+
+def test_review_status():
+    assert pr_list.review_status(None) == "[bold cyan]NOT REVIEWED[/bold cyan]"
+    assert pr_list.review_status(("APPROVED", "NEEDS_WORK")) == (
+        "[bold green]APPROVED[/bold green] & [bold yellow]NEEDS_WORK[/bold yellow]"
+    )
+    assert pr_list.review_status(()) == ""
+
+
+def test_line(bitbucket):
+    pull_request = pr_list.PullRequest.from_json(bitbucket.make_pull_request(1))
+    assert pull_request.line() == (
+        f"{pull_request.from_branch} -> {pull_request.to_branch} | [bold green]CLEAN[/bold green]"
+        f" | [bold red]UNAPPROVED[/bold red] | {pull_request.title}"
+    )
+
+
+def test_render_pull_requests(bitbucket, monkeypatch):
+    rendered = []
+    consumed = []
+
+    def render_tree(repo_name, status, data, compact):
+        rendered.append((repo_name, status, [_id for _id, _ in data], len(consumed)))
+
+    def pull_requests():
+        for _id, slug in enumerate(
+            ("other", "bench-repo", "bench-repo", "last", "last"), 1
+        ):
+            _pr = bitbucket.make_pull_request(_id)
+            _pr["fromRef"]["repository"]["slug"] = slug
+            consumed.append(_id)
+            yield pr_list.PullRequest.from_json(_pr)
+
+    monkeypatch.setattr(pr_list.richprint, "render_tree", render_tree)
+
+    pr_list.render_pull_requests(pull_requests(), "bench-repo", False)
+
+    # each block is rendered before the pull requests after it are consumed,
+    # the ones past the current repository are consumed without being rendered
+    assert rendered == [
+        ("other", "OPEN", ["1"], 2),
+        ("bench-repo", "OPEN", ["2", "3"], 4),
+    ]
+    assert consumed == [1, 2, 3, 4, 5]
+
+
+def test_scan_query():
+    assert pr_list.scan_query("open", "", "") == "state=OPEN"
+    assert pr_list.scan_query("all", "release/1.0", "jdoe") == (
+        "state=ALL&at=refs%2Fheads%2Frelease%2F1.0&role.1=AUTHOR&username.1=jdoe"
+    )
+    assert pr_list.scan_query("merged", "refs/heads/main", "") == (
+        "state=MERGED&at=refs%2Fheads%2Fmain"
+    )
+
+
+def test_sync_pull_requests(bb_repository, bitbucket, monkeypatch):
+    from contextlib import closing
+
+    from bb.utils import index
+
+    host = pr_list.bitbucket_api.bitbucket_host
+
+    def sync():
+        bitbucket.reset()
+        with closing(index.connect()) as connection:
+            pr_list.sync_pull_requests(connection, host, "bench", "bench-repo")
+            return len(list(index.query(connection, host, "bench", "bench-repo")))
+
+    # the first sync lists both pages of the open pull requests
+    assert sync() == 100
+    assert bitbucket.requests == 2
+    # later syncs stop at the first pull request already synced
+    assert sync() == 100
+    assert bitbucket.requests == 1
+    # the periodic full listing drops the pull requests gone from the server
+    monkeypatch.setattr(bitbucket, "pull_requests", 60)
+    monkeypatch.setattr(pr_list.common_vars, "index_reconcile", -1.0)
+    assert sync() == 60
+    assert bitbucket.requests == 2
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import json
+
+import pytest
+
+from bb.utils import output
+from bb.utils.constants import common_vars
+
+records = [
+    {
+        "id": 1,
+        "fromRef": {"displayId": "feature/a"},
+        "links": {"self": [{"href": "u1"}]},
+    },
+    {"id": 2, "fromRef": {"displayId": "feature/b"}, "reviewers": [{"name": "x"}]},
+]
+fields = ("id", "fromRef.displayId", "links.self.0.href", "reviewers")
+
+
+@pytest.fixture
+def mode(monkeypatch):
+    def set_mode(value):
+        monkeypatch.setitem(common_vars.state, "output", value)
+
+    return set_mode
+
+
+def test_field():
+    assert output.field(records[0], "links.self.0.href") == "u1"
+    assert output.field(records[0], "links.self.1.href") is None
+    assert output.field(records[1], "fromRef.displayId.x") is None
+
+
+def test_machine_readable(mode):
+    mode("text")
+    assert output.machine_readable() is False
+    mode("csv")
+    assert output.machine_readable() is True
+
+
+def test_json(mode, capsys):
+    mode("json")
+    assert output.emit(records, fields) == 2
+    assert json.loads(capsys.readouterr().out) == records
+    output.emit([], fields)
+    assert json.loads(capsys.readouterr().out) == []
+
+
+def test_ndjson(mode, capsys):
+    mode("ndjson")
+    output.emit(records, fields)
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_csv(mode, capsys):
+    mode("csv")
+    output.emit(records, fields)
+    assert capsys.readouterr().out.splitlines() == [
+        "id,fromRef.displayId,links.self.0.href,reviewers",
+        "1,feature/a,u1,",
+        '2,feature/b,,"[{""name"":""x""}]"',
+    ]
+
+
+def test_tap_streams(mode, capsys):
+    mode("ndjson")
+    tapped = output.tap(iter(records), fields)
+    assert next(tapped) == records[0]
+    assert json.loads(capsys.readouterr().out) == records[0]
+
+
+@pytest.mark.parametrize("diff", [[], ["--diff"]])
+def test_create_writes_one_document(bb_repository, diff):
+    from typer.testing import CliRunner
+
+    from bb import _bb
+
+    result = CliRunner().invoke(
+        _bb,
+        ["--output", "json", "pr", "create", "--target", "master"]
+        + ["--title", "t", "--description", "d", "--yes", *diff],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [record["id"] for record in json.loads(result.stdout)] == [101]
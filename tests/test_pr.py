@@ -50,6 +50,13 @@ def test_diff():
     assert result.exit_code == 0
 
 
+def test_diff_filters_need_remote():
+    for option in (["--path", "README.md"], ["--context", "3"]):
+        result = runner.invoke(_pr, ["diff", "--id", "0", *option])
+        assert result.exit_code == 0
+        assert "'--path' and '--context' filter a '--remote' diff" in result.output
+
+
 def test_list():
     result = runner.invoke(_pr, ["list"])
     assert result.exit_code == 0
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import pytest
+
+from bb.utils import cache, ratelimit
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "BB_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_token_bucket():
+    bucket = ratelimit.TokenBucket(rate=10, burst=2)
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_shared_token_bucket():
+    pytest.importorskip("fcntl")
+    first = ratelimit.TokenBucket(rate=10, shared=True)
+    second = ratelimit.TokenBucket(rate=10, shared=True)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == pytest.approx(0.1, abs=0.01)
+    assert first.reserve() == pytest.approx(0.2, abs=0.01)
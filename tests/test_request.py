@@ -19,9 +19,14 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+import threading
+import time
+from unittest.mock import call, patch
+
 import httpx
 import pytest
 
+from bb.utils import request
 from bb.utils.request import delete, post
 
 
@@ -63,3 +68,136 @@ def test_delete_error():
     data = {"key": "value"}
     with pytest.raises(ValueError):
         delete(url, data)
+
+
+def test_session_is_shared():
+    client = request.session()
+    assert client is request.session()
+    assert isinstance(client, httpx.Client)
+    request.close_session()
+    assert client.is_closed
+    assert request.session() is not client
+
+
+def test_gather():
+    async def echo(value):
+        return value
+
+    assert request.gather(echo(1), echo(2), echo(3)) == [1, 2, 3]
+    assert request._async_client is None
+
+
+@patch("bb.utils.request.get")
+def test_paginate(mock_get):
+    mock_get.side_effect = [
+        [200, {"values": [1, 2], "isLastPage": False, "nextPageStart": 2}],
+        [200, {"values": [3], "isLastPage": True}],
+    ]
+
+    assert list(request.paginate("https://example.com", limit=2)) == [1, 2, 3]
+    mock_get.assert_has_calls(
+        [
+            call("https://example.com", {"start": 0, "limit": 2}),
+            call("https://example.com", {"start": 2, "limit": 2}),
+        ]
+    )
+
+
+def test_as_completed():
+    lock = threading.Lock()
+    running, most = [0], [0]
+    taken = []
+
+    def items():
+        for item in range(20):
+            taken.append(item)
+            yield item
+
+    def square(item):
+        with lock:
+            running[0] += 1
+            most[0] = max(most[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return item * item
+
+    results = request.as_completed(square, items(), limit=3)
+    first = next(results)
+    # items are only taken as workers free up
+    assert len(taken) <= 6
+    assert sorted([first, *results]) == [item * item for item in range(20)]
+    assert most[0] <= 3
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    statuses = []
+
+    def handler(_request):
+        status, headers = statuses.pop(0)
+        return httpx.Response(status, headers=headers, json={"method": _request.method})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(request, "session", lambda: client)
+    monkeypatch.setattr(request.time, "sleep", lambda seconds: None)
+    monkeypatch.setitem(request.common_vars.state, "daemon", False)
+    request.set_retry_budget(request.common_vars.retry_budget)
+    return statuses
+
+
+def test_retry_get(responses):
+    responses.extend([(503, {}), (429, {"retry-after": "2"}), (200, {})])
+    assert request.get("https://test-url.com") == [200, {"method": "GET"}]
+    assert responses == []
+
+
+def test_retry_post_not_idempotent(responses):
+    responses.extend([(503, {}), (200, {})])
+    with pytest.raises(ValueError):
+        request.post("https://test-url.com", {})
+    assert responses == [(200, {})]
+
+
+def test_retry_budget(responses):
+    request.set_retry_budget(1)
+    responses.extend([(503, {}), (503, {}), (200, {})])
+    with pytest.raises(ValueError):
+        request.get("https://test-url.com")
+    assert responses == [(200, {})]
+
+
+def test_retry_delay():
+    assert (
+        request._retry_delay(httpx.Response(429, headers={"retry-after": "3"}), 1) == 3
+    )
+    assert 0 <= request._retry_delay(None, 2) <= request.common_vars.retry_backoff * 4
+
+
+def test_rate_limit(responses, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(request.time, "sleep", sleeps.append)
+    monkeypatch.setattr(request, "_bucket", None)
+    monkeypatch.setitem(request.common_vars.state, "rate_limit", 1.0)
+    monkeypatch.setattr(request.common_vars, "rate_limit_burst", 1)
+
+    responses.extend([(200, {}), (200, {})])
+    request.get("https://test-url.com/1")
+    request.get("https://test-url.com/2")
+
+    assert sleeps[0] == 0.0
+    assert 0.9 < sleeps[1] <= 1.0
+
+
+def test_max_requests(responses, monkeypatch):
+    monkeypatch.setitem(request.common_vars.state, "max_requests", 2)
+    request.reset_request_count()
+
+    responses.extend([(503, {}), (200, {}), (200, {})])
+    request.get("https://test-url.com/1")
+    with pytest.raises(ValueError, match="budget of 2"):
+        request.get("https://test-url.com/2")
+    assert responses == [(200, {})]
+
+    request.reset_request_count()
+    assert request.get("https://test-url.com/3") == [200, {"method": "GET"}]
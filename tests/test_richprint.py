@@ -19,6 +19,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ############################################################################
 
+import io
+
+from rich.console import Console
+
 from bb.utils import richprint
 
 
@@ -36,3 +40,87 @@ def test_table():
     ]
     richprint.table(header_args, value_args, True)
     # The output should be a table with the given header and values.
+
+
+def test_stream_table():
+    header_args = [("HASH", "bold white", 11), ("FILE", "bold white", None)]
+    with richprint.console.capture() as capture:
+        richprint.stream_table(
+            header_args, iter([[("abc", "a.py")], [("def", "b.py"), ("ghi", "c.py")]])
+        )
+    lines = capture.get().splitlines()
+    assert "HASH" in lines[0]
+    # the rows of every page line up in the same columns
+    assert len({line.index(".py") for line in lines if ".py" in line}) == 1
+    assert len([line for line in lines if ".py" in line]) == 3
+
+
+def test_live_progress_not_a_terminal(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(richprint, "console", Console(file=out, force_terminal=False))
+    with richprint.live_progress("Fetching ... ") as live:
+        live.update(richprint.console.print("DONE"))
+    assert isinstance(live, richprint.NoProgress)
+    assert out.getvalue() == "Fetching ... \nDONE\n"
+
+
+def test_live_region(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(richprint, "console", Console(file=out, force_terminal=True))
+    with richprint.live_progress("one") as first:
+        pass
+    with richprint.live_progress("two") as second:
+        pass
+    assert first is not second
+
+    with richprint.live_region():
+        with richprint.live_progress("one") as first:
+            assert first.is_started
+        with richprint.live_progress("two") as second:
+            pass
+    assert first is second
+    assert not first.is_started
+
+
+def test_refresh_rate_disables_spinner(monkeypatch):
+    monkeypatch.setattr(
+        richprint, "console", Console(file=io.StringIO(), force_terminal=True)
+    )
+    assert richprint.interactive() is True
+    monkeypatch.setitem(richprint.common_vars.state, "refresh_rate", 0)
+    assert richprint.interactive() is False
+
+
+def test_render_tree_streams(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(richprint, "console", Console(file=out, width=40))
+    printed = []
+
+    def pull_requests():
+        for _id in ("1", "2", "3"):
+            printed.append(out.getvalue())
+            yield _id, [("Title", f"title {_id}")]
+
+    richprint.render_tree("repo", "OPEN", pull_requests())
+    # the header is printed before the first pull request is asked for and
+    # every pull request once the one after it is known
+    assert printed[0] == "repo\n┗━━ OPEN\n"
+    assert "PR: #1" in printed[2] and "PR: #2" not in printed[2]
+    lines = out.getvalue().splitlines()
+    assert lines[2] == "    ┣━━ PR: #1"
+    assert lines[-4] == "    ┗━━ PR: #3"
+    assert lines[-1].startswith("        └")
+
+
+def test_render_tree_compact(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(richprint, "console", Console(file=out, width=20))
+    richprint.render_tree(
+        "repo", "OPEN", {"1": "a -> b", "2": "c -> d " + "x" * 40}, compact=True
+    )
+    assert out.getvalue().splitlines() == [
+        "repo",
+        "┗━━ OPEN",
+        "    ┣━━ #1 a -> b",
+        "    ┗━━ #2 c -> d x…",
+    ]
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+import subprocess
+import sys
+
+# Modules that only commands talking to bitbucket or rendering output need.
+DEFERRED_MODULES = (
+    "httpx",
+    "asyncio",
+    "configparser",
+    "webbrowser",
+    "rich.live",
+    "rich.table",
+    "rich.tree",
+    "bb.utils.request",
+    "bb.utils.api",
+)
+IMPORT_BUDGET_US = 200_000
+
+
+def import_times() -> dict:
+    cmnd = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bb"],
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in cmnd.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_deferred_imports():
+    times = import_times()
+    for module in DEFERRED_MODULES:
+        assert module not in times, f"'{module}' is imported on startup"
+
+
+def test_import_budget():
+    assert import_times()["bb"] < IMPORT_BUDGET_US
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+############################################################################
+# Bitbucket CLI (bb): Work seamlessly with Bitbucket from the command line
+#
+# Copyright (C) 2022  P S, Adithya (psadi) (ps.adithya@icloud.com)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+############################################################################
+
+
+import json
+
+import httpx
+import pytest
+
+from bb.utils import request, richprint, trace
+
+
+@pytest.fixture(autouse=True)
+def tracing(monkeypatch):
+    monkeypatch.setattr(trace, "_spans", [])
+    monkeypatch.setitem(request.common_vars.state, "trace", True)
+    monkeypatch.setitem(request.common_vars.state, "daemon", False)
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda _request: httpx.Response(200, json={}))
+    )
+    monkeypatch.setattr(request, "session", lambda: client)
+
+
+def test_recorder():
+    recorder = trace.Recorder("GET", "https://test-url.com/path")
+    recorder.event("connection.connect_tcp.started", {})
+    recorder.event("connection.connect_tcp.complete", {})
+    recorder.event("http11.receive_response_headers.complete", {})
+    recorder.finish(httpx.Response(200, content=b"data"), None, 1)
+
+    (span,) = trace.spans()
+    assert span["status"] == 200
+    assert span["bytes"] == 4
+    assert span["connect"] is not None
+    assert span["tls"] is None
+    assert 0 <= span["ttfb"] <= span["total"]
+
+
+def test_report(tmp_path):
+    request.get("https://test-url.com/rest/api/latest/test")
+    assert [span["url"] for span in trace.spans()] == [
+        "https://test-url.com/rest/api/latest/test"
+    ]
+
+    with richprint.console.capture() as capture:
+        trace.report(str(tmp_path / "trace.json"))
+    assert "1 requests, 2 bytes" in capture.get()
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert events[0]["name"] == "GET /rest/api/latest/test"
+    assert events[0]["ph"] == "X"